@@ -1,5 +1,32 @@
-from .flare_oracle import FlarePriceOracle
-from .flare_random_oracle import FlareRandomOracle
-from .flare_fdc_oracle import FlareFDCOracle
+from .flare_chain import FlareChain, AsyncFlareChain
+from .flare_oracle import FlarePriceOracle, AsyncFlarePriceOracle
+from .flare_random_oracle import FlareRandomOracle, AsyncFlareRandomOracle
+from .flare_fdc_oracle import FlareFDCOracle, AsyncFlareFDCOracle
+from .proof_cache import ProofCache
+from .round_drbg import RoundDRBG, RoundKeys
+from .draw_log import DrawLog, verify_proof
+from .randomness_monitor import RandomnessMonitor
+from .price_stream import PriceBroadcaster
+from .ftso_history import FtsoHistoryStore, FtsoBackfill
+from .request_trace import RequestTrace
 
-__all__ = ["FlarePriceOracle", "FlareRandomOracle", "FlareFDCOracle"]
+__all__ = [
+    "FlareChain",
+    "AsyncFlareChain",
+    "FlarePriceOracle",
+    "FlareRandomOracle",
+    "FlareFDCOracle",
+    "AsyncFlarePriceOracle",
+    "AsyncFlareRandomOracle",
+    "AsyncFlareFDCOracle",
+    "ProofCache",
+    "RoundDRBG",
+    "RoundKeys",
+    "DrawLog",
+    "verify_proof",
+    "RandomnessMonitor",
+    "PriceBroadcaster",
+    "FtsoHistoryStore",
+    "FtsoBackfill",
+    "RequestTrace",
+]
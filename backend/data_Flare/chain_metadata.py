@@ -0,0 +1,89 @@
+"""
+On-disk chain metadata cache for instant cold starts.
+
+Contract addresses, the chain ID and feed-ID tables almost never change, so
+the chain client persists them per network and loads them at startup
+without any RPC. The file is versioned: a file written by a different
+format version is ignored and rewritten on the next save.
+
+Configuration (environment variables):
+    FLARE_METADATA_CACHE      Path of the cache file
+                              (default ~/.cache/flare-copilot/chain_metadata.json)
+
+Usage:
+    cache = ChainMetadataCache()
+    entry = cache.load("114:0xad67...")    # None on a cold cache
+    cache.save("114:0xad67...", {"chain_id": 114, "addresses": {...}})
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class ChainMetadataCache:
+    """
+    JSON file holding one metadata entry per network key.
+
+    Writes go to a temporary file that is atomically renamed over the
+    cache, so a crash or a concurrent worker never leaves a torn file.
+    """
+
+    VERSION = 1
+
+    DEFAULT_PATH = os.getenv(
+        "FLARE_METADATA_CACHE",
+        str(Path.home() / ".cache" / "flare-copilot" / "chain_metadata.json"),
+    )
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or self.DEFAULT_PATH).expanduser()
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        return data.get("networks", {})
+
+    def load(self, network: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached entry for a network, or None if there is none.
+        """
+        with self._lock:
+            return self._read().get(network)
+
+    def save(self, network: str, entry: Dict[str, Any]) -> None:
+        """
+        Store (replace) the entry for a network. Failures are logged, not
+        raised: the cache is an optimisation and must never break startup.
+        """
+        with self._lock:
+            networks = self._read()
+            networks[network] = {**entry, "saved_at": int(time.time())}
+            self._write(networks)
+
+    def invalidate(self, network: str) -> None:
+        """Drop the entry for a network."""
+        with self._lock:
+            networks = self._read()
+            if networks.pop(network, None) is not None:
+                self._write(networks)
+
+    def _write(self, networks: Dict[str, Any]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "networks": networks}, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[WARN] Could not write chain metadata cache {self.path}: {e}")
@@ -0,0 +1,425 @@
+"""
+Append-only, verifiable log of lottery draws.
+
+Every number handed out by /lottery/roll and /lottery/draws is appended as
+a fixed-size record to a memory-mapped file, so a write is a sequential
+memcpy with no per-draw syscall. A periodic sealer groups the records
+written since the last seal into Merkle batches (RFC 6962-style hashing)
+and appends each batch's tree to a node file, so an inclusion proof for
+any draw is O(log n) reads by offset and auditing needs only that proof
+and the batch root.
+
+Layout of a log directory:
+    draws.bin       16-byte header (magic, record count), then RECORD_DTYPE rows
+    merkle.bin      every sealed batch's tree nodes, leaves first, 32 bytes each
+    batches.jsonl   one line per sealed batch: start, count, node offset, root
+    lock            flock()ed around every append, seal and read
+
+Several worker processes can share one directory: each maps draws.bin,
+and under the lock re-reads the record count from the header (remapping
+if another worker grew the file) and picks up batches other workers
+sealed, so draw ids stay unique across workers.
+
+Each record holds the on-chain random seed, its voting round and timestamp,
+the instance whose round key drew it, the DRBG counter the draw came from
+(the first counter of a bulk draw, whose blocks are contiguous), its
+position and the size of its bulk draw, the bound and the derived number,
+so once the round key is revealed recompute() rebuilds it with RoundDRBG.
+
+Configuration (environment variables):
+    FLARE_DRAW_LOG_DIR          Log directory
+                                (default ~/.cache/flare-copilot/draw_log)
+    FLARE_DRAW_LOG_BATCH_SIZE   Max records per Merkle batch (default 4096)
+
+Usage:
+    log = DrawLog()
+    draw_id = log.record_roll(oracle.roll(100000), 100000)
+    log.seal()                      # normally done by a periodic task
+    proof = log.proof(draw_id)
+    assert verify_proof(proof["leaf"], proof["proof"], proof["root"])
+    assert recompute(proof, round_key) == proof["number"]   # after the reveal
+"""
+
+import bisect
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Sequence
+
+import numpy as np
+
+from .round_drbg import RoundDRBG
+
+MAGIC = b"FLDRAWS3"
+HEADER = struct.Struct("<8sQ")
+
+RECORD_DTYPE = np.dtype([
+    ("seed", "u1", (32,)),      # on-chain random number, big-endian
+    ("round", "<u8"),
+    ("timestamp", "<u8"),
+    ("instance", "<u8"),        # RoundKeys instance id
+    ("draw", "<u8"),            # DRBG counter (first counter for bulk draws)
+    ("position", "<u4"),        # index within a bulk draw, 0 for rolls
+    ("count", "<u4"),           # numbers in the bulk draw, 1 for rolls
+    ("flags", "<u4"),
+    ("reserved", "<u4"),
+    ("bound", "<u8"),
+    ("number", "<u8"),
+])
+
+# Record flags
+FLAG_BULK = 1
+FLAG_UNIQUE = 2
+
+NODE_SIZE = 32
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(record: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + record).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def level_sizes(leaves: int) -> List[int]:
+    """Node count of each tree level, leaves first. An unpaired node is promoted."""
+    sizes = [leaves]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def verify_proof(leaf: str, proof: List[Dict[str, str]], root: str) -> bool:
+    """
+    Check an inclusion proof as returned by DrawLog.proof().
+
+    Args:
+        leaf: Hex leaf hash (SHA-256 of 0x00 || record bytes)
+        proof: Sibling hashes from the leaf up, each {'hash', 'side'}
+        root: Hex Merkle root of the batch
+    """
+    node = bytes.fromhex(leaf)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        node = node_hash(sibling, node) if step["side"] == "left" else node_hash(node, sibling)
+    return node.hex() == root
+
+
+def recompute(record: Dict[str, Any], key: bytes) -> int:
+    """
+    Re-derive a logged number from its record (as returned by
+    DrawLog.get()) and the revealed round key.
+    """
+    drbg = RoundDRBG(int(record["seed"], 16), record["round"], key, counter=record["draw"])
+    if not record["bulk"]:
+        return drbg.randbelow(record["bound"])[0]
+    numbers, _, _ = drbg.draws(record["count"], record["bound"], record["unique"])
+    return int(numbers[record["position"]])
+
+
+class DrawLog:
+    """
+    Memory-mapped draw records plus sealed Merkle batches.
+
+    Draw ids are record indexes, so ids are dense and increasing. A draw is
+    provable once the batch containing it has been sealed.
+    """
+
+    DEFAULT_DIR = os.getenv(
+        "FLARE_DRAW_LOG_DIR",
+        str(Path.home() / ".cache" / "flare-copilot" / "draw_log"),
+    )
+    BATCH_SIZE = int(os.getenv("FLARE_DRAW_LOG_BATCH_SIZE", "4096"))
+    INITIAL_CAPACITY = 65536
+
+    def __init__(self, path: str | None = None, batch_size: int | None = None):
+        self.path = Path(path or self.DEFAULT_DIR).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self._lock = threading.Lock()
+        self._lock_file = open(self.path / "lock", "a+b")
+        self._batches: List[Dict[str, Any]] = []
+        self._starts: List[int] = []
+        self._index_pos = 0
+        with self._locked():
+            self._open_records()
+            self._read_batches()
+
+    # ---------------------------------------------------------------- storage
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access across threads and worker processes."""
+        with self._lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open_records(self) -> None:
+        file = self.path / "draws.bin"
+        self._file = open(file, "r+b" if file.exists() else "w+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            self._file.write(HEADER.pack(MAGIC, 0))
+            size = HEADER.size
+        self._capacity = max((size - HEADER.size) // RECORD_DTYPE.itemsize, 0)
+        if self._capacity == 0:
+            self._capacity = self.INITIAL_CAPACITY
+            self._file.truncate(HEADER.size + self._capacity * RECORD_DTYPE.itemsize)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, self._count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise RuntimeError(f"{file} is not a draw log")
+
+    def _records(self) -> np.ndarray:
+        """Writable view of the record area; drop it before remapping."""
+        return np.ndarray((self._capacity,), dtype=RECORD_DTYPE, buffer=self._mm, offset=HEADER.size)
+
+    def _refresh(self) -> None:
+        """Catch up with records and batches other workers wrote (under the lock)."""
+        size = os.fstat(self._file.fileno()).st_size
+        if size != len(self._mm):
+            self._mm.close()
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+            self._capacity = (size - HEADER.size) // RECORD_DTYPE.itemsize
+        self._count = HEADER.unpack_from(self._mm, 0)[1]
+        self._read_batches()
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(HEADER.size + capacity * RECORD_DTYPE.itemsize)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = capacity
+
+    def _read_batches(self) -> None:
+        """
+        Load index lines appended since the last read (under the lock).
+
+        A torn last line from a crash mid-seal is cut off, so batches sealed
+        after it are not lost behind it; that batch is resealed.
+        """
+        try:
+            f = open(self.path / "batches.jsonl", "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._index_pos)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    batch = json.loads(line) if line.strip() else None
+                except ValueError:
+                    f.truncate(self._index_pos)
+                    break
+                if batch is not None:
+                    self._batches.append(batch)
+                    self._starts.append(batch["start"])
+                self._index_pos += len(line)
+
+    def _nodes_end(self) -> int:
+        if not self._batches:
+            return 0
+        last = self._batches[-1]
+        return last["offset"] + sum(level_sizes(last["count"])) * NODE_SIZE
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sealed(self) -> int:
+        """Number of records covered by sealed batches."""
+        if not self._batches:
+            return 0
+        last = self._batches[-1]
+        return last["start"] + last["count"]
+
+    # ---------------------------------------------------------------- writes
+
+    def append(self, seed: int, round_id: int, timestamp: int, instance: int, draw: int,
+               numbers: Sequence[int], bound: int, flags: int = 0) -> int:
+        """
+        Append one record per number, all from the same seed; return the first draw id.
+        """
+        n = len(numbers)
+        with self._locked():
+            self._refresh()
+            start = self._count
+            if start + n > self._capacity:
+                self._grow(start + n)
+            records = self._records()[start:start + n]
+            records["seed"] = np.frombuffer(seed.to_bytes(32, "big"), dtype=np.uint8)
+            records["round"] = round_id
+            records["timestamp"] = timestamp
+            records["instance"] = instance
+            records["draw"] = draw
+            records["position"] = np.arange(n, dtype=np.uint32) if flags & FLAG_BULK else 0
+            records["count"] = n
+            records["flags"] = flags
+            records["bound"] = bound
+            records["number"] = numbers
+            del records
+            self._count = start + n
+            HEADER.pack_into(self._mm, 0, MAGIC, self._count)
+            return start
+
+    def record_roll(self, roll: Dict[str, Any], bound: int) -> int:
+        """Append a roll()-shaped result; return its draw id."""
+        return self.append(int(roll["seed"], 16), roll["round"], roll["timestamp"],
+                           int(roll["instance"], 16), roll["draw"], [roll["number"]], bound)
+
+    def record_draws(self, batch: Dict[str, Any], bound: int) -> int:
+        """Append a draws()-shaped result; return the first draw id (ids are consecutive)."""
+        flags = FLAG_BULK | (FLAG_UNIQUE if batch["unique"] else 0)
+        return self.append(int(batch["seed"], 16), batch["round"], batch["timestamp"],
+                           int(batch["instance"], 16), batch["first_draw"], batch["numbers"],
+                           bound, flags)
+
+    def seal(self) -> int:
+        """
+        Seal every unsealed record into Merkle batches of at most batch_size.
+
+        Returns:
+            int: Number of batches sealed
+        """
+        sealed = 0
+        with self._locked():
+            self._refresh()
+            self._mm.flush()
+            with open(self.path / "merkle.bin", "ab") as nodes, \
+                    open(self.path / "batches.jsonl", "ab") as index:
+                # Drop nodes of a batch whose index line never made it to disk
+                if nodes.tell() > self._nodes_end():
+                    nodes.truncate(self._nodes_end())
+                    nodes.seek(0, os.SEEK_END)
+                start = self.sealed
+                while start < self._count:
+                    count = min(self.batch_size, self._count - start)
+                    raw = self._records()[start:start + count].tobytes()
+                    size = RECORD_DTYPE.itemsize
+                    level = [leaf_hash(raw[i:i + size]) for i in range(0, len(raw), size)]
+                    offset = nodes.tell()
+                    nodes.write(b"".join(level))
+                    while len(level) > 1:
+                        level = [
+                            node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                            for i in range(0, len(level), 2)
+                        ]
+                        nodes.write(b"".join(level))
+                    nodes.flush()
+                    batch = {
+                        "batch": len(self._batches),
+                        "start": start,
+                        "count": count,
+                        "offset": offset,
+                        "root": level[0].hex(),
+                        "sealed_at": int(time.time()),
+                    }
+                    line = (json.dumps(batch) + "\n").encode("utf-8")
+                    index.write(line)
+                    index.flush()
+                    self._index_pos += len(line)
+                    self._batches.append(batch)
+                    self._starts.append(start)
+                    start += count
+                    sealed += 1
+        return sealed
+
+    # ---------------------------------------------------------------- reads
+
+    def get(self, draw_id: int) -> Dict[str, Any]:
+        """
+        Return one draw record as a dict.
+
+        Raises:
+            ValueError: If no draw with this id exists
+        """
+        with self._locked():
+            self._refresh()
+            if not 0 <= draw_id < self._count:
+                raise ValueError(f"Unknown draw id {draw_id}")
+            record = self._records()[draw_id].copy()
+        return {
+            "draw_id": draw_id,
+            "seed": "0x" + record["seed"].tobytes().hex(),
+            "round": int(record["round"]),
+            "timestamp": int(record["timestamp"]),
+            "instance": hex(int(record["instance"])),
+            "draw": int(record["draw"]),
+            "position": int(record["position"]),
+            "count": int(record["count"]),
+            "bulk": bool(record["flags"] & FLAG_BULK),
+            "unique": bool(record["flags"] & FLAG_UNIQUE),
+            "bound": int(record["bound"]),
+            "number": int(record["number"]),
+            "record": record.tobytes().hex(),
+        }
+
+    def proof(self, draw_id: int) -> Dict[str, Any]:
+        """
+        Return a draw with its Merkle inclusion proof.
+
+        Returns:
+            dict: get() fields plus 'sealed' (bool); once sealed also
+            'batch', 'leaf', 'root' and 'proof' (siblings from the leaf up,
+            each {'hash', 'side'})
+
+        Raises:
+            ValueError: If no draw with this id exists
+        """
+        result = self.get(draw_id)
+        result["sealed"] = draw_id < self.sealed
+        if not result["sealed"]:
+            return result
+
+        batch = self._batches[bisect.bisect_right(self._starts, draw_id) - 1]
+        index, level_offset, proof = draw_id - batch["start"], 0, []
+        with open(self.path / "merkle.bin", "rb") as nodes:
+            def read_node(level_index: int) -> bytes:
+                nodes.seek(batch["offset"] + (level_offset + level_index) * NODE_SIZE)
+                return nodes.read(NODE_SIZE)
+
+            leaf = read_node(index)
+            for size in level_sizes(batch["count"])[:-1]:
+                sibling = index ^ 1
+                if sibling < size:
+                    proof.append({
+                        "hash": read_node(sibling).hex(),
+                        "side": "left" if sibling < index else "right",
+                    })
+                level_offset += size
+                index //= 2
+
+        result.update(batch=batch["batch"], leaf=leaf.hex(), root=batch["root"], proof=proof)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "draws": self._count,
+            "sealed": self.sealed,
+            "batches": len(self._batches),
+        }
+
+    def close(self) -> None:
+        with self._locked():
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
+        self._lock_file.close()
@@ -0,0 +1,219 @@
+"""
+Per-endpoint health tracking: adaptive timeouts and a circuit breaker.
+
+Every external dependency (FDC verifier, DA Layer, Flare RPC) gets an
+EndpointHealth. Callers ask it before each request:
+
+    if not health.allow():
+        ...fail fast...
+    started = time.perf_counter()
+    try:
+        response = send(timeout=health.timeout())
+    except Exception:
+        health.record_failure()
+        raise
+    except BaseException:       # e.g. asyncio.CancelledError
+        health.record_cancelled()
+        raise
+    health.record_success(time.perf_counter() - started)
+
+Timeouts: once enough successful latencies are recorded, the timeout is
+TIMEOUT_MULTIPLIER x the observed p99, clamped between min_timeout and the
+endpoint's configured (maximum) timeout. A healthy endpoint that answers in
+200 ms therefore times out in about a second instead of ten.
+
+Circuit breaker: when at least MIN_REQUESTS of the last WINDOW requests
+were made and FAILURE_RATE of them failed, the circuit opens and requests
+fail fast for open_seconds. Then one probe request is let through
+(half-open): success closes the circuit, failure re-opens it for twice as
+long (up to MAX_OPEN_SECONDS). A probe that is cancelled before it gets an
+answer must be released with record_cancelled(); a probe that never reports
+back at all is given up on after max_timeout, so the breaker cannot stay
+stuck half-open.
+
+Usage:
+    verifier = EndpointHealth("verifier", max_timeout=10)
+    print(verifier.stats())   # state, error rate, latency percentiles, timeout
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any
+
+import numpy as np
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+class EndpointHealth:
+    """
+    Sliding-window health of one endpoint. Thread-safe; also safe to use
+    from a single event loop.
+    """
+
+    WINDOW = 50
+    MIN_REQUESTS = 5
+    FAILURE_RATE = 0.5
+    OPEN_SECONDS = 15.0
+    MAX_OPEN_SECONDS = 120.0
+    TIMEOUT_MULTIPLIER = 3.0
+    MIN_LATENCY_SAMPLES = 20
+
+    def __init__(self, name: str, max_timeout: float, min_timeout: float = 1.0):
+        self.name = name
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self._outcomes: deque = deque(maxlen=self.WINDOW)
+        self._latencies: deque = deque(maxlen=self.WINDOW * 4)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._open_seconds = self.OPEN_SECONDS
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._opens = 0
+        self._rejected = 0
+        self._timeout = max_timeout
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------- breaker
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent now. In half-open state only one
+        probe is allowed at a time; its outcome decides the next state. A
+        probe still unanswered after max_timeout is presumed lost and
+        another one is allowed.
+        """
+        with self._lock:
+            now = time.time()
+            if self._state == OPEN and now >= self._opened_at + self._open_seconds:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and (
+                not self._probe_in_flight or now >= self._probe_started + self.max_timeout
+            ):
+                self._probe_in_flight = True
+                self._probe_started = now
+                return True
+            self._rejected += 1
+            return False
+
+    def check(self) -> None:
+        """
+        Like allow(), but raise instead of returning False.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(
+                f"{self.name} is unavailable (circuit open, retry in {self.retry_in():.0f}s)"
+            )
+
+    def retry_in(self) -> float:
+        """Seconds until the next half-open probe (0 unless open)."""
+        if self._state != OPEN:
+            return 0.0
+        return max(self._opened_at + self._open_seconds - time.time(), 0.0)
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.time()
+        self._probe_in_flight = False
+        self._opens += 1
+
+    def record_success(self, latency: float) -> None:
+        """Record a request that got an answer, with its latency in seconds."""
+        with self._lock:
+            self._outcomes.append(True)
+            self._latencies.append(latency)
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._open_seconds = self.OPEN_SECONDS
+                self._probe_in_flight = False
+                self._outcomes.clear()
+                self._outcomes.append(True)
+            self._update_timeout()
+
+    def record_failure(self) -> None:
+        """Record a request that failed (connection error, timeout, 5xx)."""
+        with self._lock:
+            self._outcomes.append(False)
+            if self._state == HALF_OPEN:
+                self._open_seconds = min(self._open_seconds * 2, self.MAX_OPEN_SECONDS)
+                self._open()
+            elif self._state == CLOSED and len(self._outcomes) >= self.MIN_REQUESTS:
+                if self._outcomes.count(False) / len(self._outcomes) >= self.FAILURE_RATE:
+                    self._open()
+
+    def record_cancelled(self) -> None:
+        """
+        Record a request abandoned by its caller before any answer (e.g.
+        cancelled by a timeout or a disconnected client). It says nothing
+        about the endpoint, so it is not counted, but if it was the
+        half-open probe another probe may be sent.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    # ---------------------------------------------------------------- timeouts
+
+    def _update_timeout(self) -> None:
+        if len(self._latencies) < self.MIN_LATENCY_SAMPLES:
+            return
+        p99 = float(np.percentile(np.fromiter(self._latencies, dtype=np.float64), 99))
+        self._timeout = min(max(p99 * self.TIMEOUT_MULTIPLIER, self.min_timeout), self.max_timeout)
+
+    def timeout(self) -> float:
+        """Current request timeout in seconds."""
+        return self._timeout
+
+    # ---------------------------------------------------------------- report
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.time() >= self._opened_at + self._open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: {
+                'state': 'closed' | 'open' | 'half_open',
+                'requests': int, 'error_rate': float,   # over the window
+                'latency_ms': {'p50', 'p95', 'p99'},    # None until measured
+                'timeout_seconds': float,
+                'opens': int, 'rejected': int, 'retry_in_seconds': float
+            }
+        """
+        state = self.state
+        with self._lock:
+            outcomes = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            latencies = np.fromiter(self._latencies, dtype=np.float64)
+        p50, p95, p99 = (
+            (np.percentile(latencies, (50, 95, 99)) * 1000).round(1).tolist()
+            if len(latencies) else (None, None, None)
+        )
+        return {
+            "state": state,
+            "requests": outcomes,
+            "error_rate": round(failures / outcomes, 4) if outcomes else 0.0,
+            "latency_ms": {"p50": p50, "p95": p95, "p99": p99},
+            "timeout_seconds": round(self._timeout, 3),
+            "opens": self._opens,
+            "rejected": self._rejected,
+            "retry_in_seconds": round(self.retry_in(), 1),
+        }
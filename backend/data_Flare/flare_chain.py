@@ -0,0 +1,559 @@
+"""
+Flare Chain Client - shared RPC connection and contract registry for Coston2
+
+All oracles read from the same chain through one client: a single tuned
+keep-alive connection pool per worker, one chain-id handshake, and every
+registry address resolved with one batched getContractAddressesByName call.
+
+Resolved addresses, the chain ID and feed-ID tables are persisted in a
+ChainMetadataCache, so a warm start connects without any RPC. Cached values are re-checked in
+the background; if one turns out to be wrong the client swaps in the
+correct address and notifies subscribed oracles so they can rebuild their
+contract handles. If the RPC turns out to be on the wrong chain, `error`
+is set (and the app reports not ready) until a later check succeeds.
+
+Every RPC goes through a web3 middleware backed by an EndpointHealth (see
+endpoint_health.py): the request timeout follows observed RPC latency and a
+circuit breaker fails calls fast with CircuitOpenError (a ConnectionError)
+while the RPC is down.
+
+Configuration (environment variables):
+    FLARE_RPC_POOL_SIZE       Max pooled connections to the RPC (default 20)
+    FLARE_RPC_KEEPALIVE       Idle keep-alive seconds, async pool (default 30)
+    FLARE_RPC_TIMEOUT         Maximum RPC request timeout in seconds (default 10)
+    FLARE_METADATA_CACHE      Chain metadata cache file (see chain_metadata.py)
+
+Usage:
+    chain = FlareChain.default()
+    chain.connect()
+    ftso = chain.contract("FtsoV2", FTSO_V2_ABI)
+
+Async (non-blocking, for use inside an event loop):
+    chain = AsyncFlareChain.default()
+    await chain.connect()
+    ftso = chain.contract("FtsoV2", FTSO_V2_ABI)
+    await chain.close()
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Any, List, Iterable, Callable
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3, AsyncWeb3
+from web3.middleware import ExtraDataToPOAMiddleware, Web3Middleware
+
+from .chain_metadata import ChainMetadataCache
+from .endpoint_health import EndpointHealth
+from .metrics import RPC_SECONDS
+from .request_trace import record_call
+
+
+class _RpcHealthMiddleware(Web3Middleware):
+    """
+    Outermost web3 middleware: fail fast while the RPC circuit is open,
+    apply the adaptive timeout, and record every request's outcome in the
+    health tracker and metrics (and, inside a traced request, its timing).
+    JSON-RPC error responses count as successes -- the endpoint answered.
+    """
+
+    health: EndpointHealth
+    request_kwargs: Dict[str, Any]
+
+    @classmethod
+    def build(cls, health: EndpointHealth, request_kwargs: Dict[str, Any] | None = None):
+        """Return a builder that web3 calls with the Web3 instance."""
+        def builder(w3):
+            middleware = cls(w3)
+            middleware.health = health
+            middleware.request_kwargs = request_kwargs if request_kwargs is not None else {}
+            return middleware
+        return builder
+
+    def wrap_make_request(self, make_request):
+        health, request_kwargs = self.health, self.request_kwargs
+
+        def middleware(method, params):
+            health.check()
+            # Shared with the HTTPProvider, which passes it to requests
+            request_kwargs["timeout"] = health.timeout()
+            started = time.perf_counter()
+            try:
+                response = make_request(method, params)
+            except Exception:
+                health.record_failure()
+                record_call("rpc", method, time.perf_counter() - started, error=True)
+                RPC_SECONDS.labels(method, "error").observe(time.perf_counter() - started)
+                raise
+            except BaseException:
+                # Cancelled, not answered: release a half-open probe
+                health.record_cancelled()
+                raise
+            health.record_success(time.perf_counter() - started)
+            record_call("rpc", method, time.perf_counter() - started)
+            RPC_SECONDS.labels(method, "ok").observe(time.perf_counter() - started)
+            return response
+
+        return middleware
+
+    async def async_wrap_make_request(self, make_request):
+        health = self.health
+
+        async def middleware(method, params):
+            health.check()
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(make_request(method, params), health.timeout())
+            except Exception:
+                health.record_failure()
+                record_call("rpc", method, time.perf_counter() - started, error=True)
+                RPC_SECONDS.labels(method, "error").observe(time.perf_counter() - started)
+                raise
+            except BaseException:
+                # Cancelled, not answered: release a half-open probe
+                health.record_cancelled()
+                raise
+            health.record_success(time.perf_counter() - started)
+            record_call("rpc", method, time.perf_counter() - started)
+            RPC_SECONDS.labels(method, "ok").observe(time.perf_counter() - started)
+            return response
+
+        return middleware
+
+
+class _FlareChainBase:
+    """
+    Network configuration and registry bookkeeping shared by the sync and
+    async chain clients. Subclasses only implement the I/O.
+    """
+
+    # Network Configuration
+    RPC_URL = "https://coston2-api.flare.network/ext/C/rpc"
+    CHAIN_ID = 114
+    CONTRACT_REGISTRY_ADDRESS = "0xaD67FE66660Fb8dFE9d6b1b4240d8650e30F6019"
+
+    # Contracts every oracle needs, resolved together in one registry call
+    CONTRACT_NAMES = ("FtsoV2", "RandomNumberV2")
+
+    # Connection pool tuning
+    POOL_SIZE = int(os.getenv("FLARE_RPC_POOL_SIZE", "20"))
+    KEEPALIVE_SECONDS = int(os.getenv("FLARE_RPC_KEEPALIVE", "30"))
+    RPC_TIMEOUT_SECONDS = float(os.getenv("FLARE_RPC_TIMEOUT", "10"))
+
+    # Delay between background revalidation attempts while the RPC is failing
+    REVALIDATE_RETRY_SECONDS = 30
+
+    # Minimal ABI for ContractRegistry
+    CONTRACT_REGISTRY_ABI = [
+        {
+            "inputs": [{"name": "name", "type": "string"}],
+            "name": "getContractAddressByName",
+            "outputs": [{"name": "", "type": "address"}],
+            "stateMutability": "view",
+            "type": "function"
+        },
+        {
+            "inputs": [{"name": "names", "type": "string[]"}],
+            "name": "getContractAddressesByName",
+            "outputs": [{"name": "", "type": "address[]"}],
+            "stateMutability": "view",
+            "type": "function"
+        }
+    ]
+
+    _default = None
+
+    @classmethod
+    def default(cls):
+        """Return the process-wide shared client, creating it on first use."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __init__(
+        self,
+        rpc_url: str | None = None,
+        pool_size: int | None = None,
+        metadata_cache: ChainMetadataCache | None = None,
+    ):
+        self.rpc_url = rpc_url or self.RPC_URL
+        self.pool_size = pool_size or self.POOL_SIZE
+        self.metadata = metadata_cache or ChainMetadataCache()
+        self.chain_id: int | None = None
+        self.addresses: Dict[str, str] = {}
+        self.feed_ids: Dict[str, str] = {}
+        # Set when revalidation finds the RPC on the wrong chain; cleared once it recovers
+        self.error: str | None = None
+        self._listeners: List[Callable[[str, str], None]] = []
+        self.rpc_health = EndpointHealth("rpc", self.RPC_TIMEOUT_SECONDS)
+
+    @property
+    def connected(self) -> bool:
+        return self.chain_id is not None
+
+    @property
+    def network_key(self) -> str:
+        """Key of this network's entry in the metadata cache."""
+        return f"{self.CHAIN_ID}:{self.CONTRACT_REGISTRY_ADDRESS.lower()}"
+
+    def on_address_change(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Register callback(name, new_address), called when background
+        revalidation finds that a cached contract address was wrong.
+        """
+        self._listeners.append(callback)
+
+    def record_feed_ids(self, feed_ids: Dict[str, str]) -> None:
+        """Persist a feed-ID table for this network alongside the addresses."""
+        if all(self.feed_ids.get(k) == v for k, v in feed_ids.items()):
+            return
+        self.feed_ids.update(feed_ids)
+        if self.connected:
+            self._save_metadata()
+
+    def address(self, name: str) -> str:
+        """
+        Return the resolved checksum address of a registry contract.
+
+        Raises:
+            RuntimeError: If the name has not been resolved yet
+        """
+        try:
+            return self.addresses[name]
+        except KeyError:
+            raise RuntimeError(f"{name} has not been resolved from the ContractRegistry")
+
+    def contract(self, name: str, abi: List[Dict[str, Any]]):
+        """Build a contract handle for a resolved registry contract."""
+        return self.w3.eth.contract(address=self.address(name), abi=abi)
+
+    def _missing(self, names: Iterable[str]) -> List[str]:
+        return [name for name in dict.fromkeys(names) if name not in self.addresses]
+
+    def _store_addresses(self, names: List[str], addresses: List[str]) -> None:
+        for name, addr in zip(names, addresses):
+            if int(addr, 16) == 0:
+                raise RuntimeError(f"{name} is not registered in the ContractRegistry")
+            self.addresses[name] = Web3.to_checksum_address(addr)
+            print(f"[OK] {name} resolved to: {self.addresses[name]}")
+
+    def _load_metadata(self, names: List[str]) -> bool:
+        """
+        Adopt the cached chain ID, addresses and feed IDs if the addresses
+        cover `names`.
+
+        Returns:
+            bool: True if the client is now connected from the cache
+        """
+        entry = self.metadata.load(self.network_key)
+        if not entry or entry.get("chain_id") != self.CHAIN_ID:
+            return False
+        addresses = entry.get("addresses", {})
+        if any(name not in addresses for name in names):
+            return False
+
+        self.chain_id = entry["chain_id"]
+        self.addresses.update(addresses)
+        self.feed_ids.update(entry.get("feed_ids", {}))
+        print(
+            f"[OK] Loaded Flare Coston2 metadata from cache "
+            f"(Chain ID: {self.chain_id}, {len(addresses)} contracts)"
+        )
+        return True
+
+    def _save_metadata(self) -> None:
+        self.metadata.save(self.network_key, {
+            "chain_id": self.chain_id,
+            "addresses": dict(self.addresses),
+            "feed_ids": dict(self.feed_ids),
+        })
+
+    def _apply_revalidation(self, chain_id: int, names: List[str], addresses: List[str]) -> None:
+        """
+        Compare live chain data with what was loaded from the cache,
+        hot-swap any address that changed and rewrite the cache entry.
+
+        Raises:
+            ConnectionError: If the RPC is on the wrong chain. The client
+                then reports the error (and is not ready) until a later
+                revalidation succeeds.
+            RuntimeError: If an address-change listener failed; that
+                address is left stale so the next revalidation retries it.
+        """
+        if chain_id != self.CHAIN_ID:
+            self.metadata.invalidate(self.network_key)
+            self.error = f"RPC at {self.rpc_url} reports chain ID {chain_id}, expected {self.CHAIN_ID}"
+            print(f"[ERROR] {self.error}; cache dropped")
+            raise ConnectionError(self.error)
+        self.chain_id = chain_id
+        self.error = None
+
+        changed = {}
+        for name, addr in zip(names, addresses):
+            if int(addr, 16) == 0:
+                continue
+            addr = Web3.to_checksum_address(addr)
+            if self.addresses.get(name) != addr:
+                changed[name] = addr
+        # Listeners rebuild contract handles from self.addresses, so update it first
+        previous = {name: self.addresses.get(name) for name in changed}
+        self.addresses.update(changed)
+
+        failed = []
+        for name, addr in changed.items():
+            print(f"[WARN] Cached {name} address was stale; hot-swapping to {addr}")
+            for callback in self._listeners:
+                try:
+                    callback(name, addr)
+                except Exception as e:
+                    print(f"[WARN] Address-change listener for {name} failed: {e}")
+                    failed.append(name)
+
+        # Keep a failed swap pending: the next revalidation sees the change
+        # again and re-notifies every listener (swaps are idempotent)
+        for name in dict.fromkeys(failed):
+            if previous[name] is None:
+                del self.addresses[name]
+            else:
+                self.addresses[name] = previous[name]
+        self._save_metadata()
+        if failed:
+            raise RuntimeError(f"Address-change listeners failed for {', '.join(dict.fromkeys(failed))}")
+
+    def _check_chain_id(self, chain_id: int) -> None:
+        if chain_id != self.CHAIN_ID:
+            raise ConnectionError(
+                f"RPC at {self.rpc_url} reports chain ID {chain_id}, expected {self.CHAIN_ID}"
+            )
+        self.chain_id = chain_id
+        print(f"[OK] Connected to Flare Coston2 Testnet (Chain ID: {chain_id})")
+
+
+class FlareChain(_FlareChainBase):
+    """
+    Shared synchronous chain client: one pooled requests.Session behind a
+    Web3 HTTPProvider, plus the registry addresses the oracles need.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str | None = None,
+        pool_size: int | None = None,
+        metadata_cache: ChainMetadataCache | None = None,
+    ):
+        super().__init__(rpc_url, pool_size, metadata_cache)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        request_kwargs = {"timeout": self.RPC_TIMEOUT_SECONDS}
+        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url, request_kwargs=request_kwargs, session=self.session))
+        self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        self.w3.middleware_onion.add(
+            _RpcHealthMiddleware.build(self.rpc_health, request_kwargs), name="rpc_health"
+        )
+        self.registry = self.w3.eth.contract(
+            address=Web3.to_checksum_address(self.CONTRACT_REGISTRY_ADDRESS),
+            abi=self.CONTRACT_REGISTRY_ABI,
+        )
+        self._lock = threading.Lock()
+
+    def connect(self, names: Iterable[str] = ()) -> None:
+        """
+        Check the chain ID and resolve CONTRACT_NAMES plus `names`.
+
+        Safe to call from every oracle: work already done is skipped, so
+        the handshake and registry lookup happen once per process. On a
+        warm metadata cache no RPC is made at all and the cached values
+        are re-checked by a background thread.
+
+        Raises:
+            ConnectionError: If unable to reach the RPC or the chain ID is wrong
+            RuntimeError: If a contract address cannot be resolved
+        """
+        wanted = [*self.CONTRACT_NAMES, *names]
+        with self._lock:
+            if not self.connected and self._load_metadata(wanted):
+                threading.Thread(
+                    target=self._revalidate_in_background, name="flare-metadata-check", daemon=True
+                ).start()
+                return
+            if not self.connected:
+                try:
+                    chain_id = self.w3.eth.chain_id
+                except Exception as e:
+                    raise ConnectionError(f"Failed to connect to Flare Coston2 RPC at {self.rpc_url}: {e}")
+                self._check_chain_id(chain_id)
+            self.resolve(wanted)
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve any not-yet-known registry names with one batched call.
+
+        Returns:
+            dict: name -> checksum address for every requested name
+
+        Raises:
+            RuntimeError: If the registry call fails or a name is unregistered
+        """
+        names = list(names)
+        missing = self._missing(names)
+        if missing:
+            try:
+                addresses = self.registry.functions.getContractAddressesByName(missing).call()
+            except Exception as e:
+                raise RuntimeError(f"Failed to resolve {', '.join(missing)}: {e}")
+            self._store_addresses(missing, addresses)
+            self._save_metadata()
+        return {name: self.addresses[name] for name in names}
+
+    def revalidate(self) -> None:
+        """
+        Re-read the chain ID and every known address from the chain and
+        hot-swap anything the metadata cache got wrong.
+        """
+        names = list(self.addresses)
+        chain_id = self.w3.eth.chain_id
+        addresses = self.registry.functions.getContractAddressesByName(names).call()
+        self._apply_revalidation(chain_id, names, addresses)
+
+    def _revalidate_in_background(self) -> None:
+        while True:
+            try:
+                self.revalidate()
+                return
+            except Exception as e:
+                print(f"[WARN] Chain metadata revalidation failed: {e}")
+                time.sleep(self.REVALIDATE_RETRY_SECONDS)
+
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self.session.close()
+
+
+class AsyncFlareChain(_FlareChainBase):
+    """
+    Shared asynchronous chain client: one tuned aiohttp connection pool
+    behind an AsyncWeb3 provider, plus the registry addresses the oracles
+    need. The pool is created lazily inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str | None = None,
+        pool_size: int | None = None,
+        metadata_cache: ChainMetadataCache | None = None,
+    ):
+        super().__init__(rpc_url, pool_size, metadata_cache)
+
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url))
+        self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        self.w3.middleware_onion.add(_RpcHealthMiddleware.build(self.rpc_health), name="rpc_health")
+        self.registry = self.w3.eth.contract(
+            address=Web3.to_checksum_address(self.CONTRACT_REGISTRY_ADDRESS),
+            abi=self.CONTRACT_REGISTRY_ABI,
+        )
+        self._session: aiohttp.ClientSession | None = None
+        self._lock: asyncio.Lock | None = None
+        self._revalidation: asyncio.Task | None = None
+
+    async def _ensure_session(self) -> None:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.KEEPALIVE_SECONDS,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            await self.w3.provider.cache_async_session(self._session)
+
+    async def connect(self, names: Iterable[str] = ()) -> None:
+        """
+        Check the chain ID and resolve CONTRACT_NAMES plus `names`.
+
+        Safe to await from every oracle concurrently: callers share one
+        handshake and one batched registry lookup. On a warm metadata
+        cache no RPC is made at all and the cached values are re-checked
+        by a background task.
+
+        Raises:
+            ConnectionError: If unable to reach the RPC or the chain ID is wrong
+            RuntimeError: If a contract address cannot be resolved
+        """
+        wanted = [*self.CONTRACT_NAMES, *names]
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._ensure_session()
+            if not self.connected and self._load_metadata(wanted):
+                self._revalidation = asyncio.create_task(
+                    self._revalidate_in_background(), name="flare-metadata-check"
+                )
+                return
+            if not self.connected:
+                try:
+                    chain_id = await self.w3.eth.chain_id
+                except Exception as e:
+                    raise ConnectionError(f"Failed to connect to Flare Coston2 RPC at {self.rpc_url}: {e}")
+                self._check_chain_id(chain_id)
+            await self._resolve_missing(wanted)
+
+    async def resolve(self, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve any not-yet-known registry names with one batched call.
+
+        Returns:
+            dict: name -> checksum address for every requested name
+
+        Raises:
+            RuntimeError: If the registry call fails or a name is unregistered
+        """
+        names = list(names)
+        if self._missing(names):
+            await self.connect(names)
+        return {name: self.addresses[name] for name in names}
+
+    async def _resolve_missing(self, names: List[str]) -> None:
+        missing = self._missing(names)
+        if not missing:
+            return
+        try:
+            addresses = await self.registry.functions.getContractAddressesByName(missing).call()
+        except Exception as e:
+            raise RuntimeError(f"Failed to resolve {', '.join(missing)}: {e}")
+        self._store_addresses(missing, addresses)
+        self._save_metadata()
+
+    async def revalidate(self) -> None:
+        """
+        Re-read the chain ID and every known address from the chain and
+        hot-swap anything the metadata cache got wrong.
+        """
+        names = list(self.addresses)
+        chain_id = await self.w3.eth.chain_id
+        addresses = await self.registry.functions.getContractAddressesByName(names).call()
+        self._apply_revalidation(chain_id, names, addresses)
+
+    async def _revalidate_in_background(self) -> None:
+        while True:
+            try:
+                await self.revalidate()
+                return
+            except Exception as e:
+                print(f"[WARN] Chain metadata revalidation failed: {e}")
+                await asyncio.sleep(self.REVALIDATE_RETRY_SECONDS)
+
+    async def close(self) -> None:
+        """Stop background revalidation and close the pooled HTTP session."""
+        if self._revalidation is not None:
+            self._revalidation.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        await self.w3.provider.disconnect()
@@ -4,48 +4,56 @@ Flare Price Oracle - FTSO v2 Integration for Coston2 Testnet
 Installation:
     pip install web3
 
+Async (non-blocking, for use inside an event loop):
+    oracle = await AsyncFlarePriceOracle.create()
+    price_data = await oracle.get_price("BTC")
+
 Usage:
     oracle = FlarePriceOracle()
     price_data = oracle.get_price("BTC")
     print(f"BTC Price: ${price_data['price']}")
+
+    prices = oracle.get_prices(["FLR", "BTC", "ETH"])  # one RPC round trip
+    print(f"ETH Price: ${prices['ETH']['price']}")
+
+    oracle.start_refresher()        # keep every feed warm, epoch by epoch
+    print(oracle.cache_stats())
+    print(oracle.price_stats("BTC", window_seconds=3600))  # once history builds up
 """
 
-from web3 import Web3
-from typing import Dict, Any
+import abc
+import asyncio
+import threading
 
+from typing import Dict, Any, List, Callable
 
-class FlarePriceOracle:
-    """
-    A robust Oracle class for fetching real-time price data from Flare's FTSO v2
-    on the Coston2 Testnet.
+from .flare_chain import FlareChain, AsyncFlareChain
+from .metrics import timed
+from .price_cache import EpochPriceCache
+from .price_history import PriceHistory
+from .voting_epochs import seconds_until_next_epoch
 
-    This class automatically resolves the FtsoV2 contract address from
-    the ContractRegistry and provides methods to query asset prices.
+
+class _FlarePriceOracleBase(abc.ABC):
+    """
+    Network configuration, ABIs and pure helpers shared by the sync and
+    async FTSO v2 price oracles. Subclasses only implement the I/O.
     """
 
-    # Network Configuration
-    RPC_URL = "https://coston2-api.flare.network/ext/C/rpc"
-    CHAIN_ID = 114
-    CONTRACT_REGISTRY_ADDRESS = "0xaD67FE66660Fb8dFE9d6b1b4240d8650e30F6019"
+    # Registry name of the FtsoV2 contract
+    REGISTRY_CONTRACT_NAME = "FtsoV2"
 
-    # Hardcoded Feed IDs for Coston2 Testnet (bytes21 format)
-    # These are pre-defined identifiers for FTSO v2 price feeds
+    # Default Feed IDs for Coston2 Testnet (bytes21 format), used for any
+    # symbol missing from the chain's cached feed-ID table
     FEED_IDS = {
         "FLR": "0x01464c522f55534400000000000000000000000000",  # FLR/USD
         "BTC": "0x014254432f55534400000000000000000000000000",  # BTC/USD
         "ETH": "0x014554482f55534400000000000000000000000000",  # ETH/USD
     }
 
-    # Minimal ABI for ContractRegistry
-    CONTRACT_REGISTRY_ABI = [
-        {
-            "inputs": [{"name": "name", "type": "string"}],
-            "name": "getContractAddressByName",
-            "outputs": [{"name": "", "type": "address"}],
-            "stateMutability": "view",
-            "type": "function"
-        }
-    ]
+    # Seconds to wait after an epoch boundary before re-reading, giving the
+    # new epoch's values time to be published on-chain
+    REFRESH_DELAY_SECONDS = 2
 
     # Minimal ABI for FtsoV2
     FTSO_V2_ABI = [
@@ -59,89 +67,194 @@ class FlarePriceOracle:
             ],
             "stateMutability": "view",
             "type": "function"
+        },
+        {
+            "inputs": [{"name": "feedIds", "type": "bytes21[]"}],
+            "name": "getFeedsById",
+            "outputs": [
+                {"name": "values", "type": "uint256[]"},
+                {"name": "decimals", "type": "int8[]"},
+                {"name": "timestamp", "type": "uint64"}
+            ],
+            "stateMutability": "payable",
+            "type": "function"
         }
     ]
 
-    def __init__(self):
+    def _get_feed_id(self, symbol: str) -> bytes:
         """
-        Initialize the FlarePriceOracle by connecting to Coston2 Testnet
-        and resolving the FtsoV2 contract address.
+        Map a symbol to its Feed ID from the network's feed-ID table.
+
+        Args:
+            symbol: Asset symbol (e.g., "BTC", "FLR", "ETH")
+
+        Returns:
+            bytes: The bytes21 Feed ID
 
         Raises:
-            ConnectionError: If unable to connect to the RPC endpoint
-            RuntimeError: If unable to resolve the FtsoV2 address
+            ValueError: If the symbol is not supported
         """
-        # Initialize Web3 provider
-        self.w3 = Web3(Web3.HTTPProvider(self.RPC_URL))
+        symbol = symbol.upper()
+        if symbol not in self.feed_ids:
+            raise ValueError(
+                f"Unsupported symbol: {symbol}. "
+                f"Supported symbols: {', '.join(self.feed_ids.keys())}"
+            )
+        return bytes.fromhex(self.feed_ids[symbol][2:])  # Remove '0x' prefix
 
-        # Verify connection
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to Flare Coston2 RPC at {self.RPC_URL}")
+    def _load_feed_ids(self) -> None:
+        """
+        Take feed IDs from the chain's per-network table, falling back to
+        FEED_IDS for symbols it lacks, and persist the merged table.
+        """
+        cached = self.chain.feed_ids
+        self.feed_ids = {symbol: cached.get(symbol, feed_id) for symbol, feed_id in self.FEED_IDS.items()}
+        self.chain.record_feed_ids(self.feed_ids)
 
-        print(f"[OK] Connected to Flare Coston2 Testnet (Chain ID: {self.w3.eth.chain_id})")
+    def _normalize_symbols(self, symbols: List[str]) -> List[str]:
+        """
+        Upper-case, de-duplicate (keeping order) and validate a symbol list.
 
-        # Initialize ContractRegistry
-        self.registry = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.CONTRACT_REGISTRY_ADDRESS),
-            abi=self.CONTRACT_REGISTRY_ABI
-        )
+        Raises:
+            ValueError: If no symbols are given or any symbol is not supported
+        """
+        wanted = list(dict.fromkeys(s.upper() for s in symbols))
+        if not wanted:
+            raise ValueError("At least one symbol is required")
+        for symbol in wanted:
+            self._get_feed_id(symbol)
+        return wanted
+
+    @staticmethod
+    def _to_price(value: int, decimals: int) -> float:
+        """
+        Convert a raw FTSO value to a human-readable price.
 
-        # Query the FtsoV2 address from the registry
-        self.ftso_v2_address = self._get_ftso_v2_address()
-        print(f"[OK] FtsoV2 resolved to: {self.ftso_v2_address}")
+        Positive decimals: divide by 10^decimals
+        Negative decimals: multiply by 10^abs(decimals)
+        """
+        if decimals >= 0:
+            return float(value / (10 ** decimals))
+        return float(value * (10 ** abs(decimals)))
+
+    @classmethod
+    def _price_dict(cls, symbol: str, value: int, decimals: int, timestamp: int) -> Dict[str, Any]:
+        """Shape one raw feed read into the dict returned by get_price()."""
+        return {
+            'symbol': f"{symbol.upper()}/USD",
+            'price': cls._to_price(value, decimals),
+            'timestamp': int(timestamp)
+        }
 
-        # Initialize FtsoV2 contract
-        self.ftso_v2 = self.w3.eth.contract(
-            address=self.ftso_v2_address,
-            abi=self.FTSO_V2_ABI
-        )
+    def _on_address_change(self, name: str, address: str) -> None:
+        """Hot-swap the FtsoV2 handle when the chain client corrects its address."""
+        if name != self.REGISTRY_CONTRACT_NAME:
+            return
+        self.ftso_v2_address = address
+        self.ftso_v2 = self.chain.contract(name, self.FTSO_V2_ABI)
+        # Values read through the wrong contract must not be served
+        self.cache.clear()
 
-    def _get_ftso_v2_address(self) -> str:
+    @abc.abstractmethod
+    def _refresher_running(self) -> bool:
+        """Whether the background epoch refresher is currently running."""
+
+    def add_refresh_listener(self, callback: Callable[[Dict[str, Dict[str, Any]]], None]) -> None:
+        """
+        Register callback(prices), called with every feed after each
+        background refresh. It runs on the refresher's thread (sync oracle)
+        or event loop (async oracle) and must not block.
         """
-        Query the ContractRegistry to get the current FtsoV2 address.
+        self._refresh_listeners.append(callback)
 
-        Returns:
-            str: Checksum address of the FtsoV2 contract
+    def _store_refresh(self, prices: Dict[str, Dict[str, Any]]) -> None:
+        """Cache a full refresh, append it to the history and notify listeners."""
+        self.cache.put_many(prices)
+        self.history.record_many(prices)
+        for callback in self._refresh_listeners:
+            try:
+                callback(prices)
+            except Exception as e:
+                print(f"[WARN] Price refresh listener failed: {e}")
+
+    def price_stats(self, symbol: str, window_seconds: float = 3600) -> Dict[str, Any]:
+        """
+        Summarise recent history for a feed (returns, volatility, min/max, TWAP).
+
+        History is filled by the epoch refresher, one point per feed per epoch;
+        no RPC is made here.
 
         Raises:
-            RuntimeError: If the contract address cannot be resolved
+            ValueError: If the symbol is not supported or has no history yet
         """
-        try:
-            address = self.registry.functions.getContractAddressByName("FtsoV2").call()
-            return Web3.to_checksum_address(address)
-        except Exception as e:
-            raise RuntimeError(f"Failed to resolve FtsoV2 address: {e}")
+        self._get_feed_id(symbol)
+        return self.history.stats(symbol.upper(), window_seconds)
 
-    def _get_feed_id(self, symbol: str) -> bytes:
+    def cache_stats(self) -> Dict[str, Any]:
         """
-        Map a symbol to its hardcoded Feed ID.
+        Return price cache statistics (hit ratio and data age per feed).
+        """
+        stats = self.cache.stats()
+        stats["refresher_running"] = self._refresher_running()
+        return stats
 
-        Args:
-            symbol: Asset symbol (e.g., "BTC", "FLR", "ETH")
 
-        Returns:
-            bytes: The bytes21 Feed ID
+class FlarePriceOracle(_FlarePriceOracleBase):
+    """
+    A robust Oracle class for fetching real-time price data from Flare's FTSO v2
+    on the Coston2 Testnet.
+
+    This class automatically resolves the FtsoV2 contract address from
+    the ContractRegistry and provides methods to query asset prices.
+
+    Reads are served from an epoch-aligned cache: a value stays cached until
+    the voting epoch it was published in ends. start_refresher() re-reads
+    every feed right after each epoch boundary so callers hit warm memory,
+    and appends each epoch's values to an in-process PriceHistory.
+    """
+
+    def __init__(self, chain: FlareChain | None = None):
+        """
+        Initialize the FlarePriceOracle on the shared chain client and
+        resolve the FtsoV2 contract address.
+
+        Args:
+            chain: Chain client to use; defaults to the process-wide
+                FlareChain.default() shared with the other oracles
 
         Raises:
-            ValueError: If the symbol is not supported
+            ConnectionError: If unable to connect to the RPC endpoint
+            RuntimeError: If unable to resolve the FtsoV2 address
         """
-        symbol = symbol.upper()
-        if symbol not in self.FEED_IDS:
-            raise ValueError(
-                f"Unsupported symbol: {symbol}. "
-                f"Supported symbols: {', '.join(self.FEED_IDS.keys())}"
-            )
-        return bytes.fromhex(self.FEED_IDS[symbol][2:])  # Remove '0x' prefix
+        # State the address-change listener touches exists before it can fire
+        # (a warm-cache connect starts revalidating in the background)
+        self.cache = EpochPriceCache()
+        self.feed_ids = dict(self.FEED_IDS)
+        self.history = PriceHistory(self.FEED_IDS)
+        self._refresh_listeners: List[Callable] = []
+        self._refresher: threading.Thread | None = None
+        self._stop_refresher = threading.Event()
+
+        self.chain = chain or FlareChain.default()
+        self.chain.on_address_change(self._on_address_change)
+        self.chain.connect([self.REGISTRY_CONTRACT_NAME])
+        self._load_feed_ids()
+
+        # Initialize FtsoV2 contract
+        self.ftso_v2_address = self.chain.address(self.REGISTRY_CONTRACT_NAME)
+        self.ftso_v2 = self.chain.contract(self.REGISTRY_CONTRACT_NAME, self.FTSO_V2_ABI)
 
+    @timed("price")
     def get_price(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch the current price for a given asset symbol from FTSO v2.
 
         This method:
         1. Converts the symbol to its corresponding Feed ID
-        2. Calls getFeedById on the FtsoV2 contract
-        3. Processes the returned value using the decimals field
-        4. Returns a clean dictionary with the price and metadata
+        2. Returns the cached value if its voting epoch has not ended yet
+        3. Otherwise calls getFeedById on the FtsoV2 contract
+        4. Processes the returned value using the decimals field
+        5. Returns a clean dictionary with the price and metadata
 
         Args:
             symbol: Asset symbol (e.g., "BTC", "FLR", "ETH")
@@ -162,6 +275,54 @@ class FlarePriceOracle:
             >>> data = oracle.get_price("BTC")
             >>> print(f"Bitcoin price: ${data['price']:,.2f}")
         """
+        symbol = symbol.upper()
+        self._get_feed_id(symbol)
+
+        cached = self.cache.get(symbol)
+        if cached is not None:
+            return cached
+
+        data = self._fetch_price(symbol)
+        self.cache.put(symbol, data)
+        return data
+
+    @timed("price")
+    def get_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the current prices for several symbols in a single RPC call.
+
+        All feeds are read with one getFeedsById eth_call, so every value
+        comes from the same block and shares the same timestamp. If any of
+        the requested symbols is not cached, the whole batch is re-read so
+        the result never mixes values from different reads.
+
+        Args:
+            symbols: Asset symbols (e.g., ["FLR", "BTC", "ETH"]). Duplicates
+                are ignored; order is preserved.
+
+        Returns:
+            dict: Maps each upper-cased symbol to a get_price()-shaped dict,
+            e.g. {'BTC': {'symbol': 'BTC/USD', 'price': ..., 'timestamp': ...}}
+
+        Raises:
+            ValueError: If no symbols are given or any symbol is not supported
+            RuntimeError: If the contract call fails
+        """
+        # Validate every symbol before touching the cache or the network
+        wanted = self._normalize_symbols(symbols)
+
+        cached = self.cache.get_many(wanted)
+        if cached is not None:
+            return cached
+
+        prices = self._fetch_prices(wanted)
+        self.cache.put_many(prices)
+        return prices
+
+    def _fetch_price(self, symbol: str) -> Dict[str, Any]:
+        """
+        Read one feed from the FtsoV2 contract, bypassing the cache.
+        """
         try:
             # Get the Feed ID for the symbol
             feed_id = self._get_feed_id(symbol)
@@ -169,20 +330,7 @@ class FlarePriceOracle:
             # Call the contract
             value, decimals, timestamp = self.ftso_v2.functions.getFeedById(feed_id).call()
 
-            # Convert raw value to human-readable price
-            # decimals indicates the number of decimal places
-            # Positive decimals: divide by 10^decimals
-            # Negative decimals: multiply by 10^abs(decimals)
-            if decimals >= 0:
-                price = value / (10 ** decimals)
-            else:
-                price = value * (10 ** abs(decimals))
-
-            return {
-                'symbol': f"{symbol.upper()}/USD",
-                'price': float(price),
-                'timestamp': int(timestamp)
-            }
+            return self._price_dict(symbol, value, decimals, timestamp)
 
         except ValueError as e:
             # Re-raise ValueError for unsupported symbols
@@ -190,6 +338,221 @@ class FlarePriceOracle:
         except Exception as e:
             raise RuntimeError(f"Failed to fetch price for {symbol}: {e}")
 
+    def _fetch_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read several feeds with one getFeedsById call, bypassing the cache.
+        """
+        feed_ids = [self._get_feed_id(symbol) for symbol in symbols]
+
+        try:
+            values, decimals, timestamp = self.ftso_v2.functions.getFeedsById(feed_ids).call()
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch prices for {', '.join(symbols)}: {e}")
+
+        return {
+            symbol: self._price_dict(symbol, value, dec, timestamp)
+            for symbol, value, dec in zip(symbols, values, decimals)
+        }
+
+    @timed("price")
+    def refresh_all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Re-read every known feed in one call, store it in the cache,
+        append it to the price history and notify refresh listeners.
+
+        Returns:
+            dict: The freshly read prices, keyed by symbol
+        """
+        prices = self._fetch_prices(list(self.feed_ids))
+        self._store_refresh(prices)
+        return prices
+
+    def start_refresher(self) -> None:
+        """
+        Start a daemon thread that refreshes all feeds after each epoch boundary.
+
+        Calling this more than once is a no-op while the thread is alive.
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop_refresher.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, name="ftso-price-refresher", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        """Stop the background refresher started by start_refresher()."""
+        self._stop_refresher.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_refresher.is_set():
+            try:
+                self.refresh_all()
+            except RuntimeError as e:
+                print(f"[WARN] Price refresh failed: {e}")
+            delay = seconds_until_next_epoch() + self.REFRESH_DELAY_SECONDS
+            self._stop_refresher.wait(delay)
+
+    def _refresher_running(self) -> bool:
+        return self._refresher is not None and self._refresher.is_alive()
+
+
+class AsyncFlarePriceOracle(_FlarePriceOracleBase):
+    """
+    Non-blocking counterpart of FlarePriceOracle built on AsyncWeb3.
+
+    Every RPC is awaited on the running event loop, so a single worker can
+    keep many reads in flight. Construction does no I/O; call connect()
+    (or use create()) from inside the event loop before reading prices.
+    """
+
+    def __init__(self, chain: AsyncFlareChain | None = None):
+        self.cache = EpochPriceCache()
+        self.feed_ids = dict(self.FEED_IDS)
+        self.history = PriceHistory(self.FEED_IDS)
+        self._refresh_listeners: List[Callable] = []
+        self._refresher: asyncio.Task | None = None
+
+        self.ftso_v2_address = None
+        self.ftso_v2 = None
+        self.chain = chain or AsyncFlareChain.default()
+        self.chain.on_address_change(self._on_address_change)
+
+    @classmethod
+    async def create(cls, chain: AsyncFlareChain | None = None) -> "AsyncFlarePriceOracle":
+        """Construct an oracle and connect it in one step."""
+        oracle = cls(chain)
+        await oracle.connect()
+        return oracle
+
+    async def connect(self) -> None:
+        """
+        Connect the shared chain client and resolve the FtsoV2 contract.
+
+        Raises:
+            ConnectionError: If unable to connect to the RPC endpoint
+            RuntimeError: If unable to resolve the FtsoV2 address
+        """
+        await self.chain.connect([self.REGISTRY_CONTRACT_NAME])
+        self._load_feed_ids()
+        self.ftso_v2_address = self.chain.address(self.REGISTRY_CONTRACT_NAME)
+        self.ftso_v2 = self.chain.contract(self.REGISTRY_CONTRACT_NAME, self.FTSO_V2_ABI)
+
+    async def close(self) -> None:
+        """Stop the refresher. The shared chain client is closed by its owner."""
+        await self.stop_refresher()
+
+    @timed("price")
+    async def get_price(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch the current price for a given asset symbol from FTSO v2.
+
+        Same contract and return shape as FlarePriceOracle.get_price().
+
+        Raises:
+            ValueError: If the symbol is not supported
+            RuntimeError: If the contract call fails
+        """
+        symbol = symbol.upper()
+        feed_id = self._get_feed_id(symbol)
+
+        cached = self.cache.get(symbol)
+        if cached is not None:
+            return cached
+
+        try:
+            value, decimals, timestamp = await self.ftso_v2.functions.getFeedById(feed_id).call()
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch price for {symbol}: {e}")
+
+        data = self._price_dict(symbol, value, decimals, timestamp)
+        self.cache.put(symbol, data)
+        return data
+
+    @timed("price")
+    async def get_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the current prices for several symbols in a single RPC call.
+
+        Same contract and return shape as FlarePriceOracle.get_prices().
+
+        Raises:
+            ValueError: If no symbols are given or any symbol is not supported
+            RuntimeError: If the contract call fails
+        """
+        wanted = self._normalize_symbols(symbols)
+
+        cached = self.cache.get_many(wanted)
+        if cached is not None:
+            return cached
+
+        prices = await self._fetch_prices(wanted)
+        self.cache.put_many(prices)
+        return prices
+
+    async def _fetch_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read several feeds with one getFeedsById call, bypassing the cache.
+        """
+        feed_ids = [self._get_feed_id(symbol) for symbol in symbols]
+
+        try:
+            values, decimals, timestamp = await self.ftso_v2.functions.getFeedsById(feed_ids).call()
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch prices for {', '.join(symbols)}: {e}")
+
+        return {
+            symbol: self._price_dict(symbol, value, dec, timestamp)
+            for symbol, value, dec in zip(symbols, values, decimals)
+        }
+
+    @timed("price")
+    async def refresh_all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Re-read every known feed in one call, store it in the cache,
+        append it to the price history and notify refresh listeners.
+        """
+        prices = await self._fetch_prices(list(self.feed_ids))
+        self._store_refresh(prices)
+        return prices
+
+    def start_refresher(self) -> None:
+        """
+        Start a task on the running loop that refreshes all feeds after
+        each epoch boundary. A no-op while the task is already running.
+        """
+        if self._refresher_running():
+            return
+        self._refresher = asyncio.create_task(
+            self._refresh_loop(), name="ftso-price-refresher"
+        )
+
+    async def stop_refresher(self) -> None:
+        """Cancel the background refresher started by start_refresher()."""
+        if self._refresher is None:
+            return
+        self._refresher.cancel()
+        try:
+            await self._refresher
+        except asyncio.CancelledError:
+            pass
+        self._refresher = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh_all()
+            except RuntimeError as e:
+                print(f"[WARN] Price refresh failed: {e}")
+            await asyncio.sleep(seconds_until_next_epoch() + self.REFRESH_DELAY_SECONDS)
+
+    def _refresher_running(self) -> bool:
+        return self._refresher is not None and not self._refresher.done()
+
 
 def main():
     """
@@ -222,6 +585,12 @@ def main():
                 print(f"\n{symbol}/USD:")
                 print(f"  Error: {e}")
 
+        print("\nFetching all prices in one call...")
+        print("-" * 60)
+
+        for price_data in oracle.get_prices(symbols).values():
+            print(f"  {price_data['symbol']:<8} ${price_data['price']:,.2f}  @ {price_data['timestamp']}")
+
         print("\n" + "=" * 60)
         print("[SUCCESS] Test completed successfully!")
         print("=" * 60)
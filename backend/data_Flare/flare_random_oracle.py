@@ -13,93 +13,284 @@ Usage:
     result = oracle.get_random_decision()
     print(result)
     # {'raw': 7658424...154215, 'score': 42, 'decision': 'HOLD'}
+
+Async (non-blocking, for use inside an event loop):
+    oracle = await AsyncFlareRandomOracle.create()
+    result = await oracle.get_random_decision()
+
+Lottery rolls:
+    The on-chain value only changes once per voting round (~90s), so it is
+    cached per round and rolls are drawn from a local counter-mode DRBG
+    seeded by it and keyed with a per-round server key (see round_drbg.py).
+    Only the first roll of a round costs an RPC; every roll reports the
+    round it was seeded from and a commitment to the round key.
+
+    roll = oracle.roll(100000)
+    # {'number': 4821, 'round': 812345, 'timestamp': 1731541234, 'draw': 17,
+    #  'instance': '0x…', 'commitment': '…', 'next_commitment': '…', 'seed': '0x…'}
+
+    batch = oracle.draws(5000, 100000, unique=True)   # one read, bulk derivation
+
+    oracle.reveal(812345)   # key and seed, once the round is over
+
+    The 'seed' field is for server-side logging only: serve it to clients
+    through reveal(), not with the draw.
 """
 
-from web3 import Web3
-from web3.middleware import ExtraDataToPOAMiddleware
-from typing import Dict, Any
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
 
+from .flare_chain import FlareChain, AsyncFlareChain
+from .metrics import timed
+from .round_drbg import RoundDRBG, RoundKeys
+from .voting_epochs import voting_round_id, next_epoch_boundary, round_start_ts
 
-class FlareRandomOracle:
-    """
-    Oracle class for fetching secure random numbers from Flare's
-    RandomNumberV2 contract on the Coston2 Testnet.
 
-    The random number is generated by the Flare protocol's relay system
-    and is cryptographically secure (sourced from FTSO commit-reveal rounds).
+class _FlareRandomOracleBase:
+    """
+    Network configuration, ABIs and pure helpers shared by the sync and
+    async random oracles. Subclasses only implement the I/O.
     """
-
-    # Network Configuration
-    RPC_URL = "https://coston2-api.flare.network/ext/C/rpc"
-    CHAIN_ID = 114
-    CONTRACT_REGISTRY_ADDRESS = "0xaD67FE66660Fb8dFE9d6b1b4240d8650e30F6019"
 
     # Registry name -- "RandomNumberV2" (NOT "RandomNumberV2Interface")
     REGISTRY_CONTRACT_NAME = "RandomNumberV2"
 
-    # Minimal ABI for ContractRegistry
-    CONTRACT_REGISTRY_ABI = [
-        {
-            "inputs": [{"name": "name", "type": "string"}],
-            "name": "getContractAddressByName",
-            "outputs": [{"name": "", "type": "address"}],
-            "stateMutability": "view",
-            "type": "function"
-        }
-    ]
+    # Seconds to keep a round whose epoch has already ended before re-reading
+    STALE_RETRY_SECONDS = 5
+
+    # Seconds after a round ends before its DRBG key is revealed. No draws
+    # are made from a round after that, even if the chain stops updating.
+    REVEAL_AFTER_SECONDS = 90
+
+    # Rounds whose seeds are kept for reveal() (~1 day of 90 s rounds)
+    SEED_HISTORY = 1000
 
     # Minimal ABI for RandomNumberV2 (Relay contract)
-    # getRandomNumber() -> uint256
+    # getRandomNumber() -> (uint256 randomNumber, bool isSecureRandom, uint256 randomTimestamp)
     RANDOM_ABI = [
         {
             "inputs": [],
             "name": "getRandomNumber",
-            "outputs": [{"name": "", "type": "uint256"}],
+            "outputs": [
+                {"name": "_randomNumber", "type": "uint256"},
+                {"name": "_isSecureRandom", "type": "bool"},
+                {"name": "_randomTimestamp", "type": "uint256"}
+            ],
             "stateMutability": "view",
             "type": "function"
         }
     ]
 
-    def __init__(self):
+    def _on_address_change(self, name: str, address: str) -> None:
+        """Hot-swap the RandomNumberV2 handle when the chain client corrects its address."""
+        if name != self.REGISTRY_CONTRACT_NAME:
+            return
+        self.random_address = address
+        self.random_contract = self.chain.contract(name, self.RANDOM_ABI)
+        self._round = None
+
+    def _init_round_cache(self) -> None:
+        self._round: Optional[Dict[str, Any]] = None
+        self._round_expires_at = 0.0
+        self._drbg: Optional[RoundDRBG] = None
+        # Reseeding happens on the loop and in draws() worker threads
+        self._drbg_lock = threading.Lock()
+        self.round_keys = RoundKeys()
+        # Seeds of recent rounds, for reveal(); a round seeds at most one DRBG
+        self._seeds: Dict[int, int] = {}
+        self._round_listeners: List[Callable] = []
+
+    def add_round_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register callback(round), called with every value read from the
+        chain (get_random_round()-shaped, secure or not). It runs on the
+        caller's thread or event loop and must not block.
         """
-        Initialize the FlareRandomOracle by connecting to Coston2 Testnet
-        and resolving the RandomNumberV2 contract address from the registry.
+        self._round_listeners.append(callback)
+
+    def _cached_round(self) -> Optional[Dict[str, Any]]:
+        """Return the cached round if it has not expired yet."""
+        if self._round is not None and self._round_expires_at > time.time():
+            return self._round
+        return None
+
+    def _store_round(self, raw: tuple) -> Dict[str, Any]:
+        """
+        Turn a getRandomNumber() result into a round dict and cache it.
+
+        Only secure values are cached; the entry expires at the first epoch
+        boundary after the value's timestamp (or STALE_RETRY_SECONDS from
+        now if that boundary has already passed).
+        """
+        value, is_secure, timestamp = raw
+        result = {
+            "random": value,
+            "is_secure": is_secure,
+            "timestamp": timestamp,
+            "round": voting_round_id(timestamp),
+        }
+        if is_secure:
+            now = time.time()
+            expires_at = next_epoch_boundary(timestamp)
+            if expires_at <= now:
+                expires_at = now + self.STALE_RETRY_SECONDS
+            self._round, self._round_expires_at = result, expires_at
+        for callback in self._round_listeners:
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"[WARN] Random round listener failed: {e}")
+        return result
+
+    def reveal_at(self, round_id: int) -> int:
+        """Unix time at which the key of `round_id` is revealed."""
+        return round_start_ts(round_id + 1) + self.REVEAL_AFTER_SECONDS
+
+    def reveal(self, round_id: int, instance: int | None = None) -> Dict[str, Any]:
+        """
+        Reveal the DRBG key of a finished round, so its draws can be audited.
+
+        Args:
+            round_id: Voting round
+            instance: Instance id from the draw (default: this process)
+
+        Returns:
+            dict: {
+                'round': int,
+                'instance': str,      # Hex instance id
+                'key': str,           # Hex round key
+                'commitment': str,    # Hex SHA-256 of the key, as published with each draw
+                'seed': str | None    # Hex on-chain seed, if this process drew from the round
+            }
 
         Raises:
-            ConnectionError: If unable to connect to the RPC endpoint
-            RuntimeError: If unable to resolve the contract address
+            ValueError: If the round is not over yet
+            LookupError: If the key belongs to another process and no shared
+                FLARE_DRBG_SECRET is configured
         """
-        self.w3 = Web3(Web3.HTTPProvider(self.RPC_URL))
-        self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        if time.time() < self.reveal_at(round_id):
+            raise ValueError(f"Round {round_id} is revealed at {self.reveal_at(round_id)}")
+        if instance is None:
+            instance = self.round_keys.instance
+        key = self.round_keys.key(round_id, instance)
+        seed = self._seeds.get(round_id)
+        return {
+            "round": round_id,
+            "instance": hex(instance),
+            "key": key.hex(),
+            "commitment": hashlib.sha256(key).hexdigest(),
+            "seed": hex(seed) if seed is not None else None,
+        }
 
-        if not self.w3.is_connected():
-            raise ConnectionError(
-                f"Failed to connect to Flare Coston2 RPC at {self.RPC_URL}"
-            )
+    def _round_drbg(self, current: Dict[str, Any]) -> RoundDRBG:
+        """Return the DRBG for `current`, reseeding when the round changed."""
+        if not current["is_secure"]:
+            raise RuntimeError("On-chain random number is not secure for this round")
+        if time.time() >= self.reveal_at(current["round"]):
+            raise RuntimeError(f"On-chain random number of round {current['round']} is stale")
+        with self._drbg_lock:
+            drbg = self._drbg
+            if drbg is None or drbg.round_id != current["round"] or drbg.seed != current["random"]:
+                round_id = current["round"]
+                # A fresh DRBG restarts at counter 0; never replay a round's stream
+                if round_id in self._seeds:
+                    raise RuntimeError(f"Round {round_id} has already been superseded")
+                self._seeds[round_id] = current["random"]
+                while len(self._seeds) > self.SEED_HISTORY:
+                    del self._seeds[next(iter(self._seeds))]
+                drbg = self._drbg = RoundDRBG(current["random"], round_id,
+                                              self.round_keys.key(round_id))
+        return drbg
+
+    def _draw_fields(self, current: Dict[str, Any]) -> Dict[str, Any]:
+        """Round, commitment and seed fields reported with every draw."""
+        keys, round_id = self.round_keys, current["round"]
+        return {
+            "round": round_id,
+            "timestamp": current["timestamp"],
+            "instance": hex(keys.instance),
+            "commitment": keys.commitment(round_id).hex(),
+            "next_commitment": keys.commitment(round_id + 1).hex(),
+            "seed": hex(current["random"]),
+        }
 
-        print(f"[OK] Connected to Flare Coston2 Testnet (Chain ID: {self.w3.eth.chain_id})")
+    def _roll_from(self, current: Dict[str, Any], bound: int) -> Dict[str, Any]:
+        """Draw one roll in [0, bound) from the DRBG seeded by `current`."""
+        number, draw = self._round_drbg(current).randbelow(bound)
+        return {"number": number, "draw": draw, **self._draw_fields(current)}
 
-        # Resolve contract address from registry
-        registry = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.CONTRACT_REGISTRY_ADDRESS),
-            abi=self.CONTRACT_REGISTRY_ABI,
-        )
+    def _draws_from(self, current: Dict[str, Any], n: int, bound: int, unique: bool) -> Dict[str, Any]:
+        """Derive `n` values in [0, bound) in bulk from the DRBG seeded by `current`."""
+        numbers, first_draw, blocks = self._round_drbg(current).draws(n, bound, unique)
+        return {
+            "numbers": numbers.tolist(),
+            "first_draw": first_draw,
+            "blocks": blocks,
+            "unique": unique,
+            **self._draw_fields(current),
+        }
 
-        try:
-            addr = registry.functions.getContractAddressByName(
-                self.REGISTRY_CONTRACT_NAME
-            ).call()
-            self.random_address = Web3.to_checksum_address(addr)
-        except Exception as e:
-            raise RuntimeError(f"Failed to resolve {self.REGISTRY_CONTRACT_NAME}: {e}")
+    @staticmethod
+    def _decision_from_raw(raw: int) -> Dict[str, Any]:
+        """
+        Map a raw 256-bit random number to a score and trading decision.
+        """
+        # Normalize to 0-100 range
+        score = raw % 101
+
+        # Map score to decision
+        if score > 66:
+            decision = "BUY"
+        elif score < 33:
+            decision = "SELL"
+        else:
+            decision = "HOLD"
+
+        return {
+            "raw": raw,
+            "score": score,
+            "decision": decision,
+        }
+
+
+class FlareRandomOracle(_FlareRandomOracleBase):
+    """
+    Oracle class for fetching secure random numbers from Flare's
+    RandomNumberV2 contract on the Coston2 Testnet.
+
+    The random number is generated by the Flare protocol's relay system
+    and is cryptographically secure (sourced from FTSO commit-reveal rounds).
+    """
+
+    def __init__(self, chain: FlareChain | None = None):
+        """
+        Initialize the FlareRandomOracle on the shared chain client and
+        resolve the RandomNumberV2 contract address from the registry.
+
+        Args:
+            chain: Chain client to use; defaults to the process-wide
+                FlareChain.default() shared with the other oracles
 
-        print(f"[OK] {self.REGISTRY_CONTRACT_NAME} resolved to: {self.random_address}")
+        Raises:
+            ConnectionError: If unable to connect to the RPC endpoint
+            RuntimeError: If unable to resolve the contract address
+        """
+        # State the address-change listener touches exists before it can fire
+        # (a warm-cache connect starts revalidating in the background)
+        self._init_round_cache()
+        self._round_lock = threading.Lock()
+
+        self.chain = chain or FlareChain.default()
+        self.chain.on_address_change(self._on_address_change)
+        self.chain.connect([self.REGISTRY_CONTRACT_NAME])
 
-        self.random_contract = self.w3.eth.contract(
-            address=self.random_address,
-            abi=self.RANDOM_ABI,
-        )
+        self.random_address = self.chain.address(self.REGISTRY_CONTRACT_NAME)
+        self.random_contract = self.chain.contract(self.REGISTRY_CONTRACT_NAME, self.RANDOM_ABI)
 
+    @timed("random")
     def get_random_number(self) -> int:
         """
         Fetch the latest on-chain random number (raw uint256).
@@ -110,11 +301,92 @@ class FlareRandomOracle:
         Raises:
             RuntimeError: If the contract call fails
         """
-        try:
-            return self.random_contract.functions.getRandomNumber().call()
-        except Exception as e:
-            raise RuntimeError(f"Failed to fetch random number: {e}")
+        return self.get_random_round()["random"]
 
+    @timed("random")
+    def get_random_round(self) -> Dict[str, Any]:
+        """
+        Return the current round's random value, cached until the round ends.
+
+        Concurrent callers that miss the cache wait for a single RPC.
+
+        Returns:
+            dict: {
+                'random': int,       # 256-bit on-chain random number
+                'is_secure': bool,   # False if the round's reveal was incomplete
+                'timestamp': int,    # Unix time the value was produced
+                'round': int         # Voting round the value belongs to
+            }
+
+        Raises:
+            RuntimeError: If the contract call fails
+        """
+        cached = self._cached_round()
+        if cached is not None:
+            return cached
+        with self._round_lock:
+            cached = self._cached_round()
+            if cached is not None:
+                return cached
+            try:
+                raw = self.random_contract.functions.getRandomNumber().call()
+            except Exception as e:
+                raise RuntimeError(f"Failed to fetch random number: {e}")
+            return self._store_round(raw)
+
+    @timed("random")
+    def roll(self, bound: int = 100000) -> Dict[str, Any]:
+        """
+        Draw a uniform integer in [0, bound) seeded by the current round.
+
+        Returns:
+            dict: {
+                'number': int,      # The roll
+                'round': int,       # Voting round of the seed
+                'timestamp': int,   # On-chain timestamp of the seed
+                'draw': int,        # DRBG counter, for auditing the roll
+                'instance': str,    # Hex instance id the round key belongs to
+                'commitment': str,  # Hex SHA-256 of this round's key
+                'next_commitment': str,  # Same for the next round
+                'seed': str         # Hex on-chain seed; server-side only until reveal()
+            }
+
+        Raises:
+            RuntimeError: If the contract call fails or the value is not secure or stale
+        """
+        return self._roll_from(self.get_random_round(), bound)
+
+    @timed("random")
+    def draws(self, n: int, bound: int = 100000, unique: bool = False) -> Dict[str, Any]:
+        """
+        Draw `n` uniform integers in [0, bound) from one on-chain read.
+
+        Args:
+            n: Number of values
+            bound: Exclusive upper bound
+            unique: Require all values to be distinct (n <= bound)
+
+        Returns:
+            dict: {
+                'numbers': list[int],
+                'round': int,        # Voting round of the seed
+                'timestamp': int,    # On-chain timestamp of the seed
+                'first_draw': int,   # First DRBG counter used
+                'blocks': int,       # DRBG blocks consumed
+                'unique': bool,
+                'instance': str,     # Hex instance id the round key belongs to
+                'commitment': str,   # Hex SHA-256 of this round's key
+                'next_commitment': str,
+                'seed': str          # Hex on-chain seed; server-side only until reveal()
+            }
+
+        Raises:
+            RuntimeError: If the contract call fails or the value is not secure or stale
+            ValueError: If n or bound is out of range
+        """
+        return self._draws_from(self.get_random_round(), n, bound, unique)
+
+    @timed("random")
     def get_random_decision(self) -> Dict[str, Any]:
         """
         Fetch a random number and convert it into a trading decision.
@@ -135,24 +407,115 @@ class FlareRandomOracle:
         Raises:
             RuntimeError: If the contract call fails
         """
-        raw = self.get_random_number()
+        return self._decision_from_raw(self.get_random_number())
 
-        # Normalize to 0-100 range
-        score = raw % 101
 
-        # Map score to decision
-        if score > 66:
-            decision = "BUY"
-        elif score < 33:
-            decision = "SELL"
-        else:
-            decision = "HOLD"
+class AsyncFlareRandomOracle(_FlareRandomOracleBase):
+    """
+    Non-blocking counterpart of FlareRandomOracle built on AsyncWeb3.
 
-        return {
-            "raw": raw,
-            "score": score,
-            "decision": decision,
-        }
+    Construction does no I/O; call connect() (or use create()) from inside
+    the event loop before fetching random numbers.
+    """
+
+    def __init__(self, chain: AsyncFlareChain | None = None):
+        self._init_round_cache()
+        self._round_lock = asyncio.Lock()
+        self.random_address = None
+        self.random_contract = None
+        self.chain = chain or AsyncFlareChain.default()
+        self.chain.on_address_change(self._on_address_change)
+
+    @classmethod
+    async def create(cls, chain: AsyncFlareChain | None = None) -> "AsyncFlareRandomOracle":
+        """Construct an oracle and connect it in one step."""
+        oracle = cls(chain)
+        await oracle.connect()
+        return oracle
+
+    async def connect(self) -> None:
+        """
+        Connect the shared chain client and resolve the RandomNumberV2 contract.
+
+        Raises:
+            ConnectionError: If unable to connect to the RPC endpoint
+            RuntimeError: If unable to resolve the contract address
+        """
+        await self.chain.connect([self.REGISTRY_CONTRACT_NAME])
+        self.random_address = self.chain.address(self.REGISTRY_CONTRACT_NAME)
+        self.random_contract = self.chain.contract(self.REGISTRY_CONTRACT_NAME, self.RANDOM_ABI)
+
+    @timed("random")
+    async def get_random_number(self) -> int:
+        """
+        Fetch the latest on-chain random number (raw uint256).
+
+        Raises:
+            RuntimeError: If the contract call fails
+        """
+        return (await self.get_random_round())["random"]
+
+    @timed("random")
+    async def get_random_round(self) -> Dict[str, Any]:
+        """
+        Return the current round's random value, cached until the round ends.
+
+        Same return shape as FlareRandomOracle.get_random_round().
+
+        Raises:
+            RuntimeError: If the contract call fails
+        """
+        cached = self._cached_round()
+        if cached is not None:
+            return cached
+        async with self._round_lock:
+            cached = self._cached_round()
+            if cached is not None:
+                return cached
+            try:
+                raw = await self.random_contract.functions.getRandomNumber().call()
+            except Exception as e:
+                raise RuntimeError(f"Failed to fetch random number: {e}")
+            return self._store_round(raw)
+
+    @timed("random")
+    async def roll(self, bound: int = 100000) -> Dict[str, Any]:
+        """
+        Draw a uniform integer in [0, bound) seeded by the current round.
+
+        Same return shape as FlareRandomOracle.roll().
+
+        Raises:
+            RuntimeError: If the contract call fails or the value is not secure or stale
+        """
+        return self._roll_from(await self.get_random_round(), bound)
+
+    @timed("random")
+    async def draws(self, n: int, bound: int = 100000, unique: bool = False) -> Dict[str, Any]:
+        """
+        Draw `n` uniform integers in [0, bound) from one on-chain read.
+
+        Same return shape as FlareRandomOracle.draws(). Derivation runs in a
+        worker thread so large batches do not stall the event loop.
+
+        Raises:
+            RuntimeError: If the contract call fails or the value is not secure or stale
+            ValueError: If n or bound is out of range
+        """
+        current = await self.get_random_round()
+        return await asyncio.to_thread(self._draws_from, current, n, bound, unique)
+
+    @timed("random")
+    async def get_random_decision(self) -> Dict[str, Any]:
+        """
+        Fetch a random number and convert it into a trading decision.
+
+        Same scoring and return shape as FlareRandomOracle.get_random_decision().
+
+        Raises:
+            RuntimeError: If the contract call fails
+        """
+        return self._decision_from_raw(await self.get_random_number())
 
 
 def main():
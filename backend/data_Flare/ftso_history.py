@@ -0,0 +1,407 @@
+"""
+Historical FTSO backfill into a compressed columnar store.
+
+Every voting round, the FtsoFeedPublisher contract emits one
+FtsoFeedPublished event per anchor feed. FtsoBackfill scans those events
+with eth_getLogs over many block ranges concurrently, adapting the range
+size to whatever the RPC accepts (public Flare RPCs cap getLogs ranges),
+and FtsoHistoryStore writes the rows into per-feed compressed NumPy
+segments indexed by feed and time.
+
+Layout of a store directory:
+    index.json                  feed -> segments with min/max timestamp
+    <FEED>/<first>-<last>-<ns>.npz
+                                one segment: first/last voting round, write time;
+                                columns: round_id, timestamp, value, decimals,
+                                turnout_bips (sorted by time)
+
+Configuration (environment variables):
+    FLARE_HISTORY_DIR         Store directory
+                              (default ~/.cache/flare-copilot/ftso_history)
+
+Usage:
+    store = FtsoHistoryStore()
+    backfill = FtsoBackfill(chain, store, FlarePriceOracle.FEED_IDS)
+    report = await backfill.run(from_block, to_block)
+    rows = store.query("BTC", start_ts, end_ts)
+
+CLI (backfills the most recent blocks):
+    python -m data_Flare.ftso_history --blocks 200000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+from web3 import Web3
+
+from .flare_chain import AsyncFlareChain
+from .voting_epochs import FIRST_VOTING_ROUND_START_TS, VOTING_EPOCH_DURATION_SECONDS
+
+COLUMNS = ("round_id", "timestamp", "value", "decimals", "turnout_bips")
+
+
+class FtsoHistoryStore:
+    """
+    Append-only, compressed columnar store of published FTSO feed values.
+
+    Each append writes one new sorted segment per feed; index.json records
+    every segment's time span so a range query only opens the segments it
+    overlaps. compact() merges a feed's segments into one.
+    """
+
+    VERSION = 1
+
+    DEFAULT_DIR = os.getenv(
+        "FLARE_HISTORY_DIR",
+        str(Path.home() / ".cache" / "flare-copilot" / "ftso_history"),
+    )
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or self.DEFAULT_DIR).expanduser()
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.path / "index.json", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == self.VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"version": self.VERSION, "feeds": {}}
+
+    def _save_index(self) -> None:
+        tmp = self.path / "index.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp, self.path / "index.json")
+
+    @property
+    def feeds(self) -> List[str]:
+        return list(self._index["feeds"])
+
+    def row_count(self, symbol: str | None = None) -> int:
+        """Rows stored for one feed, or for all feeds (duplicates included)."""
+        feeds = [symbol] if symbol else self.feeds
+        return sum(seg["rows"] for f in feeds for seg in self._index["feeds"].get(f, []))
+
+    def append(self, symbol: str, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Write one segment of rows for a feed.
+
+        Args:
+            symbol: Feed symbol, e.g. "BTC"
+            columns: Equal-length arrays keyed by COLUMNS
+        """
+        segment = self._write_segment(symbol, columns)
+        if segment is None:
+            return
+        with self._lock:
+            self._index["feeds"].setdefault(symbol, []).append(segment)
+            self._save_index()
+
+    def _write_segment(self, symbol: str, columns: Dict[str, np.ndarray]) -> Dict[str, Any] | None:
+        """Write rows as a sorted segment file; return its (not yet indexed) entry."""
+        if not len(columns["timestamp"]):
+            return None
+        order = np.argsort(columns["timestamp"], kind="stable")
+        columns = {name: np.asarray(columns[name])[order] for name in COLUMNS}
+        first, last = int(columns["round_id"][0]), int(columns["round_id"][-1])
+
+        feed_dir = self.path / symbol
+        feed_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{first}-{last}-{time.time_ns()}.npz"
+        np.savez_compressed(feed_dir / name, **columns)
+        return {
+            "file": f"{symbol}/{name}",
+            "min_ts": int(columns["timestamp"][0]),
+            "max_ts": int(columns["timestamp"][-1]),
+            "rows": int(len(columns["timestamp"])),
+        }
+
+    def query(self, symbol: str, start_ts: int | None = None, end_ts: int | None = None) -> Dict[str, np.ndarray]:
+        """
+        Return all rows for a feed with start_ts <= timestamp <= end_ts.
+
+        Only segments whose span overlaps the range are read. Rows are
+        sorted by time and de-duplicated by round (overlapping backfills).
+
+        Returns:
+            dict: Column name -> NumPy array (empty arrays if no rows)
+        """
+        symbol = symbol.upper()
+        start_ts = -1 if start_ts is None else start_ts
+        end_ts = 2 ** 62 if end_ts is None else end_ts
+
+        with self._lock:
+            segments = [
+                seg for seg in self._index["feeds"].get(symbol, [])
+                if seg["max_ts"] >= start_ts and seg["min_ts"] <= end_ts
+            ]
+        return self._read(segments, start_ts, end_ts)
+
+    def _read(self, segments: List[Dict[str, Any]], start_ts: int = -1,
+              end_ts: int = 2 ** 62) -> Dict[str, np.ndarray]:
+        """Rows of `segments` within the range, sorted by time and de-duplicated by round."""
+        parts = []
+        for seg in segments:
+            with np.load(self.path / seg["file"]) as data:
+                ts = data["timestamp"]
+                lo = np.searchsorted(ts, start_ts, side="left")
+                hi = np.searchsorted(ts, end_ts, side="right")
+                parts.append({name: data[name][lo:hi] for name in COLUMNS})
+
+        if not parts:
+            return {name: np.empty(0) for name in COLUMNS}
+        merged = {name: np.concatenate([p[name] for p in parts]) for name in COLUMNS}
+        _, first = np.unique(merged["round_id"], return_index=True)
+        return {name: col[first] for name, col in merged.items()}
+
+    def prices(self, rows: Dict[str, np.ndarray]) -> np.ndarray:
+        """Convert queried value/decimals columns to float prices."""
+        return rows["value"].astype(np.float64) * np.power(10.0, -rows["decimals"].astype(np.float64))
+
+    def summary(self, symbol: str, start_ts: int | None = None, end_ts: int | None = None,
+                max_points: int = 24) -> Dict[str, Any]:
+        """
+        Summarise a feed over a time range, with an evenly downsampled series.
+
+        Raises:
+            ValueError: If the store holds no rows for the feed in that range
+        """
+        symbol = symbol.upper()
+        rows = self.query(symbol, start_ts, end_ts)
+        if not len(rows["timestamp"]):
+            raise ValueError(f"No stored FTSO history for {symbol} in that range")
+        prices = self.prices(rows)
+        ts = rows["timestamp"]
+        picks = np.unique(np.linspace(0, len(ts) - 1, min(max_points, len(ts))).astype(np.int64))
+        return {
+            "symbol": f"{symbol}/USD",
+            "rows": int(len(ts)),
+            "from_timestamp": int(ts[0]),
+            "to_timestamp": int(ts[-1]),
+            "first": float(prices[0]),
+            "last": float(prices[-1]),
+            "min": float(prices.min()),
+            "max": float(prices.max()),
+            "mean": float(prices.mean()),
+            "change_pct": float((prices[-1] / prices[0] - 1) * 100),
+            "series": [[int(ts[i]), float(prices[i])] for i in picks],
+        }
+
+    def compact(self, symbol: str) -> None:
+        """
+        Merge all of a feed's segments into one de-duplicated segment.
+
+        The merged segment is written before the index drops the old ones,
+        so a failed write leaves the feed as it was. Segments appended
+        while compacting are kept.
+        """
+        with self._lock:
+            old = list(self._index["feeds"].get(symbol, []))
+        if not old:
+            return
+        merged = self._write_segment(symbol, self._read(old))
+        with self._lock:
+            replaced = {seg["file"] for seg in old}
+            kept = [seg for seg in self._index["feeds"].get(symbol, []) if seg["file"] not in replaced]
+            self._index["feeds"][symbol] = ([merged] if merged else []) + kept
+            self._save_index()
+        for seg in old:
+            (self.path / seg["file"]).unlink(missing_ok=True)
+
+
+class FtsoBackfill:
+    """
+    Concurrent, adaptive eth_getLogs scanner for FtsoFeedPublished events.
+
+    The block range is split into chunks that `concurrency` workers fetch
+    in parallel. A chunk the RPC rejects is split in half and retried; the
+    shared chunk size shrinks on errors and grows again after successes.
+    A single block that still fails after MAX_RETRIES is skipped and
+    reported, so it can be backfilled again later. Decoded rows are written
+    to the store in a worker thread, off the event loop.
+    """
+
+    REGISTRY_CONTRACT_NAME = "FtsoFeedPublisher"
+
+    # keccak256("FtsoFeedPublished(uint32,bytes21,int32,uint16,int8)")
+    EVENT_TOPIC = Web3.to_hex(Web3.keccak(text="FtsoFeedPublished(uint32,bytes21,int32,uint16,int8)"))
+
+    INITIAL_CHUNK_BLOCKS = 30
+    MAX_CHUNK_BLOCKS = 5000
+    MAX_RETRIES = 5
+    FLUSH_ROWS = 250_000
+
+    def __init__(self, chain: AsyncFlareChain, store: FtsoHistoryStore, feed_ids: Dict[str, str],
+                 concurrency: int = 8):
+        self.chain = chain
+        self.store = store
+        self.concurrency = concurrency
+        # bytes21 ids are left-aligned in their 32-byte topic
+        self._feed_topics = {
+            "0x" + feed_id[2:].ljust(64, "0"): symbol for symbol, feed_id in feed_ids.items()
+        }
+        self.chunk = self.INITIAL_CHUNK_BLOCKS
+        self._pending: Dict[str, List[Tuple[int, bytes]]] = {}
+        self._skipped: List[int] = []
+        self._stats = {"requests": 0, "errors": 0, "logs": 0, "rows_written": 0}
+
+    async def run(self, from_block: int, to_block: int) -> Dict[str, Any]:
+        """
+        Scan [from_block, to_block] and write every published value to the store.
+
+        Returns:
+            dict: Blocks scanned, RPC requests, errors, logs, rows written,
+            final chunk size, elapsed seconds and 'skipped_blocks': the
+            [first, last] block ranges that failed every retry
+        """
+        await self.chain.connect()
+        address = (await self.chain.resolve([self.REGISTRY_CONTRACT_NAME]))[self.REGISTRY_CONTRACT_NAME]
+        started = time.perf_counter()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        await queue.put((from_block, to_block, 0))
+        workers = [
+            asyncio.create_task(self._worker(queue, address))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        await self._flush()
+
+        return {
+            **self._stats,
+            "blocks": to_block - from_block + 1,
+            "skipped_blocks": self._skipped_ranges(),
+            "chunk_blocks": self.chunk,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    async def _worker(self, queue: asyncio.Queue, address: str) -> None:
+        while True:
+            start, end, attempt = await queue.get()
+            try:
+                # Carve one chunk off the front and hand the rest to other workers
+                if end - start + 1 > self.chunk:
+                    queue.put_nowait((start + self.chunk, end, 0))
+                    end = start + self.chunk - 1
+                try:
+                    logs = await self._get_logs(address, start, end)
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    self.chunk = max(1, self.chunk // 2)
+                    if end > start:
+                        mid = (start + end) // 2
+                        queue.put_nowait((start, mid, 0))
+                        queue.put_nowait((mid + 1, end, 0))
+                    elif attempt < self.MAX_RETRIES:
+                        await asyncio.sleep(2 ** attempt)
+                        queue.put_nowait((start, end, attempt + 1))
+                    else:
+                        self._skipped.append(start)
+                        print(f"[WARN] Skipping block {start} after {attempt} retries: {e}")
+                    continue
+                self.chunk = min(self.MAX_CHUNK_BLOCKS, self.chunk + max(1, self.chunk // 4))
+                await self._collect(logs)
+            finally:
+                queue.task_done()
+
+    async def _get_logs(self, address: str, start: int, end: int) -> list:
+        self._stats["requests"] += 1
+        return await self.chain.w3.eth.get_logs({
+            "fromBlock": start,
+            "toBlock": end,
+            "address": address,
+            "topics": [self.EVENT_TOPIC, None, list(self._feed_topics)],
+        })
+
+    def _skipped_ranges(self) -> List[List[int]]:
+        """Skipped blocks merged into sorted [first, last] ranges."""
+        ranges: List[List[int]] = []
+        for block in sorted(self._skipped):
+            if ranges and block == ranges[-1][1] + 1:
+                ranges[-1][1] = block
+            else:
+                ranges.append([block, block])
+        return ranges
+
+    async def _collect(self, logs: list) -> None:
+        for log in logs:
+            symbol = self._feed_topics.get("0x" + bytes(log["topics"][2]).hex())
+            if symbol is None:
+                continue
+            round_id = int.from_bytes(bytes(log["topics"][1])[-4:], "big")
+            self._pending.setdefault(symbol, []).append((round_id, bytes(log["data"])))
+        self._stats["logs"] += len(logs)
+        if sum(len(rows) for rows in self._pending.values()) >= self.FLUSH_ROWS:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        """Decode and write the pending rows in a thread; workers keep collecting meanwhile."""
+        pending, self._pending = self._pending, {}
+        await asyncio.to_thread(self._write, pending)
+        self._stats["rows_written"] += sum(len(rows) for rows in pending.values())
+
+    def _write(self, pending: Dict[str, List[Tuple[int, bytes]]]) -> None:
+        for symbol, rows in pending.items():
+            self.store.append(symbol, self._decode(rows))
+
+    @staticmethod
+    def _decode(rows: List[Tuple[int, bytes]]) -> Dict[str, np.ndarray]:
+        """
+        Decode event payloads in bulk: abi-encoded (int32 value,
+        uint16 turnoutBIPS, int8 decimals), one 32-byte word each.
+        """
+        round_id = np.fromiter((r for r, _ in rows), dtype=np.uint32, count=len(rows))
+        data = np.frombuffer(b"".join(d[:96] for _, d in rows), dtype=np.uint8).reshape(-1, 96)
+        return {
+            "round_id": round_id,
+            "timestamp": FIRST_VOTING_ROUND_START_TS + round_id.astype(np.int64) * VOTING_EPOCH_DURATION_SECONDS,
+            "value": data[:, 28:32].copy().view(">i4").ravel().astype(np.int64),
+            "decimals": data[:, 95].copy().view(np.int8),
+            "turnout_bips": data[:, 62:64].copy().view(">u2").ravel().astype(np.uint16),
+        }
+
+
+def main():
+    """Backfill the most recent blocks of FTSO history into the local store."""
+    from .flare_oracle import FlarePriceOracle
+
+    parser = argparse.ArgumentParser(description="Backfill FTSO feed history")
+    parser.add_argument("--blocks", type=int, default=50_000, help="How many recent blocks to scan")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--store", default=None, help="Store directory")
+    args = parser.parse_args()
+
+    async def run():
+        chain = AsyncFlareChain()
+        try:
+            await chain.connect()
+            latest = await chain.w3.eth.block_number
+            store = FtsoHistoryStore(args.store)
+            backfill = FtsoBackfill(chain, store, FlarePriceOracle.FEED_IDS, args.concurrency)
+            report = await backfill.run(max(0, latest - args.blocks), latest)
+            print(f"[OK] Backfill finished: {report}")
+            print(f"[OK] Store at {store.path} holds {store.row_count()} rows")
+        finally:
+            await chain.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
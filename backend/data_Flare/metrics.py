@@ -0,0 +1,328 @@
+"""
+Prometheus-style metrics with lock-free recording.
+
+Counters and histograms are sharded per thread: each thread increments its
+own list of values, created (under a lock) the first time that thread
+touches a metric, and a scrape sums the shards. When a thread exits, its
+shard is folded into a base total and released, so short-lived threads do
+not accumulate shards. Recording a value is a
+dict lookup, a thread-local lookup and a couple of list increments, with
+no lock and no allocation, so metrics can stay on in production. A scrape
+may see a histogram's buckets a few increments apart from its count; the
+next scrape catches up.
+
+Callback metrics expose counters other components already keep (cache
+hits and misses, single-flight sharing) by reading them at scrape time.
+
+Latency histograms carry an `outcome` label ("ok" / "error"), so their
+_count series also count calls and errors.
+
+Usage:
+    RPC_SECONDS.labels("eth_call", "ok").observe(0.012)
+    REGISTRY.callback("flare_cache_requests_total", "Cache lookups", ("cache", "result"),
+                      lambda: {("price", "hit"): cache.hits})
+    text = REGISTRY.render()     # text exposition format 0.0.4
+"""
+
+import functools
+import inspect
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Dict, Any, Callable, Iterable, List, Sequence, Tuple
+
+# Seconds; covers in-memory cache hits up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Shard:
+    """A thread's value list. Held only by its thread-local, so it is freed when the thread exits."""
+
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self, size: int):
+        self.values = [0.0] * size
+
+
+class _Shards:
+    """Per-thread value lists, summed on read, plus the totals of exited threads."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._base = [0.0] * size
+        self._live: Dict[int, List[float]] = {}
+        # Reentrant: a shard can be retired by garbage collection while this thread holds it
+        self._lock = threading.RLock()
+
+    def mine(self) -> List[float]:
+        try:
+            return self._local.shard.values
+        except AttributeError:
+            shard = _Shard(self.size)
+            with self._lock:
+                self._live[id(shard.values)] = shard.values
+            weakref.finalize(shard, self._retire, shard.values)
+            self._local.shard = shard
+            return shard.values
+
+    def _retire(self, values: List[float]) -> None:
+        """Fold an exited thread's values into the base total."""
+        with self._lock:
+            self._live.pop(id(values), None)
+            for i, value in enumerate(values):
+                self._base[i] += value
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = [list(self._base), *self._live.values()]
+        return [sum(column) for column in zip(*shards)]
+
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._shards.mine()[0] += amount
+
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One count per bucket (non-cumulative), then +Inf, then the sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.mine()
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def time(self):
+        """Context manager observing the duration of the enclosed block."""
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """(cumulative bucket counts incl. +Inf, sum, count)"""
+        totals = self._shards.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+
+class _Timer:
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Rendered children, keyed by label values as strings
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        # Same children keyed by the values as passed (e.g. int status codes)
+        self._lookup: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """The child for one combination of label values."""
+        child = self._lookup.get(values)
+        if child is None:
+            key = tuple(map(str, values))
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+                self._lookup[values] = child
+        return child
+
+    def _label_str(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in list(self._children.items()):
+            lines.append(f"{self.name}{self._label_str(key)} {_fmt(child.value())}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe into the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in list(self._children.items()):
+            cumulative, total, count = child.snapshot()
+            for bound, value in zip((*self.buckets, float("inf")), cumulative):
+                le = 'le="{}"'.format("+Inf" if bound == float("inf") else _fmt(bound))
+                lines.append(f"{self.name}_bucket{self._label_str(key, le)} {_fmt(value)}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {_fmt(count)}")
+        return lines
+
+
+class _Callback(_Metric):
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 fn: Callable[[], Dict[Tuple[str, ...], float]], kind: str):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, value in self.fn().items():
+            lines.append(f"{self.name}{self._label_str(tuple(map(str, key)))} {_fmt(value)}")
+        return lines
+
+
+class Registry:
+    """A set of metrics rendered together by /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, labelnames: Sequence[str],
+                 fn: Callable[[], Dict[Tuple[str, ...], float]], kind: str = "counter") -> None:
+        """
+        Register a metric whose values are read from fn() at scrape time.
+        fn returns {label values tuple: value}.
+        """
+        self._register(_Callback(name, documentation, labelnames, fn, kind))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                print(f"[WARN] Rendering metric {metric.name} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = Registry()
+
+# Library metrics; the app registers its own (HTTP, tools, Anthropic) on REGISTRY
+RPC_SECONDS = REGISTRY.histogram(
+    "flare_rpc_request_seconds", "Flare JSON-RPC requests by method", ("method", "outcome"))
+FDC_HTTP_SECONDS = REGISTRY.histogram(
+    "flare_fdc_http_request_seconds", "FDC verifier and DA Layer HTTP requests",
+    ("endpoint", "method", "outcome"))
+ORACLE_SECONDS = REGISTRY.histogram(
+    "flare_oracle_call_seconds", "Oracle method calls", ("oracle", "method", "outcome"))
+
+
+def timed(oracle: str):
+    """
+    Decorator recording a sync or async oracle method in ORACLE_SECONDS,
+    labelled with the oracle name and the method's name.
+    """
+    def decorate(fn):
+        ok = ORACLE_SECONDS.labels(oracle, fn.__name__, "ok")
+        error = ORACLE_SECONDS.labels(oracle, fn.__name__, "error")
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    error.observe(time.perf_counter() - started)
+                    raise
+                ok.observe(time.perf_counter() - started)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                error.observe(time.perf_counter() - started)
+                raise
+            ok.observe(time.perf_counter() - started)
+            return result
+        return wrapper
+
+    return decorate
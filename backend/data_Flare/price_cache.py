@@ -0,0 +1,129 @@
+"""
+Epoch-aligned price cache for FTSO v2 feeds.
+
+FTSO v2 values only change when a new voting epoch starts, so a price read
+stays valid until the next epoch boundary after the timestamp the contract
+returned. Entries expire at that boundary rather than on a fixed TTL.
+
+Usage:
+    cache = EpochPriceCache()
+    cache.put("BTC", {"symbol": "BTC/USD", "price": 97000.0, "timestamp": ts})
+    cached = cache.get("BTC")   # None once the epoch has rolled over
+    print(cache.stats())
+"""
+
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+
+from .voting_epochs import next_epoch_boundary
+
+
+class EpochPriceCache:
+    """
+    Thread-safe cache of the latest FTSO price per symbol.
+
+    Each entry expires at the first epoch boundary after its on-chain
+    timestamp. If the chain hands back a value whose epoch has already
+    ended (the feed is lagging), the entry is kept only for
+    STALE_RETRY_SECONDS so the next read tries again soon.
+    """
+
+    STALE_RETRY_SECONDS = 5
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached price dict for `symbol`, or None if absent/expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None or entry["expires_at"] <= now:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry["data"]
+
+    def get_many(self, symbols: Iterable[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Return cached price dicts for all `symbols`, or None if any is missing.
+
+        The lookup is all-or-nothing so that a batch never mixes values
+        from different reads; a partial hit counts as one miss.
+        """
+        now = time.time()
+        with self._lock:
+            result = {}
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry is None or entry["expires_at"] <= now:
+                    self._misses += 1
+                    return None
+                result[symbol] = entry["data"]
+            self._hits += 1
+            return result
+
+    def put(self, symbol: str, data: Dict[str, Any]) -> None:
+        """
+        Store a price dict; its expiry is derived from data['timestamp'].
+        """
+        now = time.time()
+        expires_at = next_epoch_boundary(data["timestamp"])
+        if expires_at <= now:
+            expires_at = now + self.STALE_RETRY_SECONDS
+        with self._lock:
+            self._entries[symbol] = {
+                "data": data,
+                "expires_at": expires_at,
+                "fetched_at": now,
+            }
+
+    def put_many(self, prices: Dict[str, Dict[str, Any]]) -> None:
+        """Store several price dicts (as returned by get_prices())."""
+        for symbol, data in prices.items():
+            self.put(symbol, data)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the age of the cached data.
+
+        Returns:
+            dict: {
+                'hits': int,
+                'misses': int,
+                'hit_ratio': float,         # 0.0 when nothing was requested
+                'entries': int,
+                'max_age_seconds': float,   # now - oldest on-chain timestamp
+                'feeds': {symbol: {'age_seconds', 'expires_in_seconds', 'fresh'}}
+            }
+        """
+        now = time.time()
+        with self._lock:
+            total = self._hits + self._misses
+            feeds = {
+                symbol: {
+                    "age_seconds": round(now - entry["data"]["timestamp"], 3),
+                    "expires_in_seconds": round(entry["expires_at"] - now, 3),
+                    "fresh": entry["expires_at"] > now,
+                }
+                for symbol, entry in self._entries.items()
+            }
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+                "entries": len(feeds),
+                "max_age_seconds": max((f["age_seconds"] for f in feeds.values()), default=None),
+                "feeds": feeds,
+            }
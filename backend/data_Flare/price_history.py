@@ -0,0 +1,181 @@
+"""
+In-process FTSO price history with vectorized analytics.
+
+A fixed-memory, columnar ring buffer per feed: one int64 timestamp column
+and one float64 price column, each a preallocated NumPy array. The price
+oracle's epoch refresher appends one point per feed per voting epoch, so
+the default capacity holds roughly four days of history in ~64 KB per feed.
+All analytics (returns, rolling volatility, min/max, TWAP) run as NumPy
+array operations over the window, not Python loops.
+
+Usage:
+    history = PriceHistory(["BTC", "ETH"])
+    history.record_many(oracle.get_prices(["BTC", "ETH"]))
+    print(history.stats("BTC", window_seconds=3600))
+"""
+
+import math
+import os
+import threading
+from typing import Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from .voting_epochs import VOTING_EPOCH_DURATION_SECONDS
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+class PriceHistory:
+    """
+    Columnar ring buffer of (timestamp, price) points for a fixed set of feeds.
+
+    Points older than `capacity` samples are overwritten. A point whose
+    timestamp is not newer than the feed's latest point is ignored, so the
+    same epoch's value is never stored twice.
+    """
+
+    DEFAULT_CAPACITY = int(os.getenv("FLARE_PRICE_HISTORY_CAPACITY", "4096"))
+
+    def __init__(self, symbols: Iterable[str], capacity: int | None = None):
+        self.capacity = capacity or self.DEFAULT_CAPACITY
+        self._ts = {s: np.zeros(self.capacity, dtype=np.int64) for s in symbols}
+        self._px = {s: np.zeros(self.capacity, dtype=np.float64) for s in self._ts}
+        self._next = dict.fromkeys(self._ts, 0)
+        self._count = dict.fromkeys(self._ts, 0)
+        self._lock = threading.Lock()
+
+    @property
+    def symbols(self) -> list:
+        return list(self._ts)
+
+    def record(self, symbol: str, price: float, timestamp: int) -> bool:
+        """
+        Append one point. Returns False if it was ignored as a duplicate.
+
+        Raises:
+            ValueError: If the symbol is not tracked
+        """
+        if symbol not in self._ts:
+            raise ValueError(f"No price history for {symbol}")
+        with self._lock:
+            i, n = self._next[symbol], self._count[symbol]
+            if n and timestamp <= self._ts[symbol][i - 1]:
+                return False
+            self._ts[symbol][i] = timestamp
+            self._px[symbol][i] = price
+            self._next[symbol] = (i + 1) % self.capacity
+            self._count[symbol] = min(n + 1, self.capacity)
+            return True
+
+    def record_many(self, prices: Dict[str, Dict[str, Any]]) -> None:
+        """Append a get_prices()-shaped result, skipping untracked symbols."""
+        for symbol, data in prices.items():
+            if symbol in self._ts:
+                self.record(symbol, data["price"], data["timestamp"])
+
+    def series(self, symbol: str, window_seconds: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (timestamps, prices) in chronological order.
+
+        Args:
+            symbol: Tracked feed symbol
+            window_seconds: Only keep points newer than latest - window_seconds
+
+        Raises:
+            ValueError: If the symbol is not tracked
+        """
+        if symbol not in self._ts:
+            raise ValueError(f"No price history for {symbol}")
+        with self._lock:
+            i, n = self._next[symbol], self._count[symbol]
+            if n < self.capacity:
+                ts, px = self._ts[symbol][:n].copy(), self._px[symbol][:n].copy()
+            else:
+                ts = np.concatenate((self._ts[symbol][i:], self._ts[symbol][:i]))
+                px = np.concatenate((self._px[symbol][i:], self._px[symbol][:i]))
+        if window_seconds is not None and len(ts):
+            start = np.searchsorted(ts, ts[-1] - window_seconds, side="left")
+            ts, px = ts[start:], px[start:]
+        return ts, px
+
+    @staticmethod
+    def log_returns(px: np.ndarray) -> np.ndarray:
+        """Per-step log returns of a price series."""
+        return np.diff(np.log(px))
+
+    @staticmethod
+    def twap(ts: np.ndarray, px: np.ndarray) -> float:
+        """
+        Time-weighted average price: each price weighted by how long it
+        stood until the next point.
+        """
+        if len(px) == 1:
+            return float(px[0])
+        dt = np.diff(ts)
+        return float(np.dot(px[:-1], dt) / dt.sum())
+
+    @classmethod
+    def rolling_volatility(cls, px: np.ndarray, points: int) -> np.ndarray:
+        """
+        Standard deviation of log returns over each trailing `points`-sized window.
+        """
+        returns = cls.log_returns(px)
+        if len(returns) < points or points < 2:
+            return np.empty(0)
+        # Sample variance from running sums: O(n) regardless of window size
+        s1 = np.concatenate(([0.0], np.cumsum(returns)))
+        s2 = np.concatenate(([0.0], np.cumsum(returns * returns)))
+        w1 = s1[points:] - s1[:-points]
+        w2 = s2[points:] - s2[:-points]
+        var = (w2 - w1 * w1 / points) / (points - 1)
+        return np.sqrt(np.maximum(var, 0.0))
+
+    def stats(self, symbol: str, window_seconds: float = 3600, rolling_points: int = 10) -> Dict[str, Any]:
+        """
+        Summarise a feed's recent history.
+
+        Args:
+            symbol: Tracked feed symbol
+            window_seconds: Look-back window, measured back from the latest point
+            rolling_points: Window length (in samples) for rolling volatility
+
+        Returns:
+            dict: {
+                'symbol', 'points', 'from_timestamp', 'to_timestamp',
+                'last', 'min', 'max', 'twap', 'return_pct',
+                'volatility',             # stdev of per-epoch log returns
+                'volatility_annualized',
+                'rolling_volatility'      # latest rolling value, or None
+            }
+
+        Raises:
+            ValueError: If the symbol is not tracked or has no data yet
+        """
+        symbol = symbol.upper()
+        ts, px = self.series(symbol, window_seconds)
+        if not len(px):
+            raise ValueError(f"No price history recorded for {symbol} yet")
+
+        returns = self.log_returns(px)
+        volatility = float(returns.std(ddof=1)) if len(returns) > 1 else None
+        annualized = None
+        if volatility is not None:
+            step = float(np.median(np.diff(ts))) or VOTING_EPOCH_DURATION_SECONDS
+            annualized = volatility * math.sqrt(SECONDS_PER_YEAR / step)
+        rolling = self.rolling_volatility(px, rolling_points)
+
+        return {
+            "symbol": f"{symbol}/USD",
+            "points": int(len(px)),
+            "from_timestamp": int(ts[0]),
+            "to_timestamp": int(ts[-1]),
+            "last": float(px[-1]),
+            "min": float(px.min()),
+            "max": float(px.max()),
+            "twap": self.twap(ts, px),
+            "return_pct": float((px[-1] / px[0] - 1) * 100),
+            "volatility": volatility,
+            "volatility_annualized": annualized,
+            "rolling_volatility": float(rolling[-1]) if len(rolling) else None,
+        }
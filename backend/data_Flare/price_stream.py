@@ -0,0 +1,87 @@
+"""
+Fan-out of FTSO price updates to many streaming clients.
+
+The price oracle's epoch refresher reads every feed once per voting epoch
+and hands the result to PriceBroadcaster.publish(). Each connected client
+owns a small bounded queue; publish() never blocks, and a client whose
+queue is full is dropped instead of slowing everyone else down. RPC cost
+is therefore one batched read per epoch no matter how many clients watch.
+
+Usage:
+    broadcaster = PriceBroadcaster()
+    oracle.add_refresh_listener(broadcaster.publish)
+
+    subscriber = broadcaster.subscribe()
+    try:
+        while (update := await subscriber.queue.get()) is not None:
+            ...
+    finally:
+        broadcaster.unsubscribe(subscriber)
+"""
+
+import asyncio
+import os
+from typing import Dict, Any
+
+
+class PriceSubscriber:
+    """One streaming client: a bounded queue of price updates."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+
+class PriceBroadcaster:
+    """
+    Single-producer, many-consumer broadcaster for price refreshes.
+
+    A None item on a subscriber's queue means it was dropped for being
+    too slow and should close its stream.
+    """
+
+    QUEUE_SIZE = int(os.getenv("FLARE_STREAM_QUEUE_SIZE", "16"))
+
+    def __init__(self, queue_size: int | None = None):
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: set[PriceSubscriber] = set()
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self) -> PriceSubscriber:
+        """Register a new client. Call unsubscribe() when it disconnects."""
+        subscriber = PriceSubscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: PriceSubscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, prices: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Push one refresh (get_prices()-shaped) to every subscriber without
+        blocking. Must be called from the event loop thread.
+        """
+        self.latest.update(prices)
+        self._published += 1
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(prices)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: PriceSubscriber) -> None:
+        self._subscribers.discard(subscriber)
+        subscriber.dropped = True
+        self._dropped += 1
+        # Make room for the close sentinel; the client is going away anyway
+        subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self._published,
+            "dropped_slow_clients": self._dropped,
+        }
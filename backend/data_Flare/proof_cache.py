@@ -0,0 +1,207 @@
+"""
+Two-tier cache for finalized FDC attestation proofs.
+
+A proof fetched from the DA Layer for a finalized round never changes, so
+it is kept in an in-memory LRU (bounded by serialized bytes) backed by an
+on-disk tier that survives restarts and is shared by every worker on the
+host. Disk entries are addressed by round and request hash:
+
+    <dir>/<round_id>/<request_hash>.json    {"sha256": ..., "proof": ...}
+
+where request_hash is the SHA-256 of the request that produced the proof,
+and sha256 is the hash of the proof's canonical JSON, checked on load so a
+torn or corrupted file is treated as a miss. Files are written atomically
+(temp file + rename), so concurrent workers never read a partial entry.
+
+Only real proofs should be stored; callers must not put demo fallbacks.
+
+Configuration (environment variables):
+    FLARE_PROOF_CACHE_DIR           Disk tier directory
+                                    (default ~/.cache/flare-copilot/fdc_proofs)
+    FLARE_PROOF_CACHE_MEMORY_BYTES  Memory tier budget (default 32 MiB)
+    FLARE_PROOF_CACHE_DISK_BYTES    Disk tier budget (default 512 MiB)
+
+Usage:
+    cache = ProofCache()
+    key = ProofCache.request_hash("GET", url)
+    proof, tier = cache.get(round_id, key)      # tier: "memory", "disk" or None
+    cache.put(round_id, key, proof)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+
+def _canonical(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
+
+class ProofCache:
+    """
+    Byte-bounded LRU in memory, byte-bounded directory on disk.
+
+    A disk hit is promoted into memory. When the disk tier goes over its
+    budget, the least recently used files (by mtime, refreshed on hit) are
+    deleted until it is back under 90% of the budget.
+    """
+
+    DEFAULT_DIR = os.getenv(
+        "FLARE_PROOF_CACHE_DIR",
+        str(Path.home() / ".cache" / "flare-copilot" / "fdc_proofs"),
+    )
+    MEMORY_BYTES = int(os.getenv("FLARE_PROOF_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+    DISK_BYTES = int(os.getenv("FLARE_PROOF_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+
+    def __init__(self, path: str | None = None, memory_bytes: int | None = None,
+                 disk_bytes: int | None = None):
+        self.path = Path(path or self.DEFAULT_DIR).expanduser()
+        self.memory_bytes = memory_bytes or self.MEMORY_BYTES
+        self.disk_bytes = disk_bytes or self.DISK_BYTES
+        self._memory: "OrderedDict[Tuple[int, str], Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._memory_used = 0
+        self._disk_used: Optional[int] = None   # measured on first write
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ("memory_hits", "disk_hits", "misses", "stores", "memory_evictions", "disk_evictions"), 0
+        )
+
+    @staticmethod
+    def request_hash(method: str, url: str, body: Any = None) -> str:
+        """SHA-256 identifying the request that produced a proof."""
+        return hashlib.sha256(method.encode() + b" " + url.encode() + b"\n" + _canonical(body)).hexdigest()
+
+    def _file(self, round_id: int, key: str) -> Path:
+        return self.path / str(round_id) / f"{key}.json"
+
+    # ---------------------------------------------------------------- reads
+
+    def get(self, round_id: int, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Look a proof up in memory, then on disk.
+
+        Returns:
+            tuple: (proof or None, tier it came from: "memory", "disk" or None)
+        """
+        with self._lock:
+            entry = self._memory.get((round_id, key))
+            if entry is not None:
+                self._memory.move_to_end((round_id, key))
+                self._stats["memory_hits"] += 1
+                return entry[0], "memory"
+
+        proof, size = self._read_disk(round_id, key)
+        with self._lock:
+            if proof is None:
+                self._stats["misses"] += 1
+                return None, None
+            self._stats["disk_hits"] += 1
+            self._remember(round_id, key, proof, size)
+            return proof, "disk"
+
+    def _read_disk(self, round_id: int, key: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        file = self._file(round_id, key)
+        try:
+            raw = file.read_bytes()
+            entry = json.loads(raw)
+            proof = entry["proof"]
+            if hashlib.sha256(_canonical(proof)).hexdigest() != entry["sha256"]:
+                raise ValueError("checksum mismatch")
+        except FileNotFoundError:
+            return None, 0
+        except (OSError, ValueError, KeyError, TypeError):
+            file.unlink(missing_ok=True)
+            return None, 0
+        try:
+            os.utime(file)   # LRU order for disk eviction
+        except OSError:
+            pass
+        return proof, len(raw)
+
+    # ---------------------------------------------------------------- writes
+
+    def put(self, round_id: int, key: str, proof: Dict[str, Any]) -> None:
+        """Store a finalized proof in both tiers."""
+        body = _canonical(proof)
+        data = _canonical({"sha256": hashlib.sha256(body).hexdigest(), "proof": proof})
+        file = self._file(round_id, key)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=file.parent, suffix=".tmp", delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, file)
+
+        with self._lock:
+            self._stats["stores"] += 1
+            self._remember(round_id, key, proof, len(data))
+            if self._disk_used is None:
+                self._disk_used = self._measure_disk()
+            else:
+                self._disk_used += len(data)
+            if self._disk_used > self.disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, round_id: int, key: str, proof: Dict[str, Any], size: int) -> None:
+        """Insert into the memory LRU and evict down to budget. Caller holds the lock."""
+        if size > self.memory_bytes:
+            return
+        old = self._memory.pop((round_id, key), None)
+        if old is not None:
+            self._memory_used -= old[1]
+        self._memory[(round_id, key)] = (proof, size)
+        self._memory_used += size
+        while self._memory_used > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_used -= evicted
+            self._stats["memory_evictions"] += 1
+
+    def _measure_disk(self) -> int:
+        return sum(f.stat().st_size for f in self.path.glob("*/*.json"))
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files until under 90% of the budget."""
+        files = []
+        for f in self.path.glob("*/*.json"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, f))
+        files.sort()
+        used = sum(size for _, size, _ in files)
+        target = self.disk_bytes * 0.9
+        for _, size, f in files:
+            if used <= target:
+                break
+            f.unlink(missing_ok=True)
+            used -= size
+            self._stats["disk_evictions"] += 1
+        self._disk_used = used
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and tier sizes.
+
+        Returns:
+            dict: {
+                'memory_hits', 'disk_hits', 'misses', 'stores',
+                'memory_evictions', 'disk_evictions': int,
+                'hit_ratio': float,
+                'memory_entries': int, 'memory_bytes': int,
+                'disk_bytes': int or None   # None until the first write
+            }
+        """
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = lookups - self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_bytes": self._disk_used,
+            }
@@ -0,0 +1,211 @@
+"""
+Statistical health checks for Flare's on-chain randomness and the numbers
+derived from it.
+
+RandomnessMonitor keeps two compact ring buffers: the 32-byte secure random
+value of every voting round the random oracle has seen, and the lottery
+numbers served from them. evaluate() runs a small battery of tests over
+both as whole-array NumPy operations, cheap enough to run every round:
+
+    monobit      NIST SP 800-22 frequency test over every seed bit
+    runs         NIST SP 800-22 runs test over the same bit stream
+    seed_bytes   chi-squared of seed byte values against uniform (256 bins)
+    decisions    chi-squared of SELL/HOLD/BUY from raw % 101 against 33/34/34
+    lottery      chi-squared of lottery numbers in LOTTERY_BINS equal bins
+
+Chi-squared p-values use the Wilson-Hilferty normal approximation, which is
+accurate to well under 1e-3 at these degrees of freedom and needs no SciPy.
+A test with too few samples reports passed=None instead of a verdict.
+
+The five tests run together every round, so verdicts use the Holm-Bonferroni
+step-down procedure: ALPHA bounds the chance that any test fails on healthy
+randomness, not the chance of each test failing on its own.
+
+Usage:
+    monitor = RandomnessMonitor()
+    oracle.add_round_listener(monitor.record_round)
+    monitor.record_numbers(batch["numbers"], 100000)
+    report = monitor.evaluate()
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+
+def chi2_sf(statistic: float, dof: int) -> float:
+    """Upper-tail p-value of a chi-squared statistic (Wilson-Hilferty)."""
+    if statistic <= 0:
+        return 1.0
+    scale = 2.0 / (9.0 * dof)
+    z = ((statistic / dof) ** (1.0 / 3.0) - (1.0 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def chi2_uniform(counts: np.ndarray, expected: np.ndarray) -> Dict[str, Any]:
+    """Pearson chi-squared of observed counts against expected counts."""
+    statistic = float(((counts - expected) ** 2 / expected).sum())
+    dof = len(counts) - 1
+    return {"statistic": round(statistic, 4), "dof": dof, "p_value": chi2_sf(statistic, dof)}
+
+
+class RandomnessMonitor:
+    """
+    Ring buffers of observed seeds and lottery numbers plus the test battery.
+
+    Seeds are deduplicated by voting round, since every roll in a round
+    shares one on-chain value. Only independent draws should be passed to
+    record_numbers(); unique (without-replacement) batches are not uniform
+    per draw.
+    """
+
+    SEED_CAPACITY = int(os.getenv("FLARE_RANDOM_MONITOR_SEEDS", "8192"))
+    NUMBER_CAPACITY = int(os.getenv("FLARE_RANDOM_MONITOR_NUMBERS", "65536"))
+    ALPHA = 0.01
+    LOTTERY_BINS = 20
+
+    # Minimum samples before a test gives a verdict
+    MIN_SEEDS = 8             # 2048 bits for monobit / runs
+    MIN_SEEDS_BYTES = 40      # 1280 bytes -> 5 per bin
+    MIN_SEEDS_DECISIONS = 30  # ~10 per category
+    MIN_NUMBERS = 5 * LOTTERY_BINS
+
+    # raw % 101 -> SELL (0-32), HOLD (33-66), BUY (67-100)
+    DECISION_EXPECTED = np.array([33, 34, 34]) / 101
+
+    def __init__(self, seed_capacity: int | None = None, number_capacity: int | None = None):
+        self.seed_capacity = seed_capacity or self.SEED_CAPACITY
+        self.number_capacity = number_capacity or self.NUMBER_CAPACITY
+        self._seeds = np.zeros((self.seed_capacity, 32), dtype=np.uint8)
+        self._decisions = np.zeros(self.seed_capacity, dtype=np.int8)
+        self._numbers = np.zeros(self.number_capacity, dtype=np.float64)  # number / bound
+        self._seed_next = self._seed_count = 0
+        self._number_next = self._number_count = 0
+        self._last_round: Optional[int] = None
+        self._insecure = 0
+        self._report: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def record_round(self, current: Dict[str, Any]) -> None:
+        """Record a get_random_round()-shaped value (once per round)."""
+        with self._lock:
+            if current["round"] == self._last_round:
+                return
+            self._last_round = current["round"]
+            if not current["is_secure"]:
+                self._insecure += 1
+                return
+            i = self._seed_next
+            self._seeds[i] = np.frombuffer(current["random"].to_bytes(32, "big"), dtype=np.uint8)
+            score = current["random"] % 101
+            self._decisions[i] = 2 if score > 66 else 0 if score < 33 else 1
+            self._seed_next = (i + 1) % self.seed_capacity
+            self._seed_count = min(self._seed_count + 1, self.seed_capacity)
+
+    def record_numbers(self, numbers: Sequence[int], bound: int) -> None:
+        """Record lottery numbers drawn uniformly from [0, bound)."""
+        values = np.asarray(numbers, dtype=np.float64)[-self.number_capacity:] / bound
+        with self._lock:
+            n, i = len(values), self._number_next
+            first = min(n, self.number_capacity - i)
+            self._numbers[i:i + first] = values[:first]
+            self._numbers[:n - first] = values[first:]
+            self._number_next = (i + n) % self.number_capacity
+            self._number_count = min(self._number_count + n, self.number_capacity)
+
+    # ---------------------------------------------------------------- tests
+
+    @staticmethod
+    def monobit(bits: np.ndarray) -> Dict[str, Any]:
+        n = len(bits)
+        s = 2 * int(bits.sum()) - n
+        return {"statistic": round(abs(s) / math.sqrt(n), 4),
+                "p_value": math.erfc(abs(s) / math.sqrt(2 * n))}
+
+    @staticmethod
+    def runs(bits: np.ndarray) -> Dict[str, Any]:
+        n = len(bits)
+        pi = float(bits.mean())
+        if abs(pi - 0.5) >= 2 / math.sqrt(n):
+            # Frequency prerequisite failed; the runs test is not applicable
+            return {"statistic": None, "p_value": 0.0}
+        v = 1 + int(np.count_nonzero(bits[1:] != bits[:-1]))
+        expected = 2 * n * pi * (1 - pi)
+        return {"statistic": v,
+                "p_value": math.erfc(abs(v - expected) / (2 * math.sqrt(2 * n) * pi * (1 - pi)))}
+
+    def _verdict(self, result: Dict[str, Any], samples: int, minimum: int) -> Dict[str, Any]:
+        if samples < minimum:
+            return {"samples": samples, "passed": None, "reason": f"needs at least {minimum} samples"}
+        return {"samples": samples, **result}
+
+    def _holm(self, tests: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Give each test with enough samples its Holm-Bonferroni verdict:
+        the k-th smallest of m p-values fails if it is below ALPHA / (m - k)
+        and every smaller p-value failed too.
+        """
+        ranked = sorted((t for t in tests.values() if "p_value" in t), key=lambda t: t["p_value"])
+        rejecting = True
+        for k, test in enumerate(ranked):
+            test["threshold"] = round(self.ALPHA / (len(ranked) - k), 6)
+            rejecting = rejecting and test["p_value"] < test["threshold"]
+            test["passed"] = not rejecting
+            test["p_value"] = round(test["p_value"], 6)
+
+    def evaluate(self) -> Dict[str, Any]:
+        """
+        Run every test over the buffered samples and cache the report.
+
+        Returns:
+            dict: {
+                'evaluated_at': int,
+                'alpha': float,                 # family-wise significance level
+                'healthy': bool,                # no test failed after correction
+                'samples': {'seeds', 'numbers', 'insecure_rounds'},
+                'tests': {name: {'samples', 'statistic', 'p_value', 'threshold', 'passed', ...}}
+            }
+        """
+        with self._lock:
+            seeds = self._seeds[:self._seed_count].copy()
+            decisions = self._decisions[:self._seed_count].copy()
+            numbers = self._numbers[:self._number_count].copy()
+            insecure = self._insecure
+
+        bits = np.unpackbits(seeds.ravel())
+        tests = {
+            "monobit": self._verdict(
+                self.monobit(bits) if len(seeds) else {}, len(seeds), self.MIN_SEEDS),
+            "runs": self._verdict(
+                self.runs(bits) if len(seeds) else {}, len(seeds), self.MIN_SEEDS),
+            "seed_bytes": self._verdict(
+                chi2_uniform(np.bincount(seeds.ravel(), minlength=256), np.full(256, seeds.size / 256))
+                if len(seeds) else {}, len(seeds), self.MIN_SEEDS_BYTES),
+            "decisions": self._verdict(
+                chi2_uniform(np.bincount(decisions, minlength=3), self.DECISION_EXPECTED * len(decisions))
+                if len(decisions) else {}, len(decisions), self.MIN_SEEDS_DECISIONS),
+            "lottery": self._verdict(
+                chi2_uniform(
+                    np.bincount((numbers * self.LOTTERY_BINS).astype(np.int64), minlength=self.LOTTERY_BINS),
+                    np.full(self.LOTTERY_BINS, len(numbers) / self.LOTTERY_BINS),
+                ) if len(numbers) else {}, len(numbers), self.MIN_NUMBERS),
+        }
+        self._holm(tests)
+
+        report = {
+            "evaluated_at": int(time.time()),
+            "alpha": self.ALPHA,
+            "healthy": not any(t["passed"] is False for t in tests.values()),
+            "samples": {"seeds": len(seeds), "numbers": len(numbers), "insecure_rounds": insecure},
+            "tests": tests,
+        }
+        self._report = report
+        return report
+
+    def report(self) -> Dict[str, Any]:
+        """Latest evaluate() result, evaluating now if there is none yet."""
+        return self._report or self.evaluate()
@@ -0,0 +1,125 @@
+"""
+Per-request timing breakdown.
+
+A RequestTrace collects one span per timed operation of a request: each
+LLM call, each tool call, and every RPC or HTTP call the oracles make on
+its behalf. The current trace lives in a context variable, so it follows
+the request into tasks it spawns and into executor threads that copy the
+context, and library code can record spans without any of it being passed
+down explicitly. Outside a traced request, record_call() is a no-op.
+
+Spans of concurrent operations overlap, so per-kind totals can add up to
+more than the request's wall time.
+
+Usage:
+    trace = start_trace()
+    with span("tool", "get_flare_price") as attrs:
+        ...
+        attrs["success"] = True
+    record_call("rpc", "eth_call", 0.012, ok=True)   # from oracle code
+
+    trace.summary()         # totals per kind
+    trace.server_timing()   # value for a Server-Timing response header
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+
+class RequestTrace:
+    """Spans recorded for one request, relative to when it started."""
+
+    MAX_SPANS = 1000
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: list[Dict[str, Any]] = []
+        self.dropped = 0
+
+    def add(self, kind: str, name: str, seconds: float, **attrs) -> None:
+        """Record a span that has just ended after `seconds`."""
+        if len(self.spans) >= self.MAX_SPANS:
+            self.dropped += 1
+            return
+        self.spans.append({
+            "kind": kind,
+            "name": name,
+            "start_ms": round((time.perf_counter() - seconds - self.started) * 1000, 1),
+            "duration_ms": round(seconds * 1000, 1),
+            **attrs,
+        })
+
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: {
+                'total_ms': float,   # wall time so far
+                'by_kind': {kind: {'count': int, 'total_ms': float, 'max_ms': float}}
+            }
+        """
+        by_kind: Dict[str, Dict[str, Any]] = {}
+        for s in self.spans:
+            totals = by_kind.setdefault(s["kind"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            totals["count"] += 1
+            totals["total_ms"] += s["duration_ms"]
+            totals["max_ms"] = max(totals["max_ms"], s["duration_ms"])
+        for totals in by_kind.values():
+            totals["total_ms"] = round(totals["total_ms"], 1)
+        return {"total_ms": round(self.elapsed() * 1000, 1), "by_kind": by_kind}
+
+    def report(self) -> Dict[str, Any]:
+        """summary() plus every span, in the order they ended."""
+        return {**self.summary(), "spans": list(self.spans), "dropped_spans": self.dropped}
+
+    def server_timing(self) -> str:
+        """Summary as a Server-Timing header value, e.g. 'llm;dur=812.4;desc="2 calls", ...'."""
+        summary = self.summary()
+        metrics = [
+            f'{kind};dur={totals["total_ms"]};desc="{totals["count"]} calls"'
+            for kind, totals in summary["by_kind"].items()
+        ]
+        metrics.append(f"total;dur={summary['total_ms']}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestTrace]] = ContextVar("flare_request_trace", default=None)
+
+
+def start_trace() -> RequestTrace:
+    """Start a trace for the current context (and tasks spawned from it)."""
+    trace = RequestTrace()
+    _current.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+def record_call(kind: str, name: str, seconds: float, **attrs) -> None:
+    """Add a span to the current trace, if there is one."""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(kind, name, seconds, **attrs)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs):
+    """
+    Time the enclosed block as a span. Yields the span's attribute dict,
+    which the block may fill in; an exception is recorded as error=True.
+    """
+    started = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException:
+        attrs["error"] = True
+        raise
+    finally:
+        record_call(kind, name, time.perf_counter() - started, **attrs)
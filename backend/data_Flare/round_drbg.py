@@ -0,0 +1,227 @@
+"""
+Counter-mode DRBG seeded by one round of Flare secure randomness.
+
+Flare's RandomNumberV2 value only changes once per voting round, so instead
+of one RPC per draw the random oracle seeds a RoundDRBG with the round's
+secure value and derives every draw locally:
+
+    block_i = SHA-256(domain || seed || key || round_id || i)
+
+The on-chain seed is public, so it is mixed with a per-round server key.
+RoundKeys derives that key as HMAC-SHA256(secret, domain || instance ||
+round_id): the instance id separates workers and restarts, so no two
+processes ever hand out the same stream, and the secret keeps draws
+unpredictable while the round is live. SHA-256(key) is published with
+every draw as a commitment; the key itself is only revealed once the
+round is over, after which anyone holding the seed, the key, the round
+and the counter can recompute (audit) a draw.
+
+Bulk draws split each block into four big-endian uint64 lanes and reduce
+them to the requested range with NumPy, rejecting the biased top slice of
+the 64-bit range instead of taking a plain modulo.
+
+Usage:
+    keys = RoundKeys()
+    drbg = RoundDRBG(seed=raw_random, round_id=812345, key=keys.key(812345))
+    number, counter = drbg.randbelow(100000)
+    numbers, first_counter, blocks = drbg.draws(5000, 100000, unique=True)
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from typing import Tuple
+
+import numpy as np
+
+DOMAIN = b"flare-copilot/round-drbg/v2"
+
+# uint64 lanes per SHA-256 block
+LANES_PER_BLOCK = 4
+
+# Unique draws covering more than this share of a range shuffle the whole
+# range instead of rejecting duplicates (which degrades like coupon collecting)
+SHUFFLE_FRACTION = 0.25
+SHUFFLE_MAX_BOUND = 1 << 24
+
+
+class RoundKeys:
+    """
+    Per-round DRBG keys for one server instance.
+
+    Configuration (environment variables, read at construction):
+        FLARE_DRBG_SECRET     Hex server secret shared by all workers, so any
+                              worker can reveal any instance's past keys.
+                              Unset: a random per-process secret (keys can
+                              only be revealed by the process that made them).
+        FLARE_INSTANCE_ID     64-bit instance id (decimal or 0x-hex).
+                              Unset: random per process.
+    """
+
+    def __init__(self, secret: bytes | None = None, instance: int | None = None):
+        if secret is None:
+            configured = os.getenv("FLARE_DRBG_SECRET", "")
+            secret = bytes.fromhex(configured) if configured else None
+        self.shared = secret is not None
+        self._secret = secret if secret is not None else secrets.token_bytes(32)
+        if instance is None:
+            configured = os.getenv("FLARE_INSTANCE_ID", "")
+            instance = int(configured, 0) if configured else secrets.randbits(64)
+        self.instance = instance
+
+    def key(self, round_id: int, instance: int | None = None) -> bytes:
+        """
+        Return the 32-byte key for `round_id` (this instance by default).
+
+        Raises:
+            LookupError: If the key belongs to another instance and no shared
+                secret is configured
+        """
+        if instance is None:
+            instance = self.instance
+        elif instance != self.instance and not self.shared:
+            raise LookupError(f"Instance {instance:#x} is not known to this process")
+        message = DOMAIN + instance.to_bytes(8, "big") + round_id.to_bytes(8, "big")
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def commitment(self, round_id: int, instance: int | None = None) -> bytes:
+        """Return SHA-256 of the round key, safe to publish before the reveal."""
+        return hashlib.sha256(self.key(round_id, instance)).digest()
+
+
+class RoundDRBG:
+    """
+    SHA-256 counter-mode generator bound to one (seed, key, round).
+
+    Thread- and task-safe: counter ranges are reserved under a lock, so
+    concurrent callers never share a block, and a bulk draw holds the lock
+    until it is complete, so its blocks form one contiguous range.
+
+    `counter` starts the generator part-way through its stream, e.g. to
+    replay a logged bulk draw from its first counter.
+    """
+
+    def __init__(self, seed: int, round_id: int, key: bytes, counter: int = 0):
+        self.seed = seed
+        self.round_id = round_id
+        self.key = key
+        self._prefix = hashlib.sha256(DOMAIN)
+        self._prefix.update(seed.to_bytes(32, "big"))
+        self._prefix.update(key)
+        self._prefix.update(round_id.to_bytes(8, "big"))
+        self._counter = counter
+        self._lock = threading.RLock()
+
+    def _reserve(self, blocks: int) -> int:
+        """Reserve `blocks` consecutive counter values; return the first."""
+        with self._lock:
+            start = self._counter
+            self._counter += blocks
+            return start
+
+    def block(self, counter: int) -> bytes:
+        """Return the 32-byte output block for a given counter value."""
+        h = self._prefix.copy()
+        h.update(counter.to_bytes(8, "big"))
+        return h.digest()
+
+    def next_block(self) -> Tuple[bytes, int]:
+        """Return (block, counter) for the next unused counter value."""
+        counter = self._reserve(1)
+        return self.block(counter), counter
+
+    def randbelow(self, bound: int) -> Tuple[int, int]:
+        """
+        Return (number, counter): a uniform integer in [0, bound) without
+        modulo bias, and the counter of the block it came from.
+
+        Values from the top, partial stretch of the 256-bit range are
+        rejected and a fresh block is drawn (probability < 2**-128 for
+        bounds below 2**128).
+        """
+        if bound <= 0:
+            raise ValueError("bound must be positive")
+        limit = (1 << 256) - (1 << 256) % bound
+        while True:
+            block, counter = self.next_block()
+            value = int.from_bytes(block, "big")
+            if value < limit:
+                return value % bound, counter
+
+    def _lanes(self, blocks: int) -> Tuple[np.ndarray, int]:
+        """Return (uint64 lanes of `blocks` fresh blocks, first counter)."""
+        start = self._reserve(blocks)
+        prefix, chunks = self._prefix, []
+        for counter in range(start, start + blocks):
+            h = prefix.copy()
+            h.update(counter.to_bytes(8, "big"))
+            chunks.append(h.digest())
+        data = b"".join(chunks)
+        return np.frombuffer(data, dtype=">u8").astype(np.uint64), start
+
+    def draws(self, n: int, bound: int, unique: bool = False) -> Tuple[np.ndarray, int, int]:
+        """
+        Derive `n` uniform integers in [0, bound) in bulk.
+
+        Lanes are consumed in counter order from one contiguous counter range
+        (other callers wait until the batch is done), so a verifier holding
+        the seed, the key, the round and the first counter rebuilds the exact
+        sequence with RoundDRBG(seed, round_id, key, counter=first).draws(...).
+
+        Args:
+            n: Number of values to return
+            bound: Exclusive upper bound, at most 2**63
+            unique: Return `n` distinct values (first occurrences kept)
+
+        Returns:
+            tuple: (int64 array of length n, first counter, blocks consumed)
+
+        Raises:
+            ValueError: If n or bound is out of range
+        """
+        if n < 0:
+            raise ValueError("n must not be negative")
+        if not 0 < bound <= 1 << 63:
+            raise ValueError("bound must be between 1 and 2**63")
+        if unique and n > bound:
+            raise ValueError(f"Cannot draw {n} unique values below {bound}")
+
+        if unique and n > bound * SHUFFLE_FRACTION and bound <= SHUFFLE_MAX_BOUND:
+            return self._shuffled(n, bound)
+
+        # Refills reserve more counters; holding the (reentrant) lock keeps
+        # every block of this batch in one contiguous range
+        with self._lock:
+            limit = np.uint64((1 << 64) - (1 << 64) % bound) if (1 << 64) % bound else None
+            first, blocks = None, 0
+            out = np.empty(0, dtype=np.int64)
+            while len(out) < n:
+                missing = n - len(out)
+                # Unique draws near the bound collide often; over-draw accordingly
+                if unique:
+                    missing = int(missing * bound / max(bound - len(out) - missing / 2, 1)) + 1
+                count = -(-missing // LANES_PER_BLOCK)
+                lanes, start = self._lanes(count)
+                if first is None:
+                    first = start
+                blocks += count
+                if limit is not None:
+                    lanes = lanes[lanes < limit]
+                values = (lanes % np.uint64(bound)).astype(np.int64)
+                out = np.concatenate((out, values))
+                if unique:
+                    _, index = np.unique(out, return_index=True)
+                    out = out[np.sort(index)]
+            return out[:n], first if first is not None else self._counter, blocks
+
+    def _shuffled(self, n: int, bound: int) -> Tuple[np.ndarray, int, int]:
+        """
+        First `n` values of a random permutation of range(bound): sort the
+        range by one 64-bit random key per value.
+        """
+        blocks = -(-bound // LANES_PER_BLOCK)
+        keys, first = self._lanes(blocks)
+        order = np.argsort(keys[:bound], kind="stable")
+        return order[:n].astype(np.int64), first, blocks
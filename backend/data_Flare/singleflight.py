@@ -0,0 +1,147 @@
+"""
+Request coalescing and negative caching for FDC lookups.
+
+SingleFlight / AsyncSingleFlight make concurrent calls with the same key
+share one in-flight call: the first caller runs it, everyone who arrives
+before it finishes waits for the same result (or exception). Nothing is
+kept once the call completes.
+
+NegativeCache remembers lookups that came back negative (e.g. a
+transaction the verifier could not find) for a caller-chosen TTL, so
+repeated bad lookups do not spend verifier quota.
+
+Usage:
+    flight = AsyncSingleFlight()
+    result = await flight.do(tx_hash, lambda: verify(tx_hash))
+
+    negative = NegativeCache()
+    negative.put(tx_hash, result, ttl=15)
+    negative.get(tx_hash)       # result until the TTL runs out, then None
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+
+
+class SingleFlight:
+    """Thread-based single-flight: one call per key in flight at a time."""
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn(), or wait for the identical call already in flight."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self._calls += 1
+            else:
+                self._shared += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self._calls, "shared": self._shared, "in_flight": len(self._inflight)}
+
+
+class AsyncSingleFlight:
+    """
+    Event-loop single-flight. The shared call runs as its own task, so a
+    waiter that is cancelled does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._calls = 0
+        self._shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn(), or the identical call already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self._calls += 1
+        else:
+            self._shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self._calls, "shared": self._shared, "in_flight": len(self._inflight)}
+
+
+class NegativeCache:
+    """
+    Bounded TTL cache of negative results, oldest entries evicted first.
+
+    Each key also counts how many times in a row it was stored, so callers
+    can lengthen the TTL for lookups that keep failing.
+    """
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stores = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached negative result, or None if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            self._hits += 1
+            return entry[0]
+
+    def strikes(self, key: str) -> int:
+        """How many times in a row `key` has been stored (0 if never)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2] if entry else 0
+
+    def put(self, key: str, result: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            self._entries[key] = (result, time.time() + ttl, (old[2] if old else 0) + 1)
+            self._stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """Forget a key, e.g. once it has a positive result."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "stores": self._stores,
+                "entries": sum(1 for _, expires, _ in self._entries.values() if expires > now),
+            }
@@ -0,0 +1,47 @@
+"""
+Flare Voting Epochs - timing helpers for the Flare Systems Protocol
+
+FTSO v2 anchor feeds and the secure random number are both published once
+per voting epoch (voting round). Epochs are a fixed-length grid anchored at
+the first voting round, so any timestamp can be mapped to its round and to
+the next round boundary without an RPC call.
+
+Usage:
+    round_id = voting_round_id(1735689600)
+    expires  = next_epoch_boundary(1735689600)
+"""
+
+import time
+
+# Coston2 Testnet voting epoch configuration (FlareSystemsManager)
+FIRST_VOTING_ROUND_START_TS = 1658430000
+VOTING_EPOCH_DURATION_SECONDS = 90
+
+
+def voting_round_id(timestamp: float) -> int:
+    """
+    Return the voting round that contains the given Unix timestamp.
+    """
+    return int((timestamp - FIRST_VOTING_ROUND_START_TS) // VOTING_EPOCH_DURATION_SECONDS)
+
+
+def round_start_ts(round_id: int) -> int:
+    """
+    Return the Unix timestamp at which the given voting round starts.
+    """
+    return FIRST_VOTING_ROUND_START_TS + round_id * VOTING_EPOCH_DURATION_SECONDS
+
+
+def next_epoch_boundary(timestamp: float) -> int:
+    """
+    Return the Unix timestamp of the first epoch boundary after `timestamp`.
+    """
+    return round_start_ts(voting_round_id(timestamp) + 1)
+
+
+def seconds_until_next_epoch(now: float | None = None) -> float:
+    """
+    Return how many seconds remain until the next epoch boundary.
+    """
+    now = time.time() if now is None else now
+    return next_epoch_boundary(now) - now
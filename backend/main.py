@@ -10,24 +10,45 @@ Run:
 """
 
 import os
+import json
 import uuid
-import hashlib
+import asyncio
+import contextvars
+import functools
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import anthropic
 
-from data_Flare import FlarePriceOracle, FlareRandomOracle, FlareFDCOracle
+# Before importing data_Flare: its classes read FLARE_* settings at import time
+load_dotenv()
+
+from data_Flare import (
+    DrawLog,
+    FtsoHistoryStore,
+    RandomnessMonitor,
+    PriceBroadcaster,
+    AsyncFlareChain,
+    AsyncFlarePriceOracle,
+    AsyncFlareRandomOracle,
+    AsyncFlareFDCOracle,
+)
+from data_Flare.metrics import REGISTRY
+from data_Flare.request_trace import RequestTrace, span, start_trace
+from data_Flare.voting_epochs import seconds_until_next_epoch
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
-load_dotenv()
-
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 if not ANTHROPIC_API_KEY:
     raise RuntimeError(
@@ -36,18 +57,224 @@ if not ANTHROPIC_API_KEY:
     )
 
 # ---------------------------------------------------------------------------
-# Initialize oracles once at startup
+# Blocking work
+# ---------------------------------------------------------------------------
+# Disk, NumPy and other blocking calls run on one bounded pool instead of a
+# thread per call, so a burst of conversations cannot spawn unbounded threads.
+# The lifespan also installs it as the loop's default executor, which bounds
+# asyncio.to_thread() inside the oracles the same way.
+BLOCKING_WORKERS = int(os.getenv("FLARE_BLOCKING_WORKERS", "8"))
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+
+
+async def run_blocking(fn, *args):
+    """Run a blocking call on the bounded executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args)
+    return await loop.run_in_executor(blocking_executor, call)
+
+
+# ---------------------------------------------------------------------------
+# Metrics (served by /metrics; the oracles record RPC, HTTP and method timings)
+# ---------------------------------------------------------------------------
+HTTP_SECONDS = REGISTRY.histogram(
+    "flare_http_request_seconds", "HTTP requests served, by route", ("route", "method", "status"))
+TOOL_SECONDS = REGISTRY.histogram(
+    "flare_tool_call_seconds", "Chat tool calls", ("tool", "outcome"))
+ANTHROPIC_SECONDS = REGISTRY.histogram(
+    "flare_anthropic_request_seconds", "Claude API calls, until the full response",
+    ("model", "outcome"))
+ANTHROPIC_TOKENS = REGISTRY.counter(
+    "flare_anthropic_tokens_total", "Claude API tokens by type", ("model", "type"))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request into HTTP_SECONDS, labelled by
+    route template (not raw path, to bound label cardinality). Streaming
+    responses are timed until their last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_SECONDS.labels(
+                route.path if route is not None else "unmatched", scope["method"], status
+            ).observe(time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# Oracles (async, connected in the background by the app lifespan)
 # ---------------------------------------------------------------------------
-print("Initializing Flare oracles...")
-price_oracle = FlarePriceOracle()
-random_oracle = FlareRandomOracle()
-fdc_oracle = FlareFDCOracle()
-print("All oracles ready.\n")
+# One shared RPC pool and registry lookup for every on-chain oracle
+chain = AsyncFlareChain()
+price_oracle = AsyncFlarePriceOracle(chain)
+random_oracle = AsyncFlareRandomOracle(chain)
+fdc_oracle = AsyncFlareFDCOracle()
+
+# Backfilled FTSO history (filled offline by `python -m data_Flare.ftso_history`)
+history_store = FtsoHistoryStore()
+
+# Fans each epoch refresh out to every /prices/stream client
+price_broadcaster = PriceBroadcaster()
+price_oracle.add_refresh_listener(price_broadcaster.publish)
+
+# Append-only record of every lottery number served, sealed into Merkle batches
+draw_log = DrawLog()
+DRAW_LOG_SEAL_SECONDS = int(os.getenv("FLARE_DRAW_LOG_SEAL_SECONDS", "60"))
+
+# Seconds after an epoch boundary before the new round's value is read
+RANDOM_MONITOR_DELAY_SECONDS = 5
+
+
+# Statistical checks over every round's random value and the lottery numbers served
+randomness_monitor = RandomnessMonitor()
+random_oracle.add_round_listener(randomness_monitor.record_round)
+
+
+def _cache_counters() -> dict:
+    """Hit/miss counters the caches already keep, read at scrape time."""
+    price = price_oracle.cache.stats()
+    proofs = fdc_oracle.proof_cache.stats()
+    dedupe = fdc_oracle.dedupe_stats()
+    return {
+        ("price", "hit"): price["hits"],
+        ("price", "miss"): price["misses"],
+        ("fdc_proof", "memory_hit"): proofs["memory_hits"],
+        ("fdc_proof", "disk_hit"): proofs["disk_hits"],
+        ("fdc_proof", "miss"): proofs["misses"],
+        ("fdc_negative", "hit"): dedupe["negative_cache"]["hits"],
+        ("fdc_single_flight", "call"): dedupe["single_flight"]["calls"],
+        ("fdc_single_flight", "shared"): dedupe["single_flight"]["shared"],
+    }
+
+
+REGISTRY.callback(
+    "flare_cache_requests_total", "Cache and request-coalescing lookups by result",
+    ("cache", "result"), _cache_counters,
+)
+
+
+async def monitor_randomness():
+    """Once per voting round, read the new random value and re-run the tests."""
+    while True:
+        await asyncio.sleep(seconds_until_next_epoch() + RANDOM_MONITOR_DELAY_SECONDS)
+        try:
+            if oracle_status["random"]["ready"]:
+                await random_oracle.get_random_round()
+            report = await run_blocking(randomness_monitor.evaluate)
+            if not report["healthy"]:
+                failed = [
+                    f"{name} (p={t['p_value']} < {t['threshold']})"
+                    for name, t in report["tests"].items() if t["passed"] is False
+                ]
+                print(f"[WARN] Randomness tests failed after Holm correction: {', '.join(failed)}")
+        except Exception as e:
+            print(f"[WARN] Randomness monitor failed: {e}")
+
+
+async def seal_draw_log():
+    """Seal new lottery draws into a Merkle batch every DRAW_LOG_SEAL_SECONDS."""
+    while True:
+        await asyncio.sleep(DRAW_LOG_SEAL_SECONDS)
+        try:
+            await run_blocking(draw_log.seal)
+        except Exception as e:
+            print(f"[WARN] Sealing the draw log failed: {e}")
+
+
+class OracleNotReady(RuntimeError):
+    """Raised when a tool needs an oracle that has not finished starting."""
+
+
+# Per-oracle startup state, reported by /ready
+oracle_status: dict[str, dict] = {
+    name: {"ready": False, "startup_seconds": None, "attempts": 0, "error": None}
+    for name in ("price", "random", "fdc")
+}
+
+# Which oracle each tool depends on
+TOOL_ORACLES = {
+    "get_flare_price": "price",
+    "get_flare_prices": "price",
+    "get_price_stats": "price",
+    "get_price_history": None,
+    "list_supported_assets": None,
+    "get_random_decision": "random",
+    "get_raw_random_number": "random",
+    "get_randomness_quality": None,
+    "verify_on_flare": "fdc",
+    "verify_on_flare_batch": "fdc",
+    "get_fdc_proof": "fdc",
+    "expand_tool_result": None,
+}
+
+# Backoff between startup retries (seconds), capped at the last value
+STARTUP_RETRY_DELAYS = (1, 2, 5, 10, 30)
+
+
+async def _connect_price_oracle():
+    await price_oracle.connect()
+    price_oracle.start_refresher()
+
+
+ORACLE_STARTUP = {
+    "price": _connect_price_oracle,
+    "random": random_oracle.connect,
+    "fdc": fdc_oracle.connect,
+}
+
+
+async def start_oracle(name: str) -> None:
+    """Connect one oracle, retrying with backoff until it succeeds."""
+    status = oracle_status[name]
+    started = time.perf_counter()
+    while True:
+        status["attempts"] += 1
+        try:
+            await ORACLE_STARTUP[name]()
+            break
+        except Exception as e:
+            status["error"] = str(e)
+            delay = STARTUP_RETRY_DELAYS[min(status["attempts"], len(STARTUP_RETRY_DELAYS)) - 1]
+            print(f"[WARN] {name} oracle failed to start ({e}); retrying in {delay}s")
+            await asyncio.sleep(delay)
+    status.update(ready=True, error=None, startup_seconds=round(time.perf_counter() - started, 3))
+    print(f"[OK] {name} oracle ready in {status['startup_seconds']}s")
+
+
+# Oracles that read through the shared chain client
+CHAIN_ORACLES = ("price", "random")
+
+
+def require_oracle(name: str | None) -> None:
+    """Fail fast if the given oracle is still starting up or its chain is unusable."""
+    if name is not None and not oracle_status[name]["ready"]:
+        raise OracleNotReady(f"The {name} oracle is still starting up; try again shortly.")
+    if name in CHAIN_ORACLES and chain.error:
+        raise OracleNotReady(f"The {name} oracle is unavailable: {chain.error}")
 
 # ---------------------------------------------------------------------------
 # Anthropic client
 # ---------------------------------------------------------------------------
-client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+# Async client: a Claude round trip awaits instead of blocking the event loop
+client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
 
 MODEL = "claude-sonnet-4-5-20250929"
 
@@ -83,6 +310,77 @@ TOOLS = [
             "required": ["symbol"],
         },
     },
+    {
+        "name": "get_flare_prices",
+        "description": (
+            "Get the current USD prices for several crypto assets at once from Flare's "
+            "FTSO v2 oracle. All prices are read in a single on-chain call, so they come "
+            "from the same block. Use this instead of repeated get_flare_price calls "
+            "whenever more than one asset is requested. Supported symbols: FLR, BTC, ETH."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": 'The asset tickers, e.g. ["FLR", "BTC", "ETH"]',
+                }
+            },
+            "required": ["symbols"],
+        },
+    },
+    {
+        "name": "get_price_stats",
+        "description": (
+            "Get recent price statistics for a crypto asset from the FTSO v2 price "
+            "history recorded every voting epoch (~90s): last, min, max, TWAP, "
+            "percentage return and volatility over a look-back window. Use this to "
+            "answer questions like 'how volatile has BTC been in the last hour'. "
+            "Supported symbols: FLR, BTC, ETH."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": 'The asset ticker, e.g. "BTC", "ETH", "FLR"',
+                },
+                "window_minutes": {
+                    "type": "integer",
+                    "description": "Look-back window in minutes (default 60)",
+                },
+            },
+            "required": ["symbol"],
+        },
+    },
+    {
+        "name": "get_price_history",
+        "description": (
+            "Get historical FTSO v2 prices for a crypto asset over a past time range "
+            "(hours to months) from the locally backfilled FTSO publication history. "
+            "Returns first/last/min/max/mean, percentage change and a downsampled "
+            "price series. Supported symbols: FLR, BTC, ETH."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": 'The asset ticker, e.g. "BTC", "ETH", "FLR"',
+                },
+                "hours": {
+                    "type": "number",
+                    "description": "How far back to look, in hours (default 24)",
+                },
+                "end_timestamp": {
+                    "type": "integer",
+                    "description": "Unix timestamp the range ends at (default: now)",
+                },
+            },
+            "required": ["symbol"],
+        },
+    },
     {
         "name": "list_supported_assets",
         "description": "List all crypto assets currently supported by the Flare price oracle.",
@@ -114,6 +412,19 @@ TOOLS = [
             "properties": {},
         },
     },
+    {
+        "name": "get_randomness_quality",
+        "description": (
+            "Get the latest statistical health report for Flare's on-chain random "
+            "numbers and the lottery numbers derived from them: bit-frequency "
+            "(monobit), runs and chi-squared tests with p-values, and whether any "
+            "test indicates bias. Use this when asked whether the randomness is fair."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {},
+        },
+    },
     {
         "name": "verify_on_flare",
         "description": (
@@ -131,6 +442,27 @@ TOOLS = [
             "required": ["tx_hash"],
         },
     },
+    {
+        "name": "verify_on_flare_batch",
+        "description": (
+            "Verify many transactions at once using the Flare Data Connector (FDC). "
+            "Duplicate hashes are checked once and the rest are verified concurrently. "
+            "Returns each transaction's verification status plus batch throughput and "
+            "latency. Use this instead of repeated verify_on_flare calls whenever more "
+            "than one transaction hash is given."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "tx_hashes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": 'The transaction hashes to verify, e.g. ["0xabc...", "0xdef..."]',
+                }
+            },
+            "required": ["tx_hashes"],
+        },
+    },
     {
         "name": "get_fdc_proof",
         "description": (
@@ -148,31 +480,90 @@ TOOLS = [
             "required": ["round_id"],
         },
     },
+    {
+        "name": "expand_tool_result",
+        "description": (
+            "Fetch a large value that an earlier tool result replaced with a "
+            '{"handle": ...} placeholder to save space. Only call this when the '
+            "preview and the rest of the result are not enough to answer. Very "
+            "large values are returned in chunks; pass next_offset as offset to "
+            "continue."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": 'The handle from the placeholder, e.g. "h_3f9a1c2b7d"',
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to continue from (default 0)",
+                },
+            },
+            "required": ["handle"],
+        },
+    },
 ]
 
 
 # ---------------------------------------------------------------------------
 # Execute a tool call against the oracles
 # ---------------------------------------------------------------------------
-def execute_tool(name: str, args: dict) -> dict:
+async def execute_tool(name: str, args: dict, conversation: str) -> dict:
     """Run a tool and return its result dict."""
+    try:
+        require_oracle(TOOL_ORACLES.get(name))
+    except OracleNotReady as e:
+        return {"success": False, "error": str(e)}
+
     if name == "get_flare_price":
         try:
-            data = price_oracle.get_price(args["symbol"])
+            data = await price_oracle.get_price(args["symbol"])
             return {"success": True, **data}
         except (ValueError, RuntimeError) as e:
             return {"success": False, "error": str(e)}
 
+    if name == "get_flare_prices":
+        try:
+            data = await price_oracle.get_prices(args["symbols"])
+            prices = list(data.values())
+            return {
+                "success": True,
+                "prices": prices,
+                "timestamp": prices[0]["timestamp"],
+            }
+        except (ValueError, RuntimeError) as e:
+            return {"success": False, "error": str(e)}
+
+    if name == "get_price_stats":
+        try:
+            window = float(args.get("window_minutes", 60)) * 60
+            if not window > 0:
+                raise ValueError("window_minutes must be a positive number")
+            return {"success": True, **price_oracle.price_stats(args["symbol"], window)}
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": str(e)}
+
+    if name == "get_price_history":
+        try:
+            end = int(args.get("end_timestamp") or time.time())
+            start = end - int(float(args.get("hours", 24)) * 3600)
+            data = await run_blocking(history_store.summary, args["symbol"], start, end)
+            return {"success": True, **data}
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": str(e)}
+
     if name == "list_supported_assets":
         return {
             "success": True,
-            "supported_symbols": list(price_oracle.FEED_IDS.keys()),
+            "supported_symbols": list(price_oracle.feed_ids.keys()),
             "note": "Pass any of these symbols to get_flare_price()",
         }
 
     if name == "get_random_decision":
         try:
-            result = random_oracle.get_random_decision()
+            result = await random_oracle.get_random_decision()
             return {
                 "success": True,
                 "raw": str(result["raw"]),
@@ -184,14 +575,17 @@ def execute_tool(name: str, args: dict) -> dict:
 
     if name == "get_raw_random_number":
         try:
-            raw = random_oracle.get_random_number()
+            raw = await random_oracle.get_random_number()
             return {"success": True, "random_number": str(raw)}
         except RuntimeError as e:
             return {"success": False, "error": str(e)}
 
+    if name == "get_randomness_quality":
+        return {"success": True, **(await run_blocking(randomness_monitor.report))}
+
     if name == "verify_on_flare":
         try:
-            result = fdc_oracle.submit_verification_request(args["tx_hash"])
+            result = await fdc_oracle.submit_verification_request(args["tx_hash"])
             return {
                 "success": True,
                 "verified": result.get("verified", False),
@@ -200,23 +594,54 @@ def execute_tool(name: str, args: dict) -> dict:
                 "message": result.get("message", ""),
                 "roundId": result.get("roundId", 0),
                 "details": result.get("details"),
+                "transport": result.get("transport"),
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    if name == "verify_on_flare_batch":
+        tx_hashes = args["tx_hashes"]
+        if len(tx_hashes) > FDC_BATCH_MAX:
+            return {"success": False, "error": f"At most {FDC_BATCH_MAX} transactions per batch"}
+        try:
+            result = await fdc_oracle.verify_batch(tx_hashes)
+            return {
+                "success": True,
+                "summary": result["summary"],
+                "results": [
+                    {
+                        "tx_hash": item["tx_hash"],
+                        "verified": item.get("verified", False),
+                        "status": item.get("status", ""),
+                        "latency_ms": item["latency_ms"],
+                    }
+                    for item in result["results"]
+                ],
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     if name == "get_fdc_proof":
         try:
-            result = fdc_oracle.get_attestation_proof(args["round_id"])
+            result = await fdc_oracle.get_attestation_proof(args["round_id"])
             return {
                 "success": True,
                 "status": result["status"],
                 "roundId": result["roundId"],
                 "source": result["source"],
                 "proof": result["proof"],
+                "transport": result.get("transport"),
+                "cache": result.get("cache"),
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    if name == "expand_tool_result":
+        try:
+            return {"success": True, **result_handles.expand(args["handle"], conversation, args.get("offset", 0))}
+        except KeyError:
+            return {"success": False, "error": f"Unknown or expired handle: {args['handle']}"}
+
     return {"success": False, "error": f"Unknown tool: {name}"}
 
 
@@ -229,6 +654,11 @@ def execute_tool(name: str, args: dict) -> dict:
 #   "verify_on_flare"      → VerificationCard (expects: submission, proof with status/roundId/source)
 #   "get_fdc_proof"        → VerificationCard (expects: status, roundId, source)
 #   "list_supported_assets"→ AssetsCard       (expects: supported_symbols[], note)
+#   "get_flare_prices"     → GenericCard      (one batched read, list of prices)
+#   "get_price_stats"      → GenericCard      (history stats: min/max/TWAP/volatility)
+#   "get_price_history"    → GenericCard      (backfilled range summary + series)
+#   "get_randomness_quality"→ GenericCard     (randomness test report)
+#   "verify_on_flare_batch"→ GenericCard      (bulk FDC verification summary)
 #   anything else          → GenericCard      (renders JSON)
 
 def map_tool_for_frontend(name: str, input_args: dict, output: dict) -> dict:
@@ -265,7 +695,7 @@ def map_tool_for_frontend(name: str, input_args: dict, output: dict) -> dict:
             },
         }
 
-    # FDC tools and list_supported_assets → GenericCard (frontend renders JSON)
+    # FDC tools, price list/stats/history tools and list_supported_assets → GenericCard (frontend renders JSON)
     return {
         "name": name,
         "input": input_args,
@@ -276,7 +706,36 @@ def map_tool_for_frontend(name: str, input_args: dict, output: dict) -> dict:
 # ---------------------------------------------------------------------------
 # FastAPI app
 # ---------------------------------------------------------------------------
-app = FastAPI(title="Flare Copilot Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start every oracle concurrently in the background so the server can
+    # answer /health immediately; /ready reports when each one is usable.
+    asyncio.get_running_loop().set_default_executor(blocking_executor)
+    print("Initializing Flare oracles in the background...")
+    startup = [
+        asyncio.create_task(start_oracle(name), name=f"start-{name}-oracle")
+        for name in ORACLE_STARTUP
+    ]
+    background = [
+        asyncio.create_task(seal_draw_log(), name="seal-draw-log"),
+        asyncio.create_task(monitor_randomness(), name="monitor-randomness"),
+    ]
+    yield
+    for task in background + startup:
+        task.cancel()
+    await asyncio.gather(*background, *startup, return_exceptions=True)
+    draw_log.seal()
+    draw_log.close()
+    await price_oracle.close()
+    await fdc_oracle.close()
+    await chain.close()
+    await client.close()
+    blocking_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Flare Copilot Backend", lifespan=lifespan)
+
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -294,29 +753,469 @@ class MessageIn(BaseModel):
 
 class ChatRequest(BaseModel):
     messages: list[MessageIn]
+    # Scopes expand_tool_result handles; echoed back as conversationId
+    conversation_id: str | None = None
 
 
-@app.post("/chat")
-async def chat(req: ChatRequest):
+class VerifyBatchRequest(BaseModel):
+    tx_hashes: list[str]
+    concurrency: int | None = None
+
+
+# ---------------------------------------------------------------------------
+# Tool result encoding
+# ---------------------------------------------------------------------------
+# Tool results go back to Claude as compact JSON, without fields only the UI
+# or operators need, and within a per-tool size budget. Values that do not fit
+# are replaced by {"handle", "bytes", "preview"} placeholders the model can
+# resolve with the expand_tool_result tool. The full result still reaches the
+# frontend card.
+TOOL_RESULT_BYTES = int(os.getenv("FLARE_TOOL_RESULT_BYTES", "2000"))
+TOOL_RESULT_BUDGETS = {
+    "get_price_history": 3000,
+    "get_randomness_quality": 3000,
+    "verify_on_flare_batch": 4000,
+}
+# Fields dropped from every tool result before encoding
+TOOL_RESULT_DROP = ("transport", "cache")
+# Values smaller than this are never put behind a handle
+HANDLE_MIN_BYTES = 200
+HANDLE_PREVIEW_CHARS = 120
+# Largest chunk expand_tool_result returns at once
+EXPAND_MAX_BYTES = int(os.getenv("FLARE_TOOL_EXPAND_BYTES", "16000"))
+# Floats keep this many significant digits
+FLOAT_DIGITS = 10
+
+
+def _json(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _compact(value):
+    """Copy of a result with dropped fields removed and floats shortened."""
+    if isinstance(value, dict):
+        return {k: _compact(v) for k, v in value.items() if k not in TOOL_RESULT_DROP}
+    if isinstance(value, (list, tuple)):
+        return [_compact(v) for v in value]
+    if isinstance(value, float):
+        return float(f"{value:.{FLOAT_DIGITS}g}")
+    return value
+
+
+class ResultHandles:
     """
-    Receive conversation messages, call Claude with Flare tools,
-    execute any tool calls, and return the final response.
+    Byte-bounded LRU of tool-result values that were put behind a handle.
+
+    Every value belongs to the conversation that produced it, and only that
+    conversation can expand it. Handles outlive the request that created
+    them, so a follow-up question in the same conversation can still expand
+    them, until newer values (from any conversation) push them out.
     """
-    # Build messages for Anthropic API
-    messages = [{"role": m.role, "content": m.content} for m in req.messages]
 
+    MAX_BYTES = int(os.getenv("FLARE_TOOL_HANDLE_BYTES", str(16 * 1024 * 1024)))
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        # (conversation, handle) -> JSON text
+        self._values: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+        self._used = 0
+
+    def put(self, text: str, conversation: str) -> str:
+        handle = f"h_{uuid.uuid4().hex[:10]}"
+        self._values[conversation, handle] = text
+        self._used += len(text)
+        while self._used > self.max_bytes and len(self._values) > 1:
+            _, evicted = self._values.popitem(last=False)
+            self._used -= len(evicted)
+        return handle
+
+    def expand(self, handle: str, conversation: str, offset: int = 0) -> dict:
+        """
+        Return a stored value, whole if it fits in EXPAND_MAX_BYTES,
+        otherwise one chunk of its JSON text.
+
+        Raises:
+            KeyError: If the handle is unknown, was evicted or belongs to
+                another conversation
+        """
+        text = self._values[conversation, handle]
+        self._values.move_to_end((conversation, handle))
+        if offset == 0 and len(text) <= EXPAND_MAX_BYTES:
+            return {"handle": handle, "value": json.loads(text)}
+        chunk = text[offset:offset + EXPAND_MAX_BYTES]
+        end = offset + len(chunk)
+        return {
+            "handle": handle,
+            "total_chars": len(text),
+            "offset": offset,
+            "chunk": chunk,
+            "next_offset": end if end < len(text) else None,
+        }
+
+
+result_handles = ResultHandles()
+
+
+def encode_tool_result(name: str, result: dict, conversation: str) -> tuple[str, dict]:
+    """
+    Encode a tool result for Claude within the tool's byte budget.
+
+    While the encoding is over budget, one value (object, array or string of
+    at least HANDLE_MIN_BYTES) is stored in result_handles under
+    `conversation` and replaced by a
+    placeholder: the smallest value whose removal alone brings the result
+    under budget, or else the largest one, so as little as possible is
+    hidden. expand_tool_result output
+    is never put behind another handle; it is already bounded by chunking.
+
+    Returns:
+        tuple: (JSON text, {'raw_bytes': size of str(result), the previous
+                encoding, 'sent_bytes', 'saved_bytes', 'handles': int})
+    """
+    raw_bytes = len(str(result))
+    compact = _compact(result)
+    text = _json(compact)
+    budget = TOOL_RESULT_BUDGETS.get(name, TOOL_RESULT_BYTES)
+    handles = 0
+
+    while len(text) > budget and name != "expand_tool_result":
+        # Every (container, key, encoded size) that could go behind a handle
+        candidates = []
+        stack = [compact]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, dict) and "handle" in value and "preview" in value:
+                    continue
+                if isinstance(value, (dict, list, str)):
+                    size = len(_json(value))
+                    if size >= HANDLE_MIN_BYTES:
+                        candidates.append((size, node, key))
+                    if isinstance(value, (dict, list)):
+                        stack.append(value)
+        if not candidates:
+            break
+        excess = len(text) - budget
+        enough = [c for c in candidates if c[0] - HANDLE_PREVIEW_CHARS - 60 >= excess]
+        size, node, key = (min(enough, key=lambda c: c[0]) if enough
+                           else max(candidates, key=lambda c: c[0]))
+        value_text = _json(node[key])
+        node[key] = {
+            "handle": result_handles.put(value_text, conversation),
+            "bytes": size,
+            "preview": value_text[:HANDLE_PREVIEW_CHARS],
+        }
+        handles += 1
+        text = _json(compact)
+
+    return text, {
+        "raw_bytes": raw_bytes,
+        "sent_bytes": len(text),
+        "saved_bytes": raw_bytes - len(text),
+        "handles": handles,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching and context budget
+# ---------------------------------------------------------------------------
+# Claude caches the prompt prefix up to each cache_control breakpoint for a
+# few minutes. The static prefix (TOOLS, then the system prompt) gets one
+# breakpoint and the last two user messages get one each, so every round of
+# the agent loop, and the next turn of the conversation, reads everything
+# before its newest message from cache.
+CACHE_CONTROL = {"type": "ephemeral"}
+SYSTEM_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}]
+
+# Estimated prompt tokens above which old context is trimmed
+CONTEXT_BUDGET_TOKENS = int(os.getenv("FLARE_CONTEXT_BUDGET_TOKENS", "120000"))
+
+
+def with_cache_breakpoints(messages: list[dict]) -> list[dict]:
+    """Copy of `messages` with a cache breakpoint on the last two user messages."""
+    marked = list(messages)
+    user_turns = [i for i, message in enumerate(messages) if message["role"] == "user"]
+    for i in user_turns[-2:]:
+        content = marked[i]["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}] if content else []
+        if content:
+            marked[i] = {
+                **marked[i],
+                "content": [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}],
+            }
+    return marked
+
+
+class ContextBudget:
+    """
+    Keeps one conversation's prompt under a token budget and totals the
+    token usage and tool-result sizes of every Claude call made for the
+    request.
+
+    The prompt size is estimated from the serialized request; the
+    characters-per-token ratio is recalibrated from each response's usage.
+    Past the budget, the conversation is trimmed down to TRIM_TARGET of it,
+    well below the threshold so that the cached prefix is not invalidated
+    again on the next round: first bulky tool results of earlier turns are
+    cut to a short preview, then the oldest turns are dropped.
+    """
+
+    TRIM_TARGET = 0.6
+    BULKY_RESULT_CHARS = 1000
+    PREVIEW_CHARS = 200
+    CHARS_PER_TOKEN = 3.5
+
+    # System prompt and tool definitions, sent with every call
+    FIXED_CHARS = len(json.dumps([SYSTEM_PROMPT, TOOLS]))
+
+    def __init__(self, max_tokens: int | None = None):
+        self.max_tokens = max_tokens or CONTEXT_BUDGET_TOKENS
+        self.chars_per_token = self.CHARS_PER_TOKEN
+        self.usage = dict.fromkeys(
+            ("calls", "input_tokens", "output_tokens",
+             "cache_read_input_tokens", "cache_creation_input_tokens"), 0
+        )
+        self.elided_results = 0
+        self.dropped_messages = 0
+        self.tool_results = dict.fromkeys(
+            ("calls", "raw_bytes", "sent_bytes", "saved_bytes", "handles"), 0
+        )
+        self._sent_chars = 0
+
+    def fit(self, messages: list[dict]) -> None:
+        """Trim `messages` in place if the next prompt would exceed the budget."""
+        chars = self.FIXED_CHARS + len(json.dumps(messages, default=str))
+        target = self.max_tokens * self.TRIM_TARGET * self.chars_per_token
+        if chars > self.max_tokens * self.chars_per_token:
+            chars = self._elide_tool_results(messages, chars, target)
+        if chars > target:
+            chars = self._drop_oldest_turns(messages, chars, target)
+        self._sent_chars = chars
+
+    def _elide_tool_results(self, messages: list[dict], chars: int, target: float) -> int:
+        # Oldest first; the newest message (current tool results) is kept whole
+        for message in messages[:-1]:
+            if message["role"] != "user" or isinstance(message["content"], str):
+                continue
+            for block in message["content"]:
+                text = block.get("content")
+                if block.get("type") != "tool_result" or not isinstance(text, str):
+                    continue
+                if len(text) <= self.BULKY_RESULT_CHARS:
+                    continue
+                block["content"] = (
+                    f"{text[:self.PREVIEW_CHARS]}... "
+                    f"[{len(text) - self.PREVIEW_CHARS} characters elided to save context]"
+                )
+                chars -= len(text) - len(block["content"])
+                self.elided_results += 1
+            if chars <= target:
+                break
+        return chars
+
+    def _drop_oldest_turns(self, messages: list[dict], chars: int, target: float) -> int:
+        dropped = 0
+        while chars > target:
+            # Drop up to the next user message that starts a turn (plain text,
+            # not tool results), keeping tool_use / tool_result pairs together
+            cut = next(
+                (i for i in range(1, len(messages)) if self._starts_turn(messages[i])), None
+            )
+            if cut is None:
+                break
+            chars -= len(json.dumps(messages[:cut], default=str))
+            del messages[:cut]
+            dropped += cut
+        if dropped:
+            self.dropped_messages += dropped
+            note = f"[{self.dropped_messages} earlier messages omitted to fit the context window]"
+            first = messages[0]
+            if isinstance(first["content"], str):
+                first["content"] = f"{note}\n\n{first['content']}"
+            else:
+                first["content"] = [{"type": "text", "text": note}, *first["content"]]
+            chars += len(note)
+        return chars
+
+    @staticmethod
+    def _starts_turn(message: dict) -> bool:
+        if message["role"] != "user":
+            return False
+        content = message["content"]
+        return isinstance(content, str) or not any(
+            block.get("type") == "tool_result" for block in content
+        )
+
+    def observe(self, usage) -> None:
+        """Add one response's usage and recalibrate the token estimate."""
+        self.usage["calls"] += 1
+        prompt_tokens = 0
+        for key in ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+            tokens = getattr(usage, key, None) or 0
+            self.usage[key] += tokens
+            prompt_tokens += tokens
+        self.usage["output_tokens"] += usage.output_tokens or 0
+        if prompt_tokens:
+            self.chars_per_token = self._sent_chars / prompt_tokens
+
+    def record_tool_result(self, encoding: dict) -> None:
+        """Add one encode_tool_result() report to the request totals."""
+        self.tool_results["calls"] += 1
+        for key in ("raw_bytes", "sent_bytes", "saved_bytes", "handles"):
+            self.tool_results[key] += encoding[key]
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: {
+                'calls', 'input_tokens', 'output_tokens',
+                'cache_read_input_tokens', 'cache_creation_input_tokens': int,
+                'cache_hit_ratio': float,   # share of prompt tokens read from cache
+                'context': {'estimated_tokens', 'budget_tokens',
+                            'elided_tool_results', 'dropped_messages'},
+                'tool_results': {'calls', 'raw_bytes', 'sent_bytes',
+                                 'saved_bytes', 'handles'}
+            }
+        """
+        prompt_tokens = (self.usage["input_tokens"] + self.usage["cache_read_input_tokens"]
+                         + self.usage["cache_creation_input_tokens"])
+        return {
+            **self.usage,
+            "cache_hit_ratio": round(self.usage["cache_read_input_tokens"] / prompt_tokens, 4)
+            if prompt_tokens else 0.0,
+            "context": {
+                "estimated_tokens": int(self._sent_chars / self.chars_per_token),
+                "budget_tokens": self.max_tokens,
+                "elided_tool_results": self.elided_results,
+                "dropped_messages": self.dropped_messages,
+            },
+            "tool_results": dict(self.tool_results),
+        }
+
+
+# How often a running /chat request checks whether its client went away
+DISCONNECT_POLL_SECONDS = 0.5
+
+# Per-tool time limits (seconds); tools not listed get TOOL_TIMEOUT_SECONDS
+TOOL_TIMEOUT_SECONDS = float(os.getenv("FLARE_TOOL_TIMEOUT", "20"))
+TOOL_TIMEOUTS = {
+    "get_price_stats": 2,
+    "list_supported_assets": 2,
+    "get_randomness_quality": 5,
+    "verify_on_flare_batch": 120,
+}
+
+
+async def run_tool_call(name: str, args: dict, conversation: str) -> dict:
+    """
+    Execute one tool call with its time limit.
+
+    Never raises: a timeout or unexpected exception becomes an error result,
+    so one failing tool does not take down the other calls of the turn.
+    """
+    print(f"[Tool Call] {name}({args})")
+    timeout = TOOL_TIMEOUTS.get(name, TOOL_TIMEOUT_SECONDS)
+    started = time.perf_counter()
+    with span("tool", name) as attrs:
+        try:
+            result = await asyncio.wait_for(execute_tool(name, args, conversation), timeout)
+        except asyncio.TimeoutError:
+            result = {"success": False, "error": f"{name} timed out after {timeout:g}s"}
+        except Exception as e:
+            traceback.print_exc()
+            result = {"success": False, "error": f"{name} failed: {e}"}
+        attrs["success"] = bool(result.get("success"))
+    TOOL_SECONDS.labels(name, "ok" if attrs["success"] else "error").observe(
+        time.perf_counter() - started
+    )
+    print(f"[Tool Result] {name} -> success={result.get('success')}")
+    return result
+
+
+# Per-request limits on the agent loop, checked before each Claude call
+AGENT_MAX_ITERATIONS = int(os.getenv("FLARE_AGENT_MAX_ITERATIONS", "8"))
+AGENT_MAX_SECONDS = float(os.getenv("FLARE_AGENT_MAX_SECONDS", "90"))
+AGENT_MAX_TOKENS = int(os.getenv("FLARE_AGENT_MAX_TOKENS", "300000"))
+
+
+def agent_limit_reached(calls: int, trace: RequestTrace, budget: ContextBudget) -> str | None:
+    """Why the agent loop must stop before another Claude call, or None."""
+    if calls >= AGENT_MAX_ITERATIONS:
+        return f"reached the limit of {AGENT_MAX_ITERATIONS} model calls"
+    if trace.elapsed() >= AGENT_MAX_SECONDS:
+        return f"reached the {AGENT_MAX_SECONDS:g}s time limit"
+    tokens = sum(v for k, v in budget.usage.items() if k != "calls")
+    if tokens >= AGENT_MAX_TOKENS:
+        return f"reached the limit of {AGENT_MAX_TOKENS} tokens"
+    return None
+
+
+async def agent_events(messages: list[dict], trace: RequestTrace, conversation: str, debug: bool = False):
+    """
+    Run the agent loop: stream Claude's reply, execute any tool calls, and
+    repeat until Claude stops requesting tools.
+
+    Yields (event, data) pairs as soon as each is available:
+        ('text', {'delta': str})       a chunk of Claude's text, from any turn
+        ('tool_call', dict)            a frontend tool card, when its tool finishes
+        ('message', dict)              last event: the same response /chat returns,
+                                       {'role', 'content', 'toolCalls', 'usage',
+                                        'timing', 'stopped', 'conversationId'}
+
+    Values put behind expand_tool_result handles are scoped to
+    `conversation`, so only this conversation's later requests can read them.
+
+    `usage` is ContextBudget.report(): token and prompt-cache usage summed
+    over every Claude call of the request. `timing` is the trace's summary,
+    or its full report with every LLM, tool, RPC and HTTP span when `debug`
+    is set. `stopped` names the limit that ended the loop early, else None.
+    """
     collected_tool_calls: list[dict] = []
+    budget = ContextBudget()
+    stopped = None
 
     try:
         # Agentic loop: keep calling Claude until it stops requesting tools
         while True:
-            response = client.messages.create(
-                model=MODEL,
-                max_tokens=4096,
-                system=SYSTEM_PROMPT,
-                tools=TOOLS,
-                messages=messages,
-            )
+            stopped = agent_limit_reached(budget.usage["calls"], trace, budget)
+            if stopped:
+                print(f"[WARN] Agent loop stopped early: {stopped}")
+                content = f"I had to stop before finishing this request: {stopped}."
+                break
+
+            budget.fit(messages)
+            llm_started = time.perf_counter()
+            try:
+                with span("llm", MODEL) as attrs:
+                    async with client.messages.stream(
+                        model=MODEL,
+                        max_tokens=4096,
+                        system=SYSTEM_BLOCKS,
+                        tools=TOOLS,
+                        messages=with_cache_breakpoints(messages),
+                    ) as stream:
+                        async for delta in stream.text_stream:
+                            # Relative to the request start, like the span's start_ms
+                            attrs.setdefault("first_token_at_ms", round(trace.elapsed() * 1000, 1))
+                            yield "text", {"delta": delta}
+                        response = await stream.get_final_message()
+                    usage = response.usage
+                    attrs.update(
+                        input_tokens=usage.input_tokens,
+                        output_tokens=usage.output_tokens,
+                        cache_read_input_tokens=usage.cache_read_input_tokens or 0,
+                        cache_creation_input_tokens=usage.cache_creation_input_tokens or 0,
+                    )
+            except Exception:
+                ANTHROPIC_SECONDS.labels(MODEL, "error").observe(time.perf_counter() - llm_started)
+                raise
+            ANTHROPIC_SECONDS.labels(MODEL, "ok").observe(time.perf_counter() - llm_started)
+            for kind in ("input_tokens", "output_tokens",
+                         "cache_read_input_tokens", "cache_creation_input_tokens"):
+                ANTHROPIC_TOKENS.labels(MODEL, kind).inc(attrs[kind])
+            budget.observe(response.usage)
 
             # Check if Claude wants to use tools
             if response.stop_reason != "tool_use":
@@ -326,77 +1225,401 @@ async def chat(req: ChatRequest):
                     for block in response.content
                     if block.type == "text"
                 ]
-                final_text = "\n".join(text_parts) if text_parts else ""
+                content = "\n".join(text_parts) if text_parts else ""
                 break
 
-            # Process tool use blocks
+            # Run every tool call of this turn concurrently. Cards are sent
+            # as each tool finishes; tool results keep the tool_use order.
             assistant_content = response.content
-            tool_results = []
+            calls = [block for block in assistant_content if block.type == "tool_use"]
 
-            for block in assistant_content:
-                if block.type != "tool_use":
-                    continue
+            async def indexed_call(i: int, block):
+                return i, await run_tool_call(block.name, block.input, conversation)
 
-                tool_name = block.name
-                tool_input = block.input
-                tool_id = block.id
-
-                print(f"[Tool Call] {tool_name}({tool_input})")
-
-                # Execute the tool
-                result = execute_tool(tool_name, tool_input)
-                print(f"[Tool Result] {tool_name} -> success={result.get('success')}")
-
-                # Map for frontend card display
-                mapped = map_tool_for_frontend(tool_name, tool_input, result)
-                collected_tool_calls.append({
-                    "id": f"tc_{uuid.uuid4().hex[:8]}",
-                    "name": mapped["name"],
-                    "input": mapped["input"],
-                    "output": mapped["output"],
-                    "status": "success" if result.get("success") else "error",
-                })
-
-                tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": tool_id,
-                    "content": str(result),
-                })
-
-            # Feed tool results back into the conversation
-            messages.append({"role": "assistant", "content": assistant_content})
-            messages.append({"role": "user", "content": tool_results})
+            pending = [asyncio.ensure_future(indexed_call(i, block)) for i, block in enumerate(calls)]
+            cards: list[dict | None] = [None] * len(calls)
+            tool_results: list[dict | None] = [None] * len(calls)
+            try:
+                for finished in asyncio.as_completed(pending):
+                    i, result = await finished
+                    block = calls[i]
 
-        return {
-            "role": "assistant",
-            "content": final_text,
-            "toolCalls": collected_tool_calls if collected_tool_calls else None,
-        }
+                    # Map for frontend card display
+                    mapped = map_tool_for_frontend(block.name, block.input, result)
+                    cards[i] = {
+                        "id": f"tc_{uuid.uuid4().hex[:8]}",
+                        "name": mapped["name"],
+                        "input": mapped["input"],
+                        "output": mapped["output"],
+                        "status": "success" if result.get("success") else "error",
+                    }
+                    yield "tool_call", cards[i]
+
+                    encoded, encoding = encode_tool_result(block.name, result, conversation)
+                    budget.record_tool_result(encoding)
+                    print(
+                        f"[Tool Encode] {block.name} -> {encoding['sent_bytes']} bytes "
+                        f"(saved {encoding['saved_bytes']}, {encoding['handles']} handles)"
+                    )
+                    tool_results[i] = {
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": encoded,
+                    }
+            finally:
+                # Reader went away mid-turn: stop the remaining tools
+                for task in pending:
+                    task.cancel()
+            collected_tool_calls.extend(cards)
+
+            # Feed tool results back into the conversation (as plain dicts, so
+            # cache breakpoints and trimming can work on them)
+            messages.append({
+                "role": "assistant",
+                "content": [block.model_dump(exclude_none=True) for block in assistant_content],
+            })
+            messages.append({"role": "user", "content": tool_results})
 
     except Exception as e:
         traceback.print_exc()
-        return {
-            "role": "assistant",
-            "content": f"Sorry, something went wrong: {e}",
-            "toolCalls": collected_tool_calls if collected_tool_calls else None,
-        }
+        content = f"Sorry, something went wrong: {e}"
+
+    usage = budget.report()
+    print(
+        f"[Usage] {usage['calls']} calls, input={usage['input_tokens']} "
+        f"cache_read={usage['cache_read_input_tokens']} "
+        f"cache_write={usage['cache_creation_input_tokens']} output={usage['output_tokens']}"
+    )
+    yield "message", {
+        "role": "assistant",
+        "content": content,
+        "toolCalls": collected_tool_calls if collected_tool_calls else None,
+        "usage": usage,
+        "timing": trace.report() if debug else trace.summary(),
+        "stopped": stopped,
+        "conversationId": conversation,
+    }
+
+
+async def run_agent(messages: list[dict], trace: RequestTrace, conversation: str, debug: bool = False) -> dict:
+    """
+    Run the agent loop to completion.
+
+    Returns:
+        dict: {'role': 'assistant', 'content': str, 'toolCalls': list or None,
+               'usage': dict, 'timing': dict, 'stopped': str or None,
+               'conversationId': str}
+    """
+    async for event, data in agent_events(messages, trace, conversation, debug):
+        if event == "message":
+            return data
+
+
+@app.post("/chat")
+async def chat(req: ChatRequest, request: Request, debug: bool = False):
+    """
+    Receive conversation messages, call Claude with Flare tools,
+    execute any tool calls, and return the final response.
+
+    The agent loop runs as its own task. If the client disconnects before
+    it finishes, the task is cancelled, which aborts the in-flight Claude
+    request and any pending tool calls instead of finishing unread work.
+
+    The response carries a Server-Timing header with time spent per kind
+    of call (llm, tool, rpc, http); pass debug=true to get every span in
+    the `timing` field.
+
+    Pass the returned conversationId back as conversation_id on follow-up
+    requests so they can expand tool-result handles from earlier turns;
+    without one, each request is its own conversation.
+    """
+    # Build messages for Anthropic API
+    messages = [{"role": m.role, "content": m.content} for m in req.messages]
+    conversation = req.conversation_id or uuid.uuid4().hex
+
+    # Started before the task so the task (and everything it spawns) inherits it
+    trace = start_trace()
+    agent = asyncio.create_task(run_agent(messages, trace, conversation, debug), name="chat-agent")
+    try:
+        while True:
+            done, _ = await asyncio.wait({agent}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return JSONResponse(
+                    jsonable_encoder(agent.result()),
+                    headers={"Server-Timing": trace.server_timing()},
+                )
+            if await request.is_disconnected():
+                print("[WARN] Chat client disconnected; cancelling the agent loop")
+                # 499: client closed request (nobody is left to read it)
+                return Response(status_code=499)
+    finally:
+        agent.cancel()
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest, debug: bool = False):
+    """Streaming /chat over Server-Sent Events.
+
+    Sends `text` events with Claude's text deltas as they arrive (from every
+    turn, including text before a tool call), a `tool_call` event with each
+    frontend tool card as soon as its tool finishes, and finally a `message`
+    event carrying exactly what POST /chat would have returned, including
+    the timing breakdown. If the client disconnects, the stream is closed,
+    which cancels the Claude request and any running tools.
+    """
+    messages = [{"role": m.role, "content": m.content} for m in req.messages]
+    conversation = req.conversation_id or uuid.uuid4().hex
+
+    async def events():
+        # Started inside the generator: it runs in the response's task
+        trace = start_trace()
+        async for event, data in agent_events(messages, trace, conversation, debug):
+            yield _sse(event, jsonable_encoder(data))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/lottery/roll")
 async def lottery_roll():
     """Return a 5-digit number derived from Flare's on-chain random oracle.
 
-    The oracle random number updates once per FTSO round (~90s), so we hash
-    it with a unique nonce to produce a different 5-digit number on every call
-    while still being seeded by real Flare on-chain randomness.
+    The oracle random number updates once per voting round (~90s). It is
+    cached per round and seeds a local counter-mode DRBG, so only the first
+    roll of a round costs an RPC. The DRBG is also keyed with a secret
+    per-round server key, so rolls cannot be predicted from the public seed.
+    Each roll reports its round, DRBG draw index, instance and a commitment
+    to the round key, and is written to the draw log under the returned
+    draw_id. The seed and key are published by /lottery/reveal (and with
+    the draw's proof) once the round is over.
+    """
+    try:
+        require_oracle("random")
+    except OracleNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    try:
+        roll = await random_oracle.roll(100000)  # 00000–99999
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    roll["draw_id"] = await run_blocking(draw_log.record_roll, roll, 100000)
+    randomness_monitor.record_numbers([roll["number"]], 100000)
+    del roll["seed"]  # published with the round key after the round
+    return roll
+
+
+# Limits for bulk FDC verification (tool and /fdc/verify/batch)
+FDC_BATCH_MAX = int(os.getenv("FLARE_FDC_BATCH_MAX", "1000"))
+FDC_BATCH_MAX_CONCURRENCY = 64
+
+# Upper bound on numbers per /lottery/draws request
+LOTTERY_MAX_DRAWS = int(os.getenv("FLARE_LOTTERY_MAX_DRAWS", "50000"))
+
+
+@app.get("/lottery/draws")
+async def lottery_draws(
+    n: int = Query(1, ge=1, le=LOTTERY_MAX_DRAWS),
+    unique: bool = False,
+):
+    """Return `n` 5-digit numbers derived from one on-chain random value.
+
+    All numbers come from the current round's DRBG in a single bulk
+    derivation, with unbiased range reduction. Pass unique=true for
+    distinct numbers (e.g. a multi-ticket draw). Draw ids are consecutive
+    from first_draw_id.
     """
-    raw = random_oracle.get_random_number()
-    nonce = f"{time.time_ns()}-{uuid.uuid4().hex}"
-    digest = hashlib.sha256(f"{raw}-{nonce}".encode()).hexdigest()
-    five_digits = int(digest[:12], 16) % 100000  # 00000–99999
-    return {"number": five_digits}
+    try:
+        require_oracle("random")
+    except OracleNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    try:
+        batch = await random_oracle.draws(n, 100000, unique=unique)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    batch["first_draw_id"] = await run_blocking(draw_log.record_draws, batch, 100000)
+    if not unique:
+        randomness_monitor.record_numbers(batch["numbers"], 100000)
+    del batch["seed"]  # published with the round key after the round
+    return batch
+
+
+@app.get("/lottery/proof/{draw_id}")
+async def lottery_proof(draw_id: int):
+    """Return a logged draw with its Merkle inclusion proof.
+
+    The record holds the round's seed, so it is only served once the round
+    is over (425 until then); the round key is included as 'reveal'.
+    Draws are sealed into batches every FLARE_DRAW_LOG_SEAL_SECONDS; until
+    then the record is returned with sealed=false and status 202.
+    """
+    try:
+        result = await run_blocking(draw_log.proof, draw_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        result["reveal"] = random_oracle.reveal(result["round"], int(result["instance"], 16))
+    except ValueError as e:
+        raise HTTPException(status_code=425, detail=str(e))
+    except LookupError:
+        result["reveal"] = None
+    return JSONResponse(result, status_code=200 if result["sealed"] else 202)
+
+
+@app.get("/lottery/reveal/{round_id}")
+async def lottery_reveal(round_id: int, instance: str | None = None):
+    """Reveal the DRBG key (and seed) of a finished round.
+
+    Check SHA-256(key) against the commitment published with the round's
+    draws, then recompute them with RoundDRBG(seed, round, key). instance
+    defaults to the worker serving this request.
+    """
+    try:
+        instance_id = int(instance, 16) if instance else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid instance {instance!r}")
+    try:
+        return random_oracle.reveal(round_id, instance_id)
+    except ValueError as e:
+        raise HTTPException(status_code=425, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# Seconds between SSE keep-alive comments when no update is due
+STREAM_HEARTBEAT_SECONDS = 15
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/prices/stream")
+async def prices_stream(symbols: str | None = None):
+    """Server-Sent Events stream of FTSO prices, one event per voting epoch.
+
+    All clients share the price oracle's single epoch refresher, so RPC load
+    does not grow with the number of viewers. Pass ?symbols=BTC,ETH to filter.
+    A client that falls too far behind is sent a `dropped` event and closed.
+    """
+    if symbols:
+        wanted = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+        unknown = [s for s in wanted if s not in price_oracle.feed_ids]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported symbols: {', '.join(unknown)}")
+    else:
+        wanted = list(price_oracle.feed_ids)
+
+    def payload(prices: dict) -> dict:
+        return {"prices": [prices[s] for s in wanted if s in prices]}
+
+    async def events():
+        subscriber = price_broadcaster.subscribe()
+        try:
+            if price_broadcaster.latest:
+                yield _sse("prices", payload(price_broadcaster.latest))
+            while True:
+                try:
+                    update = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if update is None:
+                    yield _sse("dropped", {"reason": "client too slow"})
+                    return
+                yield _sse("prices", payload(update))
+        finally:
+            price_broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/fdc/verify/batch")
+async def fdc_verify_batch(req: VerifyBatchRequest):
+    """Verify many transactions with the FDC, streaming results as NDJSON.
+
+    Duplicate hashes are verified once; the rest run concurrently (at most
+    `concurrency` at a time). Each line is one finished verification with
+    its latency; the last line is {"summary": ...} with throughput.
+    """
+    try:
+        require_oracle("fdc")
+    except OracleNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if len(req.tx_hashes) > FDC_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {FDC_BATCH_MAX} transactions per batch")
+    if req.concurrency is not None and not 1 <= req.concurrency <= FDC_BATCH_MAX_CONCURRENCY:
+        raise HTTPException(
+            status_code=422,
+            detail=f"concurrency must be between 1 and {FDC_BATCH_MAX_CONCURRENCY}",
+        )
+
+    async def lines():
+        started = time.perf_counter()
+        items = []
+        async for item in fdc_oracle.iter_verify_batch(req.tx_hashes, req.concurrency):
+            items.append(item)
+            yield json.dumps(item) + "\n"
+        summary = fdc_oracle.batch_summary(items, len(req.tx_hashes), time.perf_counter() - started)
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/random/quality")
+async def random_quality(refresh: bool = False):
+    """Statistical health of the on-chain randomness and lottery output.
+
+    Returns the report from the last per-round evaluation; pass refresh=true
+    to re-run the tests now.
+    """
+    if refresh:
+        return await run_blocking(randomness_monitor.evaluate)
+    return await run_blocking(randomness_monitor.report)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics in the text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    # Circuit breaker state of every external endpoint
+    endpoints = {"rpc": chain.rpc_health.stats(), **fdc_oracle.endpoint_stats()}
+    degraded = any(e["state"] != "closed" for e in endpoints.values())
+    return {
+        "status": "degraded" if degraded else "ok",
+        "endpoints": endpoints,
+        "price_cache": price_oracle.cache_stats(),
+        "price_stream": price_broadcaster.stats(),
+        "draw_log": draw_log.stats(),
+        "fdc_connections": fdc_oracle.connection_stats(),
+        "fdc_proof_cache": fdc_oracle.proof_cache.stats(),
+        "fdc_dedupe": fdc_oracle.dedupe_stats(),
+    }
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once every oracle is connected and the RPC is
+    on the expected chain, 503 otherwise."""
+    all_ready = all(status["ready"] for status in oracle_status.values()) and not chain.error
+    return JSONResponse(
+        status_code=200 if all_ready else 503,
+        content={
+            "ready": all_ready,
+            "oracles": oracle_status,
+            "chain": {"chain_id": chain.chain_id, "error": chain.error},
+        },
+    )
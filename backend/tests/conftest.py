@@ -0,0 +1,16 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+# Tests import the backend package directly (data_Flare, main)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing main builds the module-level caches; keep them out of ~/.cache
+_CACHE_DIR = tempfile.mkdtemp(prefix="flare-copilot-tests-")
+atexit.register(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
+os.environ.setdefault("FLARE_METADATA_CACHE", os.path.join(_CACHE_DIR, "chain_metadata.json"))
+os.environ.setdefault("FLARE_HISTORY_DIR", os.path.join(_CACHE_DIR, "ftso_history"))
+os.environ.setdefault("FLARE_PROOF_CACHE_DIR", os.path.join(_CACHE_DIR, "fdc_proofs"))
+os.environ.setdefault("FLARE_DRAW_LOG_DIR", os.path.join(_CACHE_DIR, "draw_log"))
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+import time
+
+import main
+from data_Flare.request_trace import current_trace, start_trace
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after=None):
+        self.disconnect_after = disconnect_after
+        self.started = time.monotonic()
+
+    async def is_disconnected(self):
+        return self.disconnect_after is not None and time.monotonic() - self.started >= self.disconnect_after
+
+
+def chat_request(**extra):
+    return main.ChatRequest(messages=[{"role": "user", "content": "BTC price?"}], **extra)
+
+
+def test_run_blocking_keeps_the_loop_free_and_the_trace():
+    async def run():
+        trace = start_trace()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.create_task(ticker())
+
+        def blocking():
+            time.sleep(0.1)
+            return threading.current_thread().name, current_trace()
+
+        name, seen = await main.run_blocking(blocking)
+        ticking.cancel()
+        return name, seen is trace, ticks
+
+    name, same_trace, ticks = asyncio.run(run())
+    assert name.startswith("blocking")
+    assert same_trace
+    assert ticks >= 5
+
+
+def test_chat_returns_the_agent_reply_with_server_timing(monkeypatch):
+    async def fake_agent(messages, trace, conversation, debug=False):
+        return {"role": "assistant", "content": "42", "conversationId": conversation}
+
+    monkeypatch.setattr(main, "run_agent", fake_agent)
+    response = asyncio.run(main.chat(chat_request(conversation_id="c1"), FakeRequest()))
+    assert json.loads(response.body) == {"role": "assistant", "content": "42", "conversationId": "c1"}
+    assert "total;dur=" in response.headers["Server-Timing"]
+
+
+def test_chat_cancels_the_agent_when_the_client_leaves(monkeypatch):
+    state = {"cancelled": False}
+
+    async def stuck_agent(messages, trace, conversation, debug=False):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    monkeypatch.setattr(main, "run_agent", stuck_agent)
+    monkeypatch.setattr(main, "DISCONNECT_POLL_SECONDS", 0.01)
+
+    async def run():
+        response = await main.chat(chat_request(), FakeRequest(disconnect_after=0.02))
+        await asyncio.sleep(0)  # let the cancellation land
+        return response
+
+    response = asyncio.run(run())
+    assert response.status_code == 499
+    assert state["cancelled"]
@@ -0,0 +1,82 @@
+import copy
+import json
+from types import SimpleNamespace
+
+from main import CACHE_CONTROL, ContextBudget, with_cache_breakpoints
+
+
+def tool_turn(question, result_chars, n):
+    """A user question, a tool call and its result, then the answer."""
+    return [
+        {"role": "user", "content": question},
+        {"role": "assistant", "content": [{"type": "tool_use", "id": f"t{n}", "name": "x", "input": {}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": f"t{n}", "content": "r" * result_chars}]},
+        {"role": "assistant", "content": f"answer {n}"},
+    ]
+
+
+def budget_for(extra_chars):
+    """A budget that fits the fixed prefix plus about `extra_chars` of messages."""
+    return ContextBudget(max_tokens=int((ContextBudget.FIXED_CHARS + extra_chars) / ContextBudget.CHARS_PER_TOKEN))
+
+
+def test_breakpoints_go_on_the_last_two_user_messages():
+    messages = [*tool_turn("first", 10, 1), {"role": "user", "content": "second"}]
+    original = copy.deepcopy(messages)
+    marked = with_cache_breakpoints(messages)
+
+    assert messages == original
+    assert "cache_control" not in json.dumps(marked[0])
+    assert marked[2]["content"][-1]["cache_control"] == CACHE_CONTROL
+    assert marked[4]["content"] == [{"type": "text", "text": "second", "cache_control": CACHE_CONTROL}]
+    assert json.dumps(marked).count("cache_control") == 2
+
+
+def test_fit_leaves_a_small_conversation_alone():
+    messages = tool_turn("q", 100, 1)
+    original = copy.deepcopy(messages)
+    budget_for(100_000).fit(messages)
+    assert messages == original
+
+
+def test_fit_elides_earlier_bulky_results_before_dropping_turns():
+    messages = [*tool_turn("q1", 40_000, 1), *tool_turn("q2", 10_000, 2)][:-1]
+    budget = budget_for(45_000)
+    budget.fit(messages)
+
+    assert messages[0]["content"] == "q1"   # nothing dropped
+    assert "characters elided" in messages[2]["content"][0]["content"]
+    assert messages[-1]["content"][0]["content"] == "r" * 10_000   # current results kept whole
+    assert budget.report()["context"]["elided_tool_results"] == 1
+
+
+def test_fit_drops_whole_turns_when_eliding_is_not_enough():
+    messages = []
+    for n in range(6):
+        messages += tool_turn("q" * 3000, 10, n)
+    messages.append({"role": "user", "content": "latest"})
+    budget = budget_for(12_000)
+    budget.fit(messages)
+
+    assert messages[-1]["content"] == "latest" and len(messages) > 1
+    first = messages[0]
+    assert first["role"] == "user" and first["content"].startswith("[")
+    assert "earlier messages omitted" in first["content"]
+    # tool_use / tool_result pairs stay together
+    uses = [b["id"] for m in messages if isinstance(m["content"], list) for b in m["content"] if b["type"] == "tool_use"]
+    results = [b["tool_use_id"] for m in messages if isinstance(m["content"], list)
+               for b in m["content"] if b["type"] == "tool_result"]
+    assert uses == results
+    assert budget.report()["context"]["dropped_messages"] % 4 == 0
+
+
+def test_usage_recalibrates_the_estimate():
+    budget = budget_for(100_000)
+    budget.fit([{"role": "user", "content": "hi"}])
+    sent = budget._sent_chars
+    budget.observe(SimpleNamespace(input_tokens=100, cache_read_input_tokens=300,
+                                   cache_creation_input_tokens=0, output_tokens=20))
+    report = budget.report()
+    assert budget.chars_per_token == sent / 400
+    assert report["cache_hit_ratio"] == 0.75
+    assert report["context"]["estimated_tokens"] == 400
@@ -0,0 +1,113 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_Flare.draw_log import DrawLog, leaf_hash, recompute, verify_proof
+from data_Flare.flare_random_oracle import _FlareRandomOracleBase
+from data_Flare.voting_epochs import voting_round_id
+
+
+def fill(log, n, instance=1):
+    return log.append(seed=12345, round_id=812345, timestamp=1731541234, instance=instance,
+                      draw=0, numbers=list(range(n)), bound=100000)
+
+
+def check(proof):
+    return verify_proof(proof["leaf"], proof["proof"], proof["root"])
+
+
+@pytest.mark.parametrize("records,batch_size", [(1, 8), (3, 8), (5, 8), (7, 7), (13, 5), (33, 16)])
+def test_every_draw_in_odd_sized_batches_verifies(tmp_path, records, batch_size):
+    log = DrawLog(str(tmp_path), batch_size=batch_size)
+    fill(log, records)
+    log.seal()
+    assert log.sealed == records
+    for draw_id in range(records):
+        proof = log.proof(draw_id)
+        assert proof["sealed"]
+        assert proof["leaf"] == leaf_hash(bytes.fromhex(proof["record"])).hex()
+        assert check(proof)
+    log.close()
+
+
+def test_tampered_proof_fails(tmp_path):
+    log = DrawLog(str(tmp_path), batch_size=5)
+    fill(log, 5)
+    log.seal()
+    proof = log.proof(4)
+    record = bytearray.fromhex(proof["record"])
+    record[-1] ^= 1
+    assert not verify_proof(leaf_hash(bytes(record)).hex(), proof["proof"], proof["root"])
+    assert not verify_proof(proof["leaf"], proof["proof"][:-1], proof["root"])
+    log.close()
+
+
+def test_unsealed_draw_has_no_proof(tmp_path):
+    log = DrawLog(str(tmp_path))
+    fill(log, 1)
+    assert log.proof(0)["sealed"] is False
+    with pytest.raises(ValueError):
+        log.proof(1)
+    log.close()
+
+
+def test_torn_index_line_does_not_hide_later_batches(tmp_path):
+    log = DrawLog(str(tmp_path), batch_size=3)
+    fill(log, 6)
+    log.seal()
+    log.close()
+    with open(tmp_path / "batches.jsonl", "ab") as f:
+        f.write(b'{"batch": 2, "sta')
+
+    log = DrawLog(str(tmp_path), batch_size=3)
+    assert log.sealed == 6
+    fill(log, 3)
+    log.seal()
+    log.close()
+
+    log = DrawLog(str(tmp_path), batch_size=3)
+    assert log.stats() == {"draws": 9, "sealed": 9, "batches": 3}
+    assert check(log.proof(8))
+    log.close()
+
+
+def test_logs_sharing_a_directory_hand_out_distinct_ids(tmp_path):
+    a = DrawLog(str(tmp_path), batch_size=4)
+    b = DrawLog(str(tmp_path), batch_size=4)
+    first_a = fill(a, 3, instance=1)
+    first_b = fill(b, 3, instance=2)
+    assert (first_a, first_b) == (0, 3)
+    b.seal()
+    a.seal()
+    assert a.get(4)["instance"] == hex(2)
+    assert all(check(a.proof(i)) for i in range(6))
+    assert b.stats() == a.stats() == {"draws": 6, "sealed": 6, "batches": 2}
+    a.close()
+    b.close()
+
+
+def test_concurrent_bulk_draws_rederive_from_their_records(tmp_path):
+    oracle = _FlareRandomOracleBase()
+    oracle._init_round_cache()
+    now = time.time()
+    current = {"random": 0xC0FFEE << 200, "is_secure": True,
+               "timestamp": int(now), "round": voting_round_id(now)}
+    log = DrawLog(str(tmp_path))
+    cases = [(40, 100000, False), (20, 100, True), (300, 2000, True), (3, 7, False)]
+
+    def job(i):
+        if i % 5 == 0:
+            return log.record_roll(oracle._roll_from(current, 100000), 100000)
+        n, bound, unique = cases[i % len(cases)]
+        return log.record_draws(oracle._draws_from(current, n, bound, unique), bound)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(job, range(100)))
+
+    oracle.REVEAL_AFTER_SECONDS = -10 ** 6   # reveal the live round for the audit
+    key = bytes.fromhex(oracle.reveal(current["round"])["key"])
+    for draw_id in range(log.count):
+        record = log.get(draw_id)
+        assert recompute(record, key) == record["number"]
+    log.close()
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from data_Flare import endpoint_health
+from data_Flare.endpoint_health import CircuitOpenError, EndpointHealth
+from data_Flare.flare_chain import _RpcHealthMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(endpoint_health, "time", fake)
+    return fake
+
+
+def trip(health):
+    for _ in range(EndpointHealth.MIN_REQUESTS):
+        assert health.allow()
+        health.record_failure()
+
+
+def test_opens_after_failure_rate(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    for _ in range(EndpointHealth.MIN_REQUESTS - 1):
+        health.record_failure()
+    assert health.state == "closed"
+    health.record_failure()
+    assert health.state == "open"
+    assert not health.allow()
+    with pytest.raises(CircuitOpenError):
+        health.check()
+
+
+def test_half_open_allows_a_single_probe(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    trip(health)
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.state == "half_open"
+    assert health.allow()
+    assert not health.allow()
+
+
+def test_probe_success_closes(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    trip(health)
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.allow()
+    health.record_success(0.05)
+    assert health.state == "closed"
+    assert health.allow() and health.allow()
+
+
+def test_probe_failure_doubles_open_time(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    trip(health)
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.allow()
+    health.record_failure()
+    assert health.state == "open"
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.state == "open"
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.state == "half_open"
+
+
+def test_cancelled_probe_is_released(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    trip(health)
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.allow()
+    health.record_cancelled()
+    assert health.allow()
+
+
+def test_lost_probe_expires_after_max_timeout(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    trip(health)
+    clock.now += EndpointHealth.OPEN_SECONDS
+    assert health.allow()
+    assert not health.allow()
+    clock.now += 10
+    assert health.allow()
+
+
+def test_adaptive_timeout_tracks_p99():
+    health = EndpointHealth("rpc", max_timeout=10, min_timeout=0.1)
+    assert health.timeout() == 10
+    for _ in range(EndpointHealth.MIN_LATENCY_SAMPLES):
+        health.record_success(0.2)
+    assert health.timeout() == pytest.approx(0.6)
+
+
+def test_cancelled_async_rpc_probe_does_not_wedge_breaker(clock):
+    health = EndpointHealth("rpc", max_timeout=10)
+    middleware = _RpcHealthMiddleware.build(health)(None)
+    trip(health)
+    clock.now += EndpointHealth.OPEN_SECONDS
+
+    async def hang(method, params):
+        await asyncio.sleep(60)
+
+    async def answer(method, params):
+        return {"result": "0x1"}
+
+    async def run():
+        slow = await middleware.async_wrap_make_request(hang)
+        probe = asyncio.create_task(slow("eth_blockNumber", []))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        fast = await middleware.async_wrap_make_request(answer)
+        return await fast("eth_blockNumber", [])
+
+    assert asyncio.run(run()) == {"result": "0x1"}
+    assert health.state == "closed"
@@ -0,0 +1,61 @@
+import asyncio
+
+from data_Flare.flare_fdc_oracle import AsyncFlareFDCOracle, FlareFDCOracle
+from data_Flare.proof_cache import ProofCache
+
+HASHES = ["0x" + f"{i:064x}" for i in range(40)]
+
+
+def result(tx):
+    verified = int(tx, 16) % 3 != 0
+    return {"verified": verified, "status": "verified" if verified else "not_found", "tx_hash": tx}
+
+
+def test_duplicates_are_verified_once_and_mapped_to_every_position(tmp_path, monkeypatch):
+    oracle = FlareFDCOracle(proof_cache=ProofCache(str(tmp_path)))
+    calls = []
+    monkeypatch.setattr(oracle, "submit_verification_request", lambda tx: calls.append(tx) or result(tx))
+    try:
+        batch = oracle.verify_batch([HASHES[10], HASHES[1], " " + HASHES[10].upper(), HASHES[12]])
+    finally:
+        oracle.close()
+
+    assert sorted(calls) == sorted([HASHES[10], HASHES[1], HASHES[12]])
+    positions = {item["tx_hash"]: item["positions"] for item in batch["results"]}
+    assert positions[HASHES[10]] == [0, 2]
+    summary = batch["summary"]
+    assert (summary["requested"], summary["unique"], summary["duplicates_removed"]) == (4, 3, 1)
+    assert summary["statuses"] == {"verified": 2, "not_found": 1}
+
+
+def test_async_batch_respects_concurrency(tmp_path, monkeypatch):
+    oracle = AsyncFlareFDCOracle(proof_cache=ProofCache(str(tmp_path)))
+    state = {"running": 0, "peak": 0}
+
+    async def fake_verify(tx):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.001)
+        state["running"] -= 1
+        return result(tx)
+
+    monkeypatch.setattr(oracle, "submit_verification_request", fake_verify)
+
+    async def run():
+        try:
+            return await oracle.verify_batch(HASHES, concurrency=5)
+        finally:
+            await oracle.close()
+
+    batch = asyncio.run(run())
+    assert state["peak"] == 5
+    assert sorted(item["tx_hash"] for item in batch["results"]) == HASHES
+    assert sum(batch["summary"]["statuses"].values()) == len(HASHES)
+
+
+def test_batch_summary_percentiles():
+    items = [{"latency_ms": float(ms), "status": "verified"} for ms in range(1, 101)]
+    summary = FlareFDCOracle.batch_summary(items, 100, 2.0)
+    assert summary["latency_ms"] == {"p50": 51.0, "p95": 96.0, "max": 100.0}
+    assert summary["throughput_per_second"] == 50.0
+    assert FlareFDCOracle.batch_summary([], 0, 0.0)["latency_ms"]["p50"] is None
@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_Flare.endpoint_health import EndpointHealth
+from data_Flare.flare_fdc_oracle import FlareFDCOracle
+from data_Flare.proof_cache import ProofCache
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.ports.add(self.client_address[1])
+        time.sleep(0.01)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.ports = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def oracle(tmp_path):
+    oracle = FlareFDCOracle(proof_cache=ProofCache(str(tmp_path)))
+    yield oracle
+    oracle.close()
+
+
+def test_reuse_is_tracked_per_request_across_threads(server, oracle):
+    url = f"http://127.0.0.1:{server.server_port}/"
+    health = EndpointHealth("test", 5)
+
+    def get(_):
+        return oracle._request("GET", url, health)[1]["reused_connection"]
+
+    with ThreadPoolExecutor(8) as pool:
+        reused = list(pool.map(get, range(200)))
+
+    # Every request that did not reuse a connection opened one of the server's
+    assert reused.count(False) == len(server.ports)
+    stats = oracle.connection_stats()[f"127.0.0.1:{server.server_port}"]
+    assert stats["requests"] == 200
+    assert stats["reused"] == reused.count(True)
+
+
+def test_batches_share_one_pool_and_respect_concurrency(oracle, monkeypatch):
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "threads": set()}
+
+    def fake_verify(tx):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            state["threads"].add(threading.current_thread().name)
+        time.sleep(0.005)
+        with lock:
+            state["running"] -= 1
+        return {"verified": True, "status": "verified", "tx_hash": tx}
+
+    monkeypatch.setattr(oracle, "submit_verification_request", fake_verify)
+    hashes = ["0x" + f"{i:064x}" for i in range(60)]
+    for _ in range(3):
+        items = list(oracle.iter_verify_batch(hashes + hashes[:5], concurrency=4))
+        assert sorted(item["tx_hash"] for item in items) == sorted(hashes)
+    assert state["peak"] <= 4
+    assert all(name.startswith("fdc-batch") for name in state["threads"])
@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from data_Flare.flare_fdc_oracle import FlareFDCOracle
+from data_Flare.proof_cache import ProofCache
+
+PROOF = {"response": {"votingRound": 1}, "proof": ["0x" + "ab" * 32]}
+
+
+@pytest.fixture
+def oracle(tmp_path, monkeypatch):
+    oracle = FlareFDCOracle(proof_cache=ProofCache(str(tmp_path)))
+    calls = []
+
+    def fake_da_layer(round_id):
+        calls.append(round_id)
+        return oracle.answer, None
+
+    monkeypatch.setattr(oracle, "_try_da_layer", fake_da_layer)
+    oracle.answer = PROOF
+    oracle.calls = calls
+    yield oracle
+    oracle.close()
+
+
+def test_finalized_proof_is_cached(oracle):
+    round_id = oracle.latest_finalized_round()
+    first = oracle.get_attestation_proof(round_id)
+    assert first["finalized"] and first["cache"] is None
+    second = oracle.get_attestation_proof(round_id)
+    assert second["cache"] == "memory"
+    assert oracle.calls == [round_id]
+
+
+@pytest.mark.parametrize("offset,answer", [(1, PROOF), (5, PROOF), (0, {}), (0, [])])
+def test_unfinalized_or_empty_proof_is_not_persisted(oracle, offset, answer):
+    round_id = oracle.latest_finalized_round() + offset
+    oracle.answer = answer
+    result = oracle.get_attestation_proof(round_id)
+    assert result["status"] == "verified" and not result["finalized"]
+    assert oracle.proof_cache.get(round_id, oracle._proof_key(round_id)) == (None, None)
+
+    # Served briefly from the pending cache, then fetched again
+    assert oracle.get_attestation_proof(round_id)["cache"] == "pending"
+    oracle.pending_proofs.discard(oracle._proof_key(round_id))
+    oracle.get_attestation_proof(round_id)
+    assert oracle.calls == [round_id, round_id]
+
+
+def test_demo_fallback_is_not_cached(oracle):
+    oracle.answer = None
+    round_id = oracle.latest_finalized_round()
+    assert oracle.get_attestation_proof(round_id)["status"] == "demo_fallback"
+    assert oracle.get_attestation_proof(round_id)["status"] == "demo_fallback"
+    assert oracle.calls == [round_id, round_id]
+
+
+def proof(i, size=100):
+    return {"response": {"votingRound": i}, "proof": ["0x" + "ab" * size]}
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    ProofCache(str(tmp_path)).put(7, "k", proof(7))
+    cache = ProofCache(str(tmp_path))
+    assert cache.get(7, "k") == (proof(7), "disk")
+    assert cache.get(7, "k") == (proof(7), "memory")
+
+
+@pytest.mark.parametrize("damage", ["tamper", "truncate"])
+def test_corrupted_disk_entry_is_a_miss_and_removed(tmp_path, damage):
+    ProofCache(str(tmp_path)).put(7, "k", proof(7))
+    file = tmp_path / "7" / "k.json"
+    if damage == "tamper":
+        entry = json.loads(file.read_bytes())
+        entry["proof"]["response"]["votingRound"] = 8   # sha256 no longer matches
+        file.write_text(json.dumps(entry))
+    else:
+        file.write_bytes(file.read_bytes()[:40])
+
+    cache = ProofCache(str(tmp_path))
+    assert cache.get(7, "k") == (None, None)
+    assert not file.exists()
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = ProofCache(str(tmp_path), memory_bytes=700)
+    for i in range(3):
+        cache.put(i, "k", proof(i))   # ~330 bytes each: two fit
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.stats()["memory_evictions"] == 1
+    assert cache.get(0, "k")[1] == "disk"
+    assert cache.get(2, "k")[1] == "memory"
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    cache = ProofCache(str(tmp_path), disk_bytes=1000)
+    for i in range(3):
+        cache.put(i, "k", proof(i))
+        os.utime(tmp_path / str(i) / "k.json", (1000 + i, 1000 + i))
+    os.utime(tmp_path / "0" / "k.json", (2000, 2000))   # round 0 was read recently
+    cache.put(3, "k", proof(3))                           # over budget
+
+    assert cache.stats()["disk_bytes"] <= 900
+    assert (tmp_path / "0" / "k.json").exists()
+    assert not (tmp_path / "1" / "k.json").exists()
+    assert (tmp_path / "3" / "k.json").exists()
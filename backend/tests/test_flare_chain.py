@@ -0,0 +1,99 @@
+import pytest
+
+from data_Flare.chain_metadata import ChainMetadataCache
+from data_Flare.flare_chain import FlareChain
+
+OLD = "0x" + "11" * 20
+NEW = "0x" + "22" * 20
+
+
+@pytest.fixture
+def chain(tmp_path):
+    chain = FlareChain(metadata_cache=ChainMetadataCache(str(tmp_path / "metadata.json")))
+    chain.chain_id = chain.CHAIN_ID
+    chain.addresses = {"FtsoV2": OLD}
+    yield chain
+    chain.close()
+
+
+def test_failing_listener_does_not_stop_the_others_and_is_retried(chain):
+    seen, attempts = [], []
+
+    def flaky(name, address):
+        attempts.append(address)
+        if len(attempts) == 1:
+            raise ValueError("boom")
+
+    chain.on_address_change(flaky)
+    chain.on_address_change(lambda name, address: seen.append((name, address)))
+
+    with pytest.raises(RuntimeError):
+        chain._apply_revalidation(chain.CHAIN_ID, ["FtsoV2"], [NEW])
+    assert len(seen) == 1
+    # The swap stays pending, in memory and on disk
+    assert chain.addresses["FtsoV2"].lower() == OLD
+    assert chain.metadata.load(chain.network_key)["addresses"]["FtsoV2"].lower() == OLD
+
+    chain._apply_revalidation(chain.CHAIN_ID, ["FtsoV2"], [NEW])
+    assert len(seen) == 2 and len(attempts) == 2
+    assert chain.addresses["FtsoV2"].lower() == NEW
+    assert chain.metadata.load(chain.network_key)["addresses"]["FtsoV2"].lower() == NEW
+
+
+def test_wrong_chain_fails_until_it_recovers(chain):
+    with pytest.raises(ConnectionError):
+        chain._apply_revalidation(14, ["FtsoV2"], [OLD])
+    assert chain.error
+    chain._apply_revalidation(chain.CHAIN_ID, ["FtsoV2"], [OLD])
+    assert chain.error is None
+
+
+def test_feed_ids_are_loaded_from_the_metadata_cache(chain):
+    from data_Flare.flare_oracle import FlarePriceOracle
+
+    moved = "0x01" + "42" * 20
+    chain.addresses["RandomNumberV2"] = NEW
+    chain.record_feed_ids({**FlarePriceOracle.FEED_IDS, "BTC": moved})
+    chain.close()
+
+    warm = FlareChain(metadata_cache=chain.metadata)
+    assert warm._load_metadata(list(warm.CONTRACT_NAMES))
+    price = FlarePriceOracle(warm)
+    assert price._get_feed_id("BTC") == bytes.fromhex(moved[2:])
+    assert price._get_feed_id("ETH") == bytes.fromhex(FlarePriceOracle.FEED_IDS["ETH"][2:])
+    warm.close()
+
+
+class EagerChain:
+    """Fires address changes during connect(), like an early background revalidation."""
+
+    def __init__(self):
+        self.listeners = []
+        self.feed_ids = {}
+
+    def on_address_change(self, callback):
+        self.listeners.append(callback)
+
+    def connect(self, names=()):
+        for name in ("FtsoV2", "RandomNumberV2"):
+            for callback in self.listeners:
+                callback(name, NEW)
+
+    def record_feed_ids(self, feed_ids):
+        self.feed_ids.update(feed_ids)
+
+    def address(self, name):
+        return NEW
+
+    def contract(self, name, abi):
+        return object()
+
+
+def test_oracles_survive_an_address_change_during_construction():
+    from data_Flare.flare_oracle import FlarePriceOracle
+    from data_Flare.flare_random_oracle import FlareRandomOracle
+
+    price = FlarePriceOracle(EagerChain())
+    random = FlareRandomOracle(EagerChain())
+    assert price.ftso_v2_address == NEW and price.cache is not None
+    assert random.random_address == NEW
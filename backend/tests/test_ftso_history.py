@@ -0,0 +1,119 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from data_Flare.flare_oracle import FlarePriceOracle
+from data_Flare.ftso_history import FtsoBackfill, FtsoHistoryStore
+
+BTC = FlarePriceOracle.FEED_IDS["BTC"]
+
+
+def event(round_id, value, decimals=2, turnout=5000, feed_id=BTC):
+    """An FtsoFeedPublished log as web3 returns it."""
+    data = (
+        value.to_bytes(32, "big", signed=True)
+        + turnout.to_bytes(32, "big")
+        + decimals.to_bytes(32, "big", signed=True)
+    )
+    return {
+        "topics": [
+            bytes.fromhex(FtsoBackfill.EVENT_TOPIC[2:]),
+            round_id.to_bytes(32, "big"),
+            bytes.fromhex(feed_id[2:].ljust(64, "0")),
+        ],
+        "data": data,
+    }
+
+
+class FakeChain:
+    """Serves one event per block; `broken` blocks always fail."""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(get_logs=self.get_logs))
+
+    async def connect(self, names=()):
+        pass
+
+    async def resolve(self, names):
+        return {name: "0x" + "00" * 20 for name in names}
+
+    async def get_logs(self, params):
+        blocks = range(params["fromBlock"], params["toBlock"] + 1)
+        if self.broken.intersection(blocks):
+            raise ValueError("query returned more than 10000 results")
+        return [event(1000 + block, 6500000 + block) for block in blocks]
+
+
+def backfill(tmp_path, broken=()):
+    store = FtsoHistoryStore(str(tmp_path))
+    job = FtsoBackfill(FakeChain(broken), store, FlarePriceOracle.FEED_IDS, concurrency=4)
+    job.MAX_RETRIES = 0
+    return store, asyncio.run(job.run(1, 200))
+
+
+def test_backfill_writes_every_block(tmp_path):
+    store, report = backfill(tmp_path)
+    assert report["skipped_blocks"] == []
+    assert report["rows_written"] == 200
+    rows = store.query("BTC")
+    np.testing.assert_array_equal(rows["round_id"], np.arange(1001, 1201))
+
+
+def test_backfill_reports_blocks_that_failed_every_retry(tmp_path):
+    store, report = backfill(tmp_path, broken={17, 18, 19, 150})
+    assert report["skipped_blocks"] == [[17, 19], [150, 150]]
+    assert report["rows_written"] == 196
+    assert store.row_count("BTC") == 196
+
+
+def columns(rounds, value=100):
+    rounds = np.asarray(rounds, dtype=np.uint32)
+    return {
+        "round_id": rounds,
+        "timestamp": rounds.astype(np.int64) * 90,
+        "value": np.full(len(rounds), value, dtype=np.int64),
+        "decimals": np.full(len(rounds), 2, dtype=np.int8),
+        "turnout_bips": np.full(len(rounds), 5000, dtype=np.uint16),
+    }
+
+
+def test_store_queries_only_the_range_across_segments(tmp_path):
+    store = FtsoHistoryStore(str(tmp_path))
+    store.append("BTC", columns([5, 1, 3]))
+    store.append("BTC", columns([10, 12]))
+    rows = store.query("btc", 3 * 90, 10 * 90)
+    np.testing.assert_array_equal(rows["round_id"], [3, 5, 10])
+    np.testing.assert_allclose(store.prices(rows), [1.0, 1.0, 1.0])
+
+    # The index survives a reopen
+    assert FtsoHistoryStore(str(tmp_path)).row_count("BTC") == 5
+
+
+def test_compact_merges_segments_and_drops_duplicate_rounds(tmp_path):
+    store = FtsoHistoryStore(str(tmp_path))
+    store.append("BTC", columns([1, 2, 3]))
+    store.append("BTC", columns([3, 4]))  # overlapping backfill
+    assert store.row_count("BTC") == 5
+    np.testing.assert_array_equal(store.query("BTC")["round_id"], [1, 2, 3, 4])
+
+    store.compact("BTC")
+    assert store.row_count("BTC") == 4
+    assert len(list((tmp_path / "BTC").iterdir())) == 1
+    np.testing.assert_array_equal(store.query("BTC")["round_id"], [1, 2, 3, 4])
+
+
+def test_decode_a_known_payload():
+    # FtsoFeedPublished data: int32 value, uint16 turnoutBIPS, int8 decimals
+    payload = bytes.fromhex(
+        "0000000000000000000000000000000000000000000000000000000000635c81"
+        "0000000000000000000000000000000000000000000000000000000000001f40"
+        "fffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffe"
+    )
+    rows = FtsoBackfill._decode([(812345, payload), (812346, event(812346, -5, decimals=3)["data"])])
+    np.testing.assert_array_equal(rows["value"], [6511745, -5])
+    np.testing.assert_array_equal(rows["decimals"], [-2, 3])
+    np.testing.assert_array_equal(rows["turnout_bips"], [8000, 5000])
+    np.testing.assert_array_equal(rows["round_id"], [812345, 812346])
+    assert rows["timestamp"][0] == 1658430000 + 812345 * 90
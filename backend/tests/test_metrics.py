@@ -0,0 +1,112 @@
+import asyncio
+import gc
+import threading
+
+import pytest
+
+from data_Flare import metrics
+from data_Flare.metrics import Registry
+
+
+def run_in_threads(fn, n):
+    threads = [threading.Thread(target=fn) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_shards_from_every_thread_are_summed():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs", ("kind",))
+    histogram = registry.histogram("job_seconds", "Job time", buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            counter.labels("a").inc()
+            histogram.observe(0.5)
+
+    run_in_threads(work, 8)
+    assert counter.labels("a").value() == 8000
+    cumulative, total, count = histogram.labels().snapshot()
+    assert cumulative == [0, 8000, 8000] and count == 8000
+    assert total == pytest.approx(4000)
+
+
+def test_exited_threads_fold_into_the_base_total():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs")
+    histogram = registry.histogram("job_seconds", "Job time", buckets=(1.0,))
+
+    def work():
+        counter.inc(2)
+        histogram.observe(0.5)
+
+    for _ in range(50):
+        run_in_threads(work, 4)
+    gc.collect()
+
+    assert counter.labels().value() == 400
+    assert histogram.labels().snapshot() == ([200, 200], 100.0, 200)
+    # Only the threads still alive keep a shard
+    assert len(counter.labels()._shards._live) <= 1
+    counter.inc()
+    assert counter.labels().value() == 401
+
+
+def test_exposition_output():
+    registry = Registry()
+    requests = registry.counter("http_total", "HTTP requests", ("route", "status"))
+    requests.labels("/x", 200).inc(3)
+    requests.labels("/x", "200").inc()              # same child as the int label
+    requests.labels('a"b\\c', 500).inc(0.5)
+    latency = registry.histogram("rpc_seconds", "RPC time", ("method",), buckets=(0.01, 0.1))
+    latency.labels("eth_call").observe(0.005)
+    latency.labels("eth_call").observe(0.05)
+    latency.labels("eth_call").observe(2)
+    registry.callback("cache_total", "Cache lookups", ("result",), lambda: {("hit",): 7}, kind="gauge")
+
+    assert registry.render() == (
+        "# HELP http_total HTTP requests\n"
+        "# TYPE http_total counter\n"
+        'http_total{route="/x",status="200"} 4\n'
+        'http_total{route="a\\"b\\\\c",status="500"} 0.5\n'
+        "# HELP rpc_seconds RPC time\n"
+        "# TYPE rpc_seconds histogram\n"
+        'rpc_seconds_bucket{method="eth_call",le="0.01"} 1\n'
+        'rpc_seconds_bucket{method="eth_call",le="0.1"} 2\n'
+        'rpc_seconds_bucket{method="eth_call",le="+Inf"} 3\n'
+        'rpc_seconds_sum{method="eth_call"} 2.055\n'
+        'rpc_seconds_count{method="eth_call"} 3\n'
+        "# HELP cache_total Cache lookups\n"
+        "# TYPE cache_total gauge\n"
+        'cache_total{result="hit"} 7\n'
+    )
+
+
+def test_registry_rejects_duplicates_and_survives_a_failing_callback():
+    registry = Registry()
+    registry.counter("a_total", "A")
+    with pytest.raises(ValueError):
+        registry.counter("a_total", "A again")
+    with pytest.raises(ValueError):
+        registry.counter("b_total", "B", ("x",)).labels()
+    registry.callback("c_total", "C", (), lambda: 1 / 0)
+    assert "# TYPE a_total counter" in registry.render()
+
+
+def test_timed_records_outcomes_of_sync_and_async_methods():
+    class Oracle:
+        @metrics.timed("test")
+        def ok(self):
+            return 1
+
+        @metrics.timed("test")
+        async def fails(self):
+            raise RuntimeError("boom")
+
+    Oracle().ok()
+    with pytest.raises(RuntimeError):
+        asyncio.run(Oracle().fails())
+    assert metrics.ORACLE_SECONDS.labels("test", "ok", "ok").snapshot()[2] == 1
+    assert metrics.ORACLE_SECONDS.labels("test", "fails", "error").snapshot()[2] == 1
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+
+from data_Flare import price_cache
+from data_Flare.price_cache import EpochPriceCache
+from data_Flare.voting_epochs import round_start_ts
+
+EPOCH = round_start_ts(900000)  # start of a voting epoch; the next one is 90s later
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=EPOCH + 10)
+    monkeypatch.setattr(price_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def price(timestamp, value=1.0):
+    return {"symbol": "BTC/USD", "price": value, "timestamp": timestamp}
+
+
+def test_entry_expires_at_the_next_epoch_boundary(clock):
+    cache = EpochPriceCache()
+    cache.put("BTC", price(EPOCH + 3))
+    clock.now = EPOCH + 89.9
+    assert cache.get("BTC") == price(EPOCH + 3)
+    clock.now = EPOCH + 90
+    assert cache.get("BTC") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_lagging_value_is_only_kept_for_the_stale_retry(clock):
+    cache = EpochPriceCache()
+    clock.now = EPOCH + 95  # the value's epoch ended 5s ago
+    cache.put("BTC", price(EPOCH + 3))
+    clock.now += EpochPriceCache.STALE_RETRY_SECONDS - 0.1
+    assert cache.get("BTC") is not None
+    clock.now += 0.1
+    assert cache.get("BTC") is None
+
+
+def test_batch_lookup_is_all_or_nothing(clock):
+    cache = EpochPriceCache()
+    cache.put_many({"BTC": price(EPOCH + 3), "ETH": price(EPOCH + 3, 2.0)})
+    assert set(cache.get_many(["ETH", "BTC"])) == {"ETH", "BTC"}
+    assert cache.get_many(["BTC", "FLR"]) is None
+    cache.clear()
+    assert cache.get_many(["BTC"]) is None
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from data_Flare.price_history import PriceHistory
+
+T0 = 1731541200
+
+
+def test_stats_on_a_known_series():
+    history = PriceHistory(["BTC"])
+    for i, price in enumerate([100.0, 110.0, 99.0, 120.0]):
+        history.record("BTC", price, T0 + 90 * i)
+
+    stats = history.stats("btc", rolling_points=2)
+    returns = np.diff(np.log([100.0, 110.0, 99.0, 120.0]))
+    assert stats["symbol"] == "BTC/USD"
+    assert stats["points"] == 4
+    assert (stats["from_timestamp"], stats["to_timestamp"]) == (T0, T0 + 270)
+    assert (stats["last"], stats["min"], stats["max"]) == (120.0, 99.0, 120.0)
+    # Each price stands for 90s until the next point; the last carries no weight
+    assert stats["twap"] == pytest.approx((100 + 110 + 99) / 3)
+    assert stats["return_pct"] == pytest.approx(20.0)
+    assert stats["volatility"] == pytest.approx(returns.std(ddof=1))
+    assert stats["volatility_annualized"] == pytest.approx(
+        returns.std(ddof=1) * math.sqrt(365 * 24 * 3600 / 90))
+    assert stats["rolling_volatility"] == pytest.approx(returns[-2:].std(ddof=1))
+
+
+def test_window_and_ring_buffer_wraparound():
+    history = PriceHistory(["ETH"], capacity=5)
+    for i in range(8):
+        history.record("ETH", float(i), T0 + 90 * i)
+    ts, px = history.series("ETH")
+    np.testing.assert_array_equal(px, [3, 4, 5, 6, 7])
+    assert np.all(np.diff(ts) == 90)
+
+    stats = history.stats("ETH", window_seconds=180)
+    assert stats["points"] == 3 and stats["min"] == 5.0
+
+
+def test_duplicates_and_unknown_feeds():
+    history = PriceHistory(["FLR"])
+    assert history.record("FLR", 0.02, T0)
+    assert not history.record("FLR", 0.03, T0)
+    stats = history.stats("FLR")
+    assert stats["points"] == 1 and stats["volatility"] is None and stats["twap"] == 0.02
+    with pytest.raises(ValueError):
+        history.stats("BTC")
+    with pytest.raises(ValueError):
+        PriceHistory(["BTC"]).stats("BTC")
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+from data_Flare.flare_oracle import FlarePriceOracle
+
+ADDRESS = "0x" + "33" * 20
+
+
+class FakeFtso:
+    """FtsoV2 stand-in: values are fixed per feed, every call is counted."""
+
+    VALUES = {"FLR": (1234, 5), "BTC": (6512345, 2), "ETH": (31, -2)}
+
+    def __init__(self):
+        self.calls = []
+        ids = {bytes.fromhex(feed_id[2:]): symbol for symbol, feed_id in FlarePriceOracle.FEED_IDS.items()}
+        self.functions = SimpleNamespace(
+            getFeedById=lambda feed_id: self._call("one", [ids[feed_id]]),
+            getFeedsById=lambda feed_ids: self._call("many", [ids[f] for f in feed_ids]),
+        )
+
+    def _call(self, kind, symbols):
+        def call():
+            self.calls.append((kind, symbols))
+            values = [self.VALUES[s] for s in symbols]
+            if kind == "one":
+                return values[0][0], values[0][1], 1731541234
+            return [v for v, _ in values], [d for _, d in values], 1731541234
+        return SimpleNamespace(call=call)
+
+
+class FakeChain:
+    def __init__(self):
+        self.feed_ids = {}
+        self.ftso = FakeFtso()
+
+    def on_address_change(self, callback):
+        pass
+
+    def connect(self, names=()):
+        pass
+
+    def record_feed_ids(self, feed_ids):
+        self.feed_ids.update(feed_ids)
+
+    def address(self, name):
+        return ADDRESS
+
+    def contract(self, name, abi):
+        return self.ftso
+
+
+@pytest.fixture
+def oracle():
+    return FlarePriceOracle(FakeChain())
+
+
+def test_get_prices_reads_every_feed_in_one_call(oracle):
+    prices = oracle.get_prices(["btc", "ETH", "BTC", "flr"])
+    assert list(prices) == ["BTC", "ETH", "FLR"]
+    assert oracle.ftso_v2.calls == [("many", ["BTC", "ETH", "FLR"])]
+    assert prices["BTC"] == {"symbol": "BTC/USD", "price": 65123.45, "timestamp": 1731541234}
+    assert prices["ETH"]["price"] == 3100.0
+    assert prices["FLR"]["price"] == pytest.approx(0.01234)
+
+
+def test_cached_batch_makes_no_call(oracle):
+    oracle.get_prices(["BTC", "ETH"])
+    oracle.get_prices(["ETH", "BTC"])
+    oracle.get_price("BTC")
+    assert len(oracle.ftso_v2.calls) == 1
+
+
+def test_partly_cached_batch_is_read_again_as_a_whole(oracle):
+    oracle.get_price("BTC")
+    oracle.get_prices(["BTC", "ETH"])
+    assert oracle.ftso_v2.calls == [("one", ["BTC"]), ("many", ["BTC", "ETH"])]
+
+
+def test_unsupported_symbol_fails_before_any_call(oracle):
+    with pytest.raises(ValueError):
+        oracle.get_prices(["BTC", "DOGE"])
+    with pytest.raises(ValueError):
+        oracle.get_prices([])
+    assert oracle.ftso_v2.calls == []
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from data_Flare.randomness_monitor import RandomnessMonitor, chi2_sf
+
+
+def feed(monitor, seeds, start=0):
+    for i, seed in enumerate(seeds):
+        monitor.record_round({"round": start + i, "is_secure": True, "random": seed})
+
+
+def random_seeds(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return [int.from_bytes(rng.bytes(32), "big") for _ in range(n)]
+
+
+def test_chi2_approximation_matches_known_quantiles():
+    # chi2(255) 0.99 quantile is 310.457; chi2(2) 0.95 quantile is 5.991
+    assert chi2_sf(310.457, 255) == pytest.approx(0.01, abs=5e-4)
+    assert chi2_sf(5.991, 2) == pytest.approx(0.05, abs=5e-3)
+    assert chi2_sf(0, 3) == 1.0
+
+
+def test_uniform_inputs_are_healthy():
+    monitor = RandomnessMonitor()
+    feed(monitor, random_seeds(300))
+    monitor.record_numbers(np.random.default_rng(2).integers(0, 100000, 5000), 100000)
+    report = monitor.evaluate()
+    assert report["healthy"]
+    assert all(t["passed"] for t in report["tests"].values())
+
+
+def test_biased_inputs_fail_their_tests():
+    monitor = RandomnessMonitor()
+    # Seeds are 0x0101..01 with only the last byte varying: far too few one-bits
+    feed(monitor, [int.from_bytes(b"\x01" * 32, "big") + i for i in range(60)])
+    monitor.record_numbers([7] * 500, 100000)
+    report = monitor.evaluate()
+    assert not report["healthy"]
+    tests = report["tests"]
+    assert tests["monobit"]["passed"] is False
+    assert tests["seed_bytes"]["passed"] is False
+    assert tests["lottery"]["passed"] is False
+
+
+def test_too_few_samples_give_no_verdict():
+    monitor = RandomnessMonitor()
+    feed(monitor, random_seeds(3))
+    report = monitor.evaluate()
+    assert report["healthy"]
+    assert all(t["passed"] is None for t in report["tests"].values())
+
+
+def test_rounds_are_recorded_once_and_insecure_ones_counted():
+    monitor = RandomnessMonitor()
+    seed = random_seeds(1)[0]
+    monitor.record_round({"round": 1, "is_secure": True, "random": seed})
+    monitor.record_round({"round": 1, "is_secure": True, "random": seed})
+    monitor.record_round({"round": 2, "is_secure": False, "random": seed})
+    assert monitor.evaluate()["samples"] == {"seeds": 1, "numbers": 0, "insecure_rounds": 1}
+
+
+def test_holm_rejects_step_down_only():
+    monitor = RandomnessMonitor()
+    tests = {
+        "a": {"p_value": 0.001},   # 0.001 < 0.01/4: fails
+        "b": {"p_value": 0.002},   # 0.002 < 0.01/3: fails
+        "c": {"p_value": 0.006},   # 0.006 >= 0.01/2: passes, which ends the rejections
+        "d": {"p_value": 0.009},   # below 0.01/1, but passes because c did
+        "e": {"passed": None},
+    }
+    monitor._holm(tests)
+    assert [tests[k]["passed"] for k in "abcd"] == [False, False, True, True]
+    assert [tests[k]["threshold"] for k in "abcd"] == pytest.approx([0.0025, 0.003333, 0.005, 0.01])
+    assert tests["e"] == {"passed": None}
+
+
+def test_record_numbers_wraps_around_the_ring_buffer():
+    monitor = RandomnessMonitor(number_capacity=10)
+    monitor.record_numbers(range(7), 100)
+    monitor.record_numbers(range(7, 12), 100)   # crosses the end of the buffer
+    np.testing.assert_allclose(monitor._numbers, np.array([10, 11, 2, 3, 4, 5, 6, 7, 8, 9]) / 100)
+    assert monitor._number_next == 2 and monitor._number_count == 10
+
+    monitor.record_numbers(range(100, 125), 1000)  # larger than the buffer: keeps the newest
+    assert sorted(np.round(monitor._numbers * 1000).astype(int)) == list(range(115, 125))
+    assert monitor._number_count == 10
@@ -0,0 +1,133 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from data_Flare.round_drbg import LANES_PER_BLOCK, RoundDRBG, RoundKeys
+
+SEED = int.from_bytes(hashlib.sha256(b"seed").digest(), "big")
+ROUND = 812345
+KEY = hashlib.sha256(b"key").digest()
+
+
+def recompute(seed, round_id, key, first, blocks, n, bound):
+    """Rebuild a non-unique draws() result from its first counter alone."""
+    drbg = RoundDRBG(seed, round_id, key)
+    data = b"".join(drbg.block(counter) for counter in range(first, first + blocks))
+    lanes = np.frombuffer(data, dtype=">u8").astype(np.uint64)
+    if (1 << 64) % bound:
+        lanes = lanes[lanes < np.uint64((1 << 64) - (1 << 64) % bound)]
+    return (lanes % np.uint64(bound)).astype(np.int64)[:n]
+
+
+@pytest.mark.parametrize("bound", [1, 2, 7, 100000, 1 << 40, 1 << 63])
+def test_draws_stay_in_range(bound):
+    numbers, _, _ = RoundDRBG(SEED, ROUND, KEY).draws(2000, bound)
+    assert len(numbers) == 2000
+    assert numbers.min() >= 0
+    assert numbers.max() < bound
+
+
+@pytest.mark.parametrize("n,bound", [(500, 100000), (90, 100), (100, 100), (3000, 4096)])
+def test_unique_draws_are_distinct(n, bound):
+    numbers, _, _ = RoundDRBG(SEED, ROUND, KEY).draws(n, bound, unique=True)
+    assert len(numbers) == n
+    assert len(set(numbers.tolist())) == n
+    assert numbers.min() >= 0 and numbers.max() < bound
+
+
+def test_rejects_impossible_requests():
+    drbg = RoundDRBG(SEED, ROUND, KEY)
+    with pytest.raises(ValueError):
+        drbg.draws(11, 10, unique=True)
+    with pytest.raises(ValueError):
+        drbg.draws(1, 0)
+    with pytest.raises(ValueError):
+        drbg.draws(-1, 10)
+
+
+def test_draws_are_deterministic_from_seed_round_key_and_counter():
+    drbg = RoundDRBG(SEED, ROUND, KEY)
+    drbg.randbelow(100)  # move past counter 0
+    numbers, first, blocks = drbg.draws(1000, 100000)
+    assert first == 1
+    assert blocks == 1000 // LANES_PER_BLOCK
+    np.testing.assert_array_equal(numbers, recompute(SEED, ROUND, KEY, first, blocks, 1000, 100000))
+
+    again, _, _ = RoundDRBG(SEED, ROUND, KEY).draws(1000, 100000)
+    np.testing.assert_array_equal(again, recompute(SEED, ROUND, KEY, 0, blocks, 1000, 100000))
+
+
+def test_consecutive_draws_use_fresh_counters():
+    drbg = RoundDRBG(SEED, ROUND, KEY)
+    _, first_a, blocks_a = drbg.draws(100, 1000)
+    _, first_b, _ = drbg.draws(100, 1000)
+    _, counter = drbg.randbelow(1000)
+    assert first_b == first_a + blocks_a
+    assert counter > first_b
+
+
+# Bounds that force refills: 25% of 64-bit lanes rejected, or many duplicates
+REFILL_CASES = [(400, 3 << 61, False), (20, 100, True), (300, 2000, True), (50, 7, False)]
+
+
+def test_concurrent_batches_replay_from_their_first_counter():
+    drbg = RoundDRBG(SEED, ROUND, KEY)
+
+    def job(i):
+        if i % 3 == 0:
+            return "roll", drbg.randbelow(1000)
+        n, bound, unique = REFILL_CASES[i % len(REFILL_CASES)]
+        numbers, first, blocks = drbg.draws(n, bound, unique)
+        return "batch", (numbers, first, blocks, n, bound, unique)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(job, range(400)))
+
+    used = []
+    for kind, result in results:
+        if kind == "roll":
+            used.append((result[1], 1))
+            continue
+        numbers, first, blocks, n, bound, unique = result
+        replay, replay_first, replay_blocks = RoundDRBG(SEED, ROUND, KEY, counter=first).draws(n, bound, unique)
+        np.testing.assert_array_equal(numbers, replay)
+        assert (replay_first, replay_blocks) == (first, blocks)
+        used.append((first, blocks))
+
+    # Batches and rolls never share a counter
+    used.sort()
+    for (start, count), (next_start, _) in zip(used, used[1:]):
+        assert start + count <= next_start
+
+
+@pytest.mark.parametrize("other", [
+    dict(seed=SEED + 1),
+    dict(round_id=ROUND + 1),
+    dict(key=hashlib.sha256(b"other").digest()),
+])
+def test_every_input_changes_the_stream(other):
+    base = dict(seed=SEED, round_id=ROUND, key=KEY)
+    a, _, _ = RoundDRBG(**base).draws(64, 1 << 32)
+    b, _, _ = RoundDRBG(**{**base, **other}).draws(64, 1 << 32)
+    assert not np.array_equal(a, b)
+
+
+def test_round_keys_commit_to_the_key():
+    keys = RoundKeys(secret=b"s" * 32, instance=7)
+    assert keys.commitment(ROUND) == hashlib.sha256(keys.key(ROUND)).digest()
+    assert keys.key(ROUND) != keys.key(ROUND + 1)
+    assert keys.key(ROUND) != RoundKeys(secret=b"s" * 32, instance=8).key(ROUND)
+
+
+def test_round_keys_reveal_other_instances_only_with_a_shared_secret():
+    shared = RoundKeys(secret=b"s" * 32, instance=7)
+    assert shared.key(ROUND, instance=8) == RoundKeys(secret=b"s" * 32, instance=8).key(ROUND)
+
+    private = RoundKeys(instance=7)
+    if private.shared:
+        pytest.skip("FLARE_DRBG_SECRET is set in this environment")
+    private.key(ROUND, instance=7)
+    with pytest.raises(LookupError):
+        private.key(ROUND, instance=8)
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from data_Flare import singleflight
+from data_Flare.singleflight import AsyncSingleFlight, NegativeCache, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"verified": True}
+
+    with ThreadPoolExecutor(8) as pool:
+        leader = pool.submit(flight.do, "tx", slow)
+        started.wait(5)
+        waiters = [pool.submit(flight.do, "tx", slow) for _ in range(7)]
+        deadline = time.monotonic() + 5
+        while flight.stats()["shared"] < 7 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [w.result() for w in waiters]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"calls": 1, "shared": 7, "in_flight": 0}
+    # Nothing is kept once the call finished
+    flight.do("tx", lambda: None)
+    assert flight.stats()["calls"] == 2
+
+
+def test_failed_call_raises_and_releases_its_key():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("tx", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_calls_share_one_task_and_survive_a_cancelled_waiter():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def run():
+        first = asyncio.create_task(flight.do("tx", slow))
+        cancelled = asyncio.create_task(flight.do("tx", slow))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        rest = await asyncio.gather(*(flight.do("tx", slow) for _ in range(5)))
+        return await first, rest, cancelled
+
+    first, rest, cancelled = asyncio.run(run())
+    assert calls == [1]
+    assert first == "ok" and rest == ["ok"] * 5
+    assert cancelled.cancelled()
+    assert flight.stats() == {"calls": 1, "shared": 6, "in_flight": 0}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(singleflight, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_negative_cache_ttl_and_strikes(clock):
+    cache = NegativeCache()
+    cache.put("tx", {"verified": False}, ttl=15)
+    assert cache.get("tx") == {"verified": False}
+    clock.now += 15
+    assert cache.get("tx") is None
+    cache.put("tx", {"verified": False}, ttl=30)
+    assert cache.strikes("tx") == 2
+    cache.discard("tx")
+    assert cache.strikes("tx") == 0 and cache.get("tx") is None
+
+
+def test_negative_cache_evicts_oldest_entries(clock):
+    cache = NegativeCache(max_entries=3)
+    for i in range(5):
+        cache.put(f"tx{i}", {"i": i}, ttl=60)
+    assert [cache.get(f"tx{i}") for i in range(5)] == [None, None, {"i": 2}, {"i": 3}, {"i": 4}]
+    assert cache.stats() == {"hits": 3, "stores": 5, "entries": 3}
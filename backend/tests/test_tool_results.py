@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import main
+from main import ResultHandles, encode_tool_result
+
+
+@pytest.fixture(autouse=True)
+def handles(monkeypatch):
+    handles = ResultHandles()
+    monkeypatch.setattr(main, "result_handles", handles)
+    return handles
+
+
+def test_small_result_is_compacted_but_complete():
+    result = {"success": True, "price": 1 / 3, "transport": "rpc", "cache": "memory"}
+    text, encoding = encode_tool_result("get_flare_price", result, "c1")
+    assert json.loads(text) == {"success": True, "price": 0.3333333333}
+    assert encoding["handles"] == 0
+    assert encoding["sent_bytes"] == len(text)
+
+
+def test_large_value_goes_behind_a_handle_within_budget(handles):
+    series = [{"t": i, "v": i * 1.5} for i in range(400)]
+    result = {"success": True, "symbol": "BTC", "series": series}
+    text, encoding = encode_tool_result("get_price_history", result, "c1")
+    assert len(text) <= main.TOOL_RESULT_BUDGETS["get_price_history"]
+    placeholder = json.loads(text)["series"]
+    assert encoding["handles"] == 1 and placeholder["preview"]
+
+    expanded = handles.expand(placeholder["handle"], "c1")
+    assert expanded["value"] == series
+
+
+def test_handles_are_scoped_to_their_conversation(handles):
+    handle = handles.put(json.dumps(list(range(100))), "c1")
+    assert handles.expand(handle, "c1")["value"] == list(range(100))
+    with pytest.raises(KeyError):
+        handles.expand(handle, "c2")
+
+
+def test_large_values_expand_in_chunks(handles, monkeypatch):
+    monkeypatch.setattr(main, "EXPAND_MAX_BYTES", 100)
+    text = json.dumps("x" * 250)
+    handle = handles.put(text, "c1")
+    chunks, offset = [], 0
+    while offset is not None:
+        part = handles.expand(handle, "c1", offset)
+        chunks.append(part["chunk"])
+        offset = part["next_offset"]
+    assert "".join(chunks) == text and len(chunks) == 3
+
+
+def test_eviction_keeps_the_byte_bound():
+    handles = ResultHandles(max_bytes=250)
+    first = handles.put("1" * 100, "c1")
+    handles.put("2" * 100, "c1")
+    handles.put("3" * 100, "c2")
+    with pytest.raises(KeyError):
+        handles.expand(first, "c1")
@@ -12,6 +12,7 @@ export function useChat() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [conversationId, setConversationId] = useState<string | null>(null);
 
   const sendMessage = useCallback(
     async (content: string) => {
@@ -38,6 +39,7 @@ export function useChat() {
               ...messages.map((m) => ({ role: m.role, content: m.content })),
               { role: "user", content: content.trim() },
             ],
+            conversation_id: conversationId,
           }),
         });
 
@@ -46,6 +48,7 @@ export function useChat() {
         }
 
         const data: ChatResponse = await res.json();
+        if (data.conversationId) setConversationId(data.conversationId);
 
         const assistantMessage: Message = {
           id: nextId(),
@@ -64,7 +67,7 @@ export function useChat() {
         setIsLoading(false);
       }
     },
-    [messages, isLoading]
+    [messages, isLoading, conversationId]
   );
 
   return { messages, isLoading, error, sendMessage };
@@ -22,6 +22,7 @@ export interface ChatResponse {
   role: "assistant";
   content: string;
   toolCalls?: ToolCall[];
+  conversationId?: string;
 }
 
 export type QuickAction = {